@@ -1,4 +1,5 @@
 import asyncio
+import collections
 import concurrent
 import functools as ft
 import json
@@ -6,6 +7,8 @@ import os
 import uvloop
 from aiohttp import web
 import hail as hl
+from hail.backend.backend import RESULT_BUFFER_SPEC
+from hail.ir.ir import encoded_literal_id
 from hail.utils import FatalError
 from hail.utils.java import Env, info, scala_object
 from hailtop.auth import rest_authenticated_users_only
@@ -16,7 +19,20 @@ uvloop.install()
 master = os.environ.get('HAIL_APISERVER_SPARK_MASTER')
 hl.init(master=master, min_block_size=0)
 
-app = web.Application()
+
+@web.middleware
+async def compress_response(request, handler):
+    # request bodies sent with 'Content-Encoding: gzip' are decompressed by
+    # aiohttp itself; compress large responses for clients that accept it
+    response = await handler(request)
+    if isinstance(response, web.Response) and response.body is not None and len(response.body) >= 1024:
+        response.enable_compression()
+    return response
+
+
+# large literals are uploaded as single request bodies; the limit applies to
+# the decompressed size
+app = web.Application(client_max_size=1024 ** 3, middlewares=[compress_response])
 setup_aiohttp_session(app)
 
 routes = web.RouteTableDef()
@@ -40,8 +56,79 @@ async def healthcheck(request):
     return status_response(200)
 
 
-def blocking_execute(code):
-    jir = Env.hail().expr.ir.IRParser.parse_value_ir(code, {}, {})
+# Encoded large literals uploaded by clients, keyed by (username, literal id),
+# least recently used first. See `ServiceBackend._post_ir`.
+MAX_LITERAL_CACHE_BYTES = 4 * 1024 ** 3
+literal_cache = collections.OrderedDict()
+literal_cache_bytes = 0
+
+
+def cache_literal(key, encoding):
+    global literal_cache_bytes
+    old = literal_cache.pop(key, None)
+    if old is not None:
+        literal_cache_bytes -= len(old)
+    literal_cache[key] = encoding
+    literal_cache_bytes += len(encoding)
+    while literal_cache_bytes > MAX_LITERAL_CACHE_BYTES and len(literal_cache) > 1:
+        _, evicted = literal_cache.popitem(last=False)
+        literal_cache_bytes -= len(evicted)
+
+
+@routes.post('/literals/{literal_id}')
+@rest_authenticated_users_only
+async def upload_literal(request, userdata):
+    encoding = await request.read()
+    cache_literal((userdata['username'], request.match_info['literal_id']), encoding)
+    return status_response(204)
+
+
+class MissingLiterals(Exception):
+    def __init__(self, literal_ids):
+        super().__init__(f'unknown literals: {literal_ids}')
+        self.literal_ids = literal_ids
+
+
+def request_ir(data, userdata):
+    """Return the IR code of a request and the encoded literals it refers to,
+    by literal id. Raises `MissingLiterals` if any were never uploaded or have
+    been evicted."""
+    if isinstance(data, str):
+        return data, {}
+    literals = {}
+    missing = []
+    for literal_id, type_string in data['literals'].items():
+        key = (userdata['username'], literal_id)
+        encoding = literal_cache.get(key)
+        if encoding is None:
+            missing.append(literal_id)
+        else:
+            literal_cache.move_to_end(key)
+            literals[literal_id] = (type_string, encoding)
+    if missing:
+        raise MissingLiterals(missing)
+    return data['code'], literals
+
+
+def missing_literals_response(e):
+    return web.json_response({
+        'message': e.args[0],
+        'missing_literals': e.literal_ids
+    }, status=400)
+
+
+def decode_literals(literals):
+    ir_map = {}
+    for literal_id, (type_string, encoding) in literals.items():
+        if encoded_literal_id(type_string, encoding) != literal_id:
+            raise FatalError(f'literal {literal_id} does not match its content')
+        ir_map[literal_id] = Env.hc()._jhc.backend().decodeLiteral(
+            type_string, encoding, RESULT_BUFFER_SPEC)
+    return ir_map
+
+
+def blocking_execute(code, literals):
+    jir = Env.hail().expr.ir.IRParser.parse_value_ir(code, {}, decode_literals(literals))
     typ = hl.dtype(jir.typ().toString())
     result = Env.hc()._jhc.backend().executeJSON(jir)
     return {
@@ -53,40 +140,69 @@ def blocking_execute(code):
 @routes.post('/execute')
 @rest_authenticated_users_only
 async def execute(request, userdata):
-    code = await request.json()
-    info(f'execute: {code}')
     try:
-        result = await run(blocking_execute, code)
+        code, literals = request_ir(await request.json(), userdata)
+        info(f'execute: {code}')
+        result = await run(blocking_execute, code, literals)
         info(f'result: {result}')
         return web.json_response(result)
+    except MissingLiterals as e:
+        return missing_literals_response(e)
+    except FatalError as e:
+        return web.json_response({
+            'message': e.args[0]
+        }, status=400)
+
+
+def blocking_execute_encoded(code, literals):
+    jir = Env.hail().expr.ir.IRParser.parse_value_ir(code, {}, decode_literals(literals))
+    result = Env.hc()._jhc.backend().executeEncode(jir, RESULT_BUFFER_SPEC)
+    return result._1(), result._2()
+
+
+@routes.post('/execute/encoded')
+@rest_authenticated_users_only
+async def execute_encoded(request, userdata):
+    try:
+        code, literals = request_ir(await request.json(), userdata)
+        info(f'execute encoded: {code}')
+        encoded, timings = await run(blocking_execute_encoded, code, literals)
+        info(f'result: {len(encoded)} bytes')
+        return web.Response(body=encoded,
+                            content_type='application/octet-stream',
+                            headers={'Hail-Timings': timings})
+    except MissingLiterals as e:
+        return missing_literals_response(e)
     except FatalError as e:
         return web.json_response({
             'message': e.args[0]
         }, status=400)
 
 
-def blocking_value_type(code):
-    jir = Env.hail().expr.ir.IRParser.parse_value_ir(code, {}, {})
+def blocking_value_type(code, literals):
+    jir = Env.hail().expr.ir.IRParser.parse_value_ir(code, {}, decode_literals(literals))
     return jir.typ().toString()
 
 
 @routes.post('/type/value')
 @rest_authenticated_users_only
 async def value_type(request, userdata):
-    code = await request.json()
-    info(f'value type: {code}')
     try:
-        result = await run(blocking_value_type, code)
+        code, literals = request_ir(await request.json(), userdata)
+        info(f'value type: {code}')
+        result = await run(blocking_value_type, code, literals)
         info(f'result: {result}')
         return web.json_response(result)
+    except MissingLiterals as e:
+        return missing_literals_response(e)
     except FatalError as e:
         return web.json_response({
             'message': e.args[0]
         }, status=400)
 
 
-def blocking_table_type(code):
-    jir = Env.hail().expr.ir.IRParser.parse_table_ir(code, {}, {})
+def blocking_table_type(code, literals):
+    jir = Env.hail().expr.ir.IRParser.parse_table_ir(code, {}, decode_literals(literals))
     ttyp = hl.ttable._from_java(jir.typ())
     return {
         'global': str(ttyp.global_type),
@@ -98,20 +214,22 @@ def blocking_table_type(code):
 @routes.post('/type/table')
 @rest_authenticated_users_only
 async def table_type(request, userdata):
-    code = await request.json()
-    info(f'table type: {code}')
     try:
-        result = await run(blocking_table_type, code)
+        code, literals = request_ir(await request.json(), userdata)
+        info(f'table type: {code}')
+        result = await run(blocking_table_type, code, literals)
         info(f'result: {result}')
         return web.json_response(result)
+    except MissingLiterals as e:
+        return missing_literals_response(e)
     except FatalError as e:
         return web.json_response({
             'message': e.args[0]
         }, status=400)
 
 
-def blocking_matrix_type(code):
-    jir = Env.hail().expr.ir.IRParser.parse_matrix_ir(code, {}, {})
+def blocking_matrix_type(code, literals):
+    jir = Env.hail().expr.ir.IRParser.parse_matrix_ir(code, {}, decode_literals(literals))
     mtyp = hl.tmatrix._from_java(jir.typ())
     return {
         'global': str(mtyp.global_type),
@@ -126,20 +244,22 @@ def blocking_matrix_type(code):
 @routes.post('/type/matrix')
 @rest_authenticated_users_only
 async def matrix_type(request, userdata):
-    code = await request.json()
-    info(f'matrix type: {code}')
     try:
-        result = await run(blocking_matrix_type, code)
+        code, literals = request_ir(await request.json(), userdata)
+        info(f'matrix type: {code}')
+        result = await run(blocking_matrix_type, code, literals)
         info(f'result: {result}')
         return web.json_response(result)
+    except MissingLiterals as e:
+        return missing_literals_response(e)
     except FatalError as e:
         return web.json_response({
             'message': e.args[0]
         }, status=400)
 
 
-def blocking_blockmatrix_type(code):
-    jir = Env.hail().expr.ir.IRParser.parse_blockmatrix_ir(code, {}, {})
+def blocking_blockmatrix_type(code, literals):
+    jir = Env.hail().expr.ir.IRParser.parse_blockmatrix_ir(code, {}, decode_literals(literals))
     bmtyp = hl.tblockmatrix._from_java(jir.typ())
     return {
         'element_type': str(bmtyp.element_type),
@@ -152,12 +272,14 @@ def blocking_blockmatrix_type(code):
 @routes.post('/type/blockmatrix')
 @rest_authenticated_users_only
 async def blockmatrix_type(request, userdata):
-    code = await request.json()
-    info(f'blockmatrix type: {code}')
     try:
-        result = await run(blocking_blockmatrix_type, code)
+        code, literals = request_ir(await request.json(), userdata)
+        info(f'blockmatrix type: {code}')
+        result = await run(blocking_blockmatrix_type, code, literals)
         info(f'result: {result}')
         return web.json_response(result)
+    except MissingLiterals as e:
+        return missing_literals_response(e)
     except FatalError as e:
         return web.json_response({
             'message': e.args[0]
@@ -7,7 +7,7 @@ import traceback
 from hailtop.utils import sleep_and_backoff, is_transient_error
 
 from .globals import complete_states, tasks
-from .database import check_call_procedure
+from .database import check_call_procedure, call_procedures
 from .batch_configuration import KUBERNETES_TIMEOUT_IN_SECONDS, \
     KUBERNETES_SERVER_URL
 
@@ -90,6 +90,10 @@ async def mark_job_complete(app, batch_id, job_id, new_state, status):
 
     log.info(f'job {id} changed state: {rv["old_state"]} => {new_state}')
 
+    fair_share = app.get('fair_share')
+    if fair_share is not None:
+        fair_share.job_stopped(batch_id, job_id)
+
     instance_name = rv['instance_name']
     if instance_name:
         instance = inst_pool.name_instance.get(instance_name)
@@ -155,6 +159,10 @@ async def unschedule_job(app, record):
 
     log.info(f'unschedule job {id}: updated database')
 
+    fair_share = app.get('fair_share')
+    if fair_share is not None:
+        fair_share.job_stopped(batch_id, job_id)
+
     instance.adjust_free_cores_in_memory(record['cores_mcpu'])
     scheduler_state_changed.set()
 
@@ -273,53 +281,119 @@ users:
     }
 
 
-async def schedule_job(app, record, instance):
+async def create_jobs(app, instance, bodies):
+    """Create jobs with `bodies` on `instance`'s worker.
+
+    Returns, for each body, ``None`` if the job was created, the worker's
+    error if it rejected the job, or the exception if the request to create
+    it failed.
+    """
+    url = f'http://{instance.ip_address}:5000/api/v1alpha/batches/jobs'
+
+    try:
+        async with app['client_session'].post(f'{url}/create_many', json={'jobs': bodies}) as resp:
+            return (await resp.json())['errors']
+    except aiohttp.ClientResponseError as e:
+        if e.status != 404:
+            raise
+
+    # the worker predates create_many
+    async def create_job(body):
+        async with app['client_session'].post(f'{url}/create', json=body):
+            pass
+
+    results = await asyncio.gather(*[create_job(body) for body in bodies],
+                                   return_exceptions=True)
+    if all(isinstance(result, Exception) for result in results):
+        raise results[0]
+    return results
+
+
+async def schedule_jobs(app, records, instance):
+    """Start the jobs in `records` on `instance`, with one request to its
+    worker over the driver's shared session, and mark them running in the
+    database over one connection.
+
+    The caller must already have taken the jobs' cores from the instance's
+    free cores. Jobs whose configuration cannot be made, or that the worker
+    rejects, are marked as errors. Returns the records of the jobs that
+    were scheduled.
+    """
     assert instance.state == 'active'
 
     db = app['db']
 
-    batch_id = record['batch_id']
-    job_id = record['job_id']
-    id = (batch_id, job_id)
-
-    try:
-        body = await job_config(app, record)
-    except Exception:
-        log.exception('while making job config')
+    async def mark_error(record, error):
+        batch_id = record['batch_id']
+        job_id = record['job_id']
         status = {
             'worker': None,
             'batch_id': batch_id,
             'job_id': job_id,
             'user': record['user'],
             'state': 'error',
-            'error': traceback.format_exc(),
+            'error': error,
             'container_statuses': {k: {} for k in tasks}
         }
         await mark_job_complete(app, batch_id, job_id, 'Error', status)
-        return
 
-    log.info(f'schedule job {id} on {instance}: made job config')
+    configs = await asyncio.gather(*[job_config(app, record) for record in records],
+                                   return_exceptions=True)
+
+    bodies = []
+    configured = []
+    for record, config in zip(records, configs):
+        batch_id = record['batch_id']
+        job_id = record['job_id']
+        if isinstance(config, Exception):
+            log.error(f'while making job config for job {(batch_id, job_id)}', exc_info=config)
+            await mark_error(record, ''.join(traceback.format_exception(type(config), config, config.__traceback__)))
+        else:
+            bodies.append(config)
+            configured.append(record)
+
+    if not configured:
+        return []
+
+    log.info(f'schedule {len(configured)} jobs on {instance}: made job configs')
 
     try:
-        async with aiohttp.ClientSession(
-                raise_for_status=True, timeout=aiohttp.ClientTimeout(total=60)) as session:
-            url = (f'http://{instance.ip_address}:5000'
-                   f'/api/v1alpha/batches/jobs/create')
-            await session.post(url, json=body)
-            await instance.mark_healthy()
+        errors = await create_jobs(app, instance, bodies)
+        await instance.mark_healthy()
     except Exception:
         await instance.incr_failed_request_count()
         raise
 
-    log.info(f'schedule job {id} on {instance}: called create job')
+    log.info(f'schedule {len(configured)} jobs on {instance}: called create jobs')
 
-    await check_call_procedure(
+    created = []
+    for record, error in zip(configured, errors):
+        id = (record['batch_id'], record['job_id'])
+        if error is None:
+            created.append(record)
+        elif isinstance(error, Exception):
+            # left ready, to be scheduled again
+            log.warning(f'schedule job {id} on {instance}: not created: {error}')
+        else:
+            log.error(f'schedule job {id} on {instance}: rejected by worker: {error}')
+            await mark_error(record, error)
+
+    if not created:
+        return []
+
+    rvs = await call_procedures(
         db,
         'CALL schedule_job(%s, %s, %s);',
-        (batch_id, job_id, instance.name))
+        [(record['batch_id'], record['job_id'], instance.name) for record in created])
 
-    log.info(f'schedule job {id} on {instance}: updated database')
+    scheduled = []
+    for record, rv in zip(created, rvs):
+        if rv['rc'] == 0:
+            scheduled.append(record)
+        else:
+            log.info(f'schedule job {(record["batch_id"], record["job_id"])} on {instance}: '
+                     f'not scheduled: {rv}')
 
-    instance.adjust_free_cores_in_memory(-record['cores_mcpu'])
+    log.info(f'schedule {len(created)} jobs on {instance}: updated database')
 
-    log.info(f'schedule job {id} on {instance}: adjusted instance pool')
+    return scheduled
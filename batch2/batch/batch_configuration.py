@@ -1,4 +1,5 @@
 import os
+import json
 
 KUBERNETES_TIMEOUT_IN_SECONDS = float(os.environ.get('KUBERNETES_TIMEOUT_IN_SECONDS', 5.0))
 REFRESH_INTERVAL_IN_SECONDS = int(os.environ.get('REFRESH_INTERVAL_IN_SECONDS', 5 * 60))
@@ -10,3 +11,11 @@ assert PROJECT != ''
 ZONE = os.environ['ZONE']
 assert ZONE != ''
 KUBERNETES_SERVER_URL = os.environ['KUBERNETES_SERVER_URL']
+
+# 'fair_share' schedules ready jobs from the user furthest below their share
+# of running cores, weighted by HAIL_BATCH_USER_SHARE_WEIGHTS and capped by
+# HAIL_BATCH_USER_CORES_LIMITS (JSON objects keyed by user)
+SCHEDULER = os.environ.get('HAIL_BATCH_SCHEDULER', 'default')
+assert SCHEDULER in ('default', 'fair_share')
+USER_SHARE_WEIGHTS = json.loads(os.environ.get('HAIL_BATCH_USER_SHARE_WEIGHTS', '{}'))
+USER_CORES_LIMITS = json.loads(os.environ.get('HAIL_BATCH_USER_CORES_LIMITS', '{}'))
@@ -9,3 +9,16 @@ async def check_call_procedure(db, sql, args=None):
     if rv['rc'] != 0:
         raise CallError(rv)
     return rv
+
+
+async def call_procedures(db, sql, args_list):
+    """Call a procedure once for each element of `args_list` over a single
+    connection. Unlike :func:`check_call_procedure`, failures are returned
+    rather than raised."""
+    rvs = []
+    async with db.pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            for args in args_list:
+                await cursor.execute(sql, args)
+                rvs.append(await cursor.fetchone())
+    return rvs
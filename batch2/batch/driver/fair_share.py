@@ -0,0 +1,119 @@
+import heapq
+import collections
+
+
+def find_instance(inst_pool, cores_mcpu):
+    """Return the healthy instance with the fewest free cores that fit
+    `cores_mcpu`, or `None`."""
+    i = inst_pool.healthy_instances_by_free_cores.bisect_key_left(cores_mcpu)
+    if i < len(inst_pool.healthy_instances_by_free_cores):
+        instance = inst_pool.healthy_instances_by_free_cores[i]
+        assert cores_mcpu <= instance.free_cores_mcpu
+        return instance
+    return None
+
+
+class FairShare:
+    """Running cores per user, kept in memory, used to schedule ready jobs
+    from the user furthest below their share of the cluster.
+
+    A user's share is proportional to their weight, 1 unless given in
+    `weights`. Users in `limits_mcpu` are never scheduled past that many
+    running millicores.
+
+    `ready_users` are the users who may have ready jobs. A user is added by
+    :meth:`user_ready` and when one of their jobs stops, and removed when
+    :meth:`schedule` finds they have none.
+    """
+
+    def __init__(self, weights=None, limits_mcpu=None):
+        self.weights = weights if weights is not None else {}
+        self.limits_mcpu = limits_mcpu if limits_mcpu is not None else {}
+        # (batch_id, job_id) -> (user, cores_mcpu)
+        self.running_jobs = {}
+        self.user_running_cores_mcpu = collections.defaultdict(int)
+        # user -> number of the last user_ready call for them
+        self.ready_users = {}
+        self.n_user_ready = 0
+
+    def reset(self, records):
+        """Replace the running jobs with `records`, each with `batch_id`,
+        `job_id`, `user` and `cores_mcpu`."""
+        self.running_jobs = {}
+        self.user_running_cores_mcpu = collections.defaultdict(int)
+        for record in records:
+            self.job_started(record['batch_id'], record['job_id'], record['user'], record['cores_mcpu'])
+
+    def job_started(self, batch_id, job_id, user, cores_mcpu):
+        id = (batch_id, job_id)
+        if id in self.running_jobs:
+            return
+        self.running_jobs[id] = (user, cores_mcpu)
+        self.user_running_cores_mcpu[user] += cores_mcpu
+
+    def job_stopped(self, batch_id, job_id):
+        running = self.running_jobs.pop((batch_id, job_id), None)
+        if running is None:
+            return
+        user, cores_mcpu = running
+        self.user_running_cores_mcpu[user] -= cores_mcpu
+        if self.user_running_cores_mcpu[user] == 0:
+            del self.user_running_cores_mcpu[user]
+        # the job is ready again, or its children may now be
+        self.user_ready(user)
+
+    def user_ready(self, user):
+        """Record that `user` may have new ready jobs."""
+        self.n_user_ready += 1
+        self.ready_users[user] = self.n_user_ready
+
+    def priority(self, user):
+        """Running cores per unit of weight; lower is scheduled first."""
+        return self.user_running_cores_mcpu.get(user, 0) / self.weights.get(user, 1)
+
+    def can_start(self, user, cores_mcpu):
+        limit_mcpu = self.limits_mcpu.get(user)
+        return limit_mcpu is None or self.user_running_cores_mcpu.get(user, 0) + cores_mcpu <= limit_mcpu
+
+    async def schedule(self, users, ready_jobs, start_job, max_jobs):
+        """Start up to `max_jobs` ready jobs, one at a time, each the next
+        ready job of the user currently furthest below their share.
+
+        `ready_jobs(user)` returns the user's ready job records in the order
+        they should run. `start_job(record)` returns ``False`` if no instance
+        can run the job, and ``True`` once the job has left the ready queue;
+        it must call :meth:`job_started` for jobs it starts. A user is
+        skipped for the rest of the round once their next job cannot be
+        started, and removed from `ready_users` if they have no ready jobs.
+
+        Returns the number of jobs that left the ready queue.
+        """
+        # the counter breaks ties between equal priorities in user order
+        heap = [(self.priority(user), i, user) for i, user in enumerate(users)]
+        heapq.heapify(heap)
+        queues = {}
+        n = 0
+        while heap and n < max_jobs:
+            _, i, user = heapq.heappop(heap)
+            queue = queues.get(user)
+            if queue is None:
+                n_user_ready = self.ready_users.get(user)
+                queue = collections.deque(await ready_jobs(user))
+                queues[user] = queue
+                # unless they became ready again while their jobs were read
+                if not queue and n_user_ready is not None and self.ready_users.get(user) == n_user_ready:
+                    del self.ready_users[user]
+            if not queue:
+                continue
+
+            record = queue[0]
+            if not self.can_start(user, record['cores_mcpu']):
+                continue
+            if not await start_job(record):
+                continue
+
+            queue.popleft()
+            n += 1
+            if queue:
+                heapq.heappush(heap, (self.priority(user), i, user))
+        return n
@@ -4,6 +4,7 @@ import json
 from functools import wraps
 import concurrent
 import asyncio
+import aiohttp
 from aiohttp import web
 import aiohttp_session
 import kubernetes_asyncio as kube
@@ -151,6 +152,9 @@ SELECT state FROM batches WHERE user = %s AND id = %s;
     if not record:
         raise web.HTTPNotFound()
 
+    fair_share = request.app['fair_share']
+    if fair_share is not None:
+        fair_share.user_ready(user)
     request.app['scheduler_state_changed'].set()
 
     return web.Response()
@@ -389,6 +393,10 @@ async def on_startup(app):
     pool = concurrent.futures.ThreadPoolExecutor()
     app['blocking_pool'] = pool
 
+    # shared by requests to workers, to reuse their connections
+    app['client_session'] = aiohttp.ClientSession(
+        raise_for_status=True, timeout=aiohttp.ClientTimeout(total=60))
+
     kube.config.load_incluster_config()
     k8s_client = kube.client.CoreV1Api()
     app['k8s_client'] = k8s_client
@@ -436,6 +444,8 @@ async def on_cleanup(app):
     blocking_pool = app['blocking_pool']
     blocking_pool.shutdown()
 
+    await app['client_session'].close()
+
 
 def run():
     app = web.Application()
@@ -1,7 +1,10 @@
 import asyncio
 import logging
+import collections
 
-from ..batch import schedule_job, unschedule_job, mark_job_complete
+from ..batch import schedule_jobs, unschedule_job, mark_job_complete
+from ..batch_configuration import SCHEDULER, USER_SHARE_WEIGHTS, USER_CORES_LIMITS
+from .fair_share import FairShare, find_instance
 
 log = logging.getLogger('driver')
 
@@ -14,8 +17,21 @@ class Scheduler:
         self.db = app['db']
         self.inst_pool = app['inst_pool']
 
+        if SCHEDULER == 'fair_share':
+            self.fair_share = FairShare(
+                USER_SHARE_WEIGHTS,
+                {user: int(cores * 1000) for user, cores in USER_CORES_LIMITS.items()})
+        else:
+            self.fair_share = None
+        app['fair_share'] = self.fair_share
+
     async def async_init(self):
-        asyncio.ensure_future(self.loop('schedule_loop', self.scheduler_state_changed, self.schedule_1))
+        if self.fair_share is not None:
+            await self.refresh_fair_share()
+            schedule_1 = self.schedule_fair_share_1
+        else:
+            schedule_1 = self.schedule_1
+        asyncio.ensure_future(self.loop('schedule_loop', self.scheduler_state_changed, schedule_1))
         asyncio.ensure_future(self.loop('cancel_loop', self.cancel_state_changed, self.cancel_1))
         asyncio.ensure_future(self.bump_loop())
 
@@ -24,6 +40,34 @@ class Scheduler:
             self.scheduler_state_changed.set()
             self.cancel_state_changed.set()
             await asyncio.sleep(60)
+            if self.fair_share is not None:
+                try:
+                    await self.refresh_fair_share()
+                except Exception:
+                    log.exception('while refreshing fair share')
+
+    async def refresh_fair_share(self):
+        # corrects for jobs that stopped running, or became ready, without
+        # passing through the driver, for instance when their instance was
+        # deleted
+        records = self.db.execute_and_fetchall(
+            '''
+SELECT jobs.batch_id, jobs.job_id, jobs.cores_mcpu, batches.user
+FROM jobs
+INNER JOIN batches ON batches.id = jobs.batch_id
+WHERE jobs.state = 'Running';
+''')
+        self.fair_share.reset([record async for record in records])
+
+        records = self.db.execute_and_fetchall(
+            '''
+SELECT DISTINCT batches.user
+FROM jobs
+INNER JOIN batches ON batches.id = jobs.batch_id
+WHERE jobs.state = 'Ready' AND batches.closed;
+''')
+        async for record in records:
+            self.fair_share.user_ready(record['user'])
 
     async def loop(self, name, changed, body):
         changed.clear()
@@ -68,6 +112,7 @@ LIMIT 50;
 ''')
 
         should_wait = True
+        instance_records = collections.defaultdict(list)
         async for record in records:
             batch_id = record['batch_id']
             job_id = record['job_id']
@@ -79,15 +124,80 @@ LIMIT 50;
                 should_wait = False
                 continue
 
-            i = self.inst_pool.healthy_instances_by_free_cores.bisect_key_left(record['cores_mcpu'])
-            if i < len(self.inst_pool.healthy_instances_by_free_cores):
-                instance = self.inst_pool.healthy_instances_by_free_cores[i]
-                assert record['cores_mcpu'] <= instance.free_cores_mcpu
+            instance = find_instance(self.inst_pool, record['cores_mcpu'])
+            if instance:
                 log.info(f'scheduling job {id} on {instance}')
-                try:
-                    await schedule_job(self.app, record, instance)
-                except Exception:
-                    log.exception(f'while scheduling job {id} on {instance}')
+                self.reserve(record, instance, instance_records)
                 should_wait = False
 
+        await self.dispatch(instance_records)
         return should_wait
+
+    def reserve(self, record, instance, instance_records):
+        # the cores are taken before the job is dispatched so later jobs in
+        # the same round see them as used
+        instance.adjust_free_cores_in_memory(-record['cores_mcpu'])
+        if self.fair_share is not None:
+            self.fair_share.job_started(record['batch_id'], record['job_id'], record['user'], record['cores_mcpu'])
+        instance_records[instance].append(record)
+
+    async def dispatch(self, instance_records):
+        await asyncio.gather(*[
+            self.dispatch_1(instance, records)
+            for instance, records in instance_records.items()
+        ])
+
+    async def dispatch_1(self, instance, records):
+        try:
+            scheduled = await schedule_jobs(self.app, records, instance)
+        except Exception:
+            log.exception(f'while scheduling {len(records)} jobs on {instance}')
+            scheduled = []
+
+        # give back the cores of jobs that did not start
+        scheduled_ids = {(record['batch_id'], record['job_id']) for record in scheduled}
+        for record in records:
+            if (record['batch_id'], record['job_id']) not in scheduled_ids:
+                instance.adjust_free_cores_in_memory(record['cores_mcpu'])
+                if self.fair_share is not None:
+                    self.fair_share.job_stopped(record['batch_id'], record['job_id'])
+
+    async def schedule_fair_share_1(self):
+        users = list(self.fair_share.ready_users)
+
+        async def ready_jobs(user):
+            records = self.db.execute_and_fetchall(
+                '''
+SELECT job_id, batch_id, spec, cores_mcpu,
+  ((jobs.cancelled OR batches.cancelled) AND NOT always_run) AS cancel,
+  userdata, user
+FROM jobs
+INNER JOIN batches ON batches.id = jobs.batch_id
+WHERE jobs.state = 'Ready' AND batches.closed AND batches.user = %s
+ORDER BY jobs.batch_id, jobs.job_id
+LIMIT 50;
+''',
+                (user,))
+            return [record async for record in records]
+
+        async def start_job(record):
+            batch_id = record['batch_id']
+            job_id = record['job_id']
+            id = (batch_id, job_id)
+
+            if record['cancel']:
+                log.info(f'cancelling job {id}')
+                await mark_job_complete(self.app, batch_id, job_id, 'Cancelled', None)
+                return True
+
+            instance = find_instance(self.inst_pool, record['cores_mcpu'])
+            if not instance:
+                return False
+            log.info(f'scheduling job {id} of {record["user"]} on {instance}')
+            self.reserve(record, instance, instance_records)
+            return True
+
+        instance_records = collections.defaultdict(list)
+        n = await self.fair_share.schedule(users, ready_jobs, start_job, 50)
+        await self.dispatch(instance_records)
+        return n == 0
@@ -0,0 +1,294 @@
+import os
+import stat
+import shutil
+import hashlib
+import asyncio
+import logging
+import collections
+import concurrent.futures
+from hailtop.utils import blocking_to_async
+
+log = logging.getLogger('file_transfer')
+
+MiB = 1024 * 1024
+
+
+def is_gs_uri(path):
+    return path.startswith('gs://')
+
+
+def _check_local_path(path, root):
+    """Raise unless `path` is in `root`, with no symbolic link in the part
+    of it below `root` that exists."""
+    path = os.path.normpath(path)
+    rel_path = os.path.relpath(path, root)
+    if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+        raise PermissionError(f'{path} is not in {root}')
+    if rel_path != os.curdir:
+        current = root
+        for part in rel_path.split(os.sep):
+            current = os.path.join(current, part)
+            try:
+                st = os.lstat(current)
+            except FileNotFoundError:
+                break
+            if stat.S_ISLNK(st.st_mode):
+                raise PermissionError(f'symbolic links are not copied: {current}')
+    real_root = os.path.realpath(root)
+    real_path = os.path.realpath(path)
+    if real_path != real_root and not real_path.startswith(real_root + os.sep):
+        raise PermissionError(f'{path} is not in {root}')
+    return path
+
+
+def _check_destinations(objects, root):
+    return [(obj, _check_local_path(dst, root)) for obj, dst in objects]
+
+
+def _open_no_follow(path, flags):
+    # fails if path is a symbolic link
+    return os.open(path, flags | os.O_NOFOLLOW, 0o666)
+
+
+def _allocate(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with os.fdopen(_open_no_follow(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC), 'wb') as f:
+        f.truncate(size)
+
+
+def _copy_file(src, dst):
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    with os.fdopen(_open_no_follow(src, os.O_RDONLY), 'rb') as src_f:
+        with os.fdopen(_open_no_follow(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC), 'wb') as dst_f:
+            shutil.copyfileobj(src_f, dst_f)
+
+
+def _list_local_files(src, dst, root):
+    src = _check_local_path(src, root)
+    try:
+        st = os.lstat(src)
+    except FileNotFoundError:
+        raise FileNotFoundError(f'no such file or directory: {src}') from None
+    if not stat.S_ISDIR(st.st_mode):
+        if not stat.S_ISREG(st.st_mode):
+            raise PermissionError(f'not a regular file: {src}')
+        return [(src, dst)]
+    files = []
+    for dirpath, dirnames, filenames in os.walk(src, followlinks=False):
+        # os.walk lists links to directories with the directories
+        for name in dirnames + filenames:
+            path = os.path.join(dirpath, name)
+            st = os.lstat(path)
+            if stat.S_ISLNK(st.st_mode):
+                raise PermissionError(f'symbolic links are not copied: {path}')
+            if stat.S_ISDIR(st.st_mode):
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                raise PermissionError(f'not a regular file: {path}')
+            rel_path = os.path.relpath(path, src)
+            files.append((path, f'{dst.rstrip("/")}/{rel_path}'))
+    return files
+
+
+async def retry(f, *args, delays=(2, 5)):
+    # like the retry shell function copy containers used with gsutil
+    for delay in delays:
+        try:
+            return await f(*args)
+        except asyncio.CancelledError:  # pylint: disable=try-except-raise
+            raise
+        except Exception:
+            log.exception(f'in {f.__name__}, retrying in {delay}s')
+        await asyncio.sleep(delay)
+    return await f(*args)
+
+
+class FileTransfer:
+    """Copies files between the worker's disk and Google Storage in the
+    worker process, like ``gsutil -m cp -R``.
+
+    A job's copies go through its own store, a :class:`.GCS` with the
+    user's credentials on `blocking_pool`, or anything with the same
+    ``*_gs_file*`` methods. Local files are only read from and written to
+    the job's `root` directory, and symbolic links are not followed.
+    All jobs share the limit of `max_concurrent` objects, or parts of
+    objects, in flight. Objects larger than `part_size` bytes are
+    downloaded in parallel parts of that size.
+
+    Downloaded objects are kept in `cache_dir`, up to `max_cache_size`
+    bytes, keyed on URI and generation, and removed least recently used
+    first. A job is only given a cached object after its own store has
+    returned the object's generation, so it can read the object. Concurrent
+    downloads of the same object are made once.
+    """
+
+    def __init__(self, cache_dir, max_concurrent=16, part_size=64 * MiB,
+                 max_cache_size=10 * 1024 * MiB):
+        # for the stores' network calls and for local file operations
+        self.blocking_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2 * max_concurrent)
+        self.cache_dir = cache_dir
+        self.sem = asyncio.Semaphore(max_concurrent)
+        self.part_size = part_size
+        self.max_cache_size = max_cache_size
+
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        os.makedirs(cache_dir)
+        # (uri, generation) -> size, least recently used first
+        self.cached = collections.OrderedDict()
+        self.cache_size = 0
+        # (uri, generation) -> future for the download in progress
+        self.downloads = {}
+        # (uri, generation) -> number of copies out of the cache in progress
+        self.n_users = collections.Counter()
+
+        self.hits = 0
+        self.misses = 0
+        self.bytes_downloaded = 0
+        self.bytes_uploaded = 0
+
+    def cache_path(self, key):
+        uri, generation = key
+        return os.path.join(self.cache_dir, hashlib.sha256(f'{uri}#{generation}'.encode()).hexdigest())
+
+    async def copy(self, store, root, files, messages):
+        """Copy `files`, dicts with ``from`` and ``to``, concurrently,
+        appending a line to `messages` for each file copied. Local paths
+        must be in `root`."""
+        await asyncio.gather(*[self.copy_1(store, root, f['from'], f['to'], messages) for f in files])
+
+    async def copy_1(self, store, root, src, dst, messages):
+        if '*' in src or '?' in src or '[' in src:
+            raise ValueError(f'wildcards are not supported: {src}')
+
+        if is_gs_uri(src):
+            objects = await self.list_objects(store, src, dst)
+            if is_gs_uri(dst):
+                copy = self.copy_object
+            else:
+                copy = self.download
+        else:
+            objects = await blocking_to_async(self.blocking_pool, _list_local_files, src, dst, root)
+            if is_gs_uri(dst):
+                copy = self.upload
+            else:
+                copy = self.copy_local_file
+
+        if not is_gs_uri(dst):
+            # object names can contain .., and the destination can be
+            # under a link the job made
+            objects = await blocking_to_async(self.blocking_pool, _check_destinations, objects, root)
+
+        results = await asyncio.gather(*[copy(store, obj, obj_dst) for obj, obj_dst in objects])
+        messages.extend(results)
+
+    async def list_objects(self, store, src, dst):
+        info = await retry(store.get_gs_file_info, src)
+        if info is not None:
+            return [(info, dst)]
+
+        # a directory
+        prefix = f'{src.rstrip("/")}/'
+        infos = await retry(store.list_gs_files, prefix)
+        objects = [(info, f'{dst.rstrip("/")}/{info[0][len(prefix):]}')
+                   for info in infos
+                   if not info[0].endswith('/')]
+        if not objects:
+            raise FileNotFoundError(f'no such object or prefix: {src}')
+        return objects
+
+    async def copy_local_file(self, store, src, dst):  # pylint: disable=unused-argument
+        await blocking_to_async(self.blocking_pool, _copy_file, src, dst)
+        return f'copied {src} to {dst}'
+
+    async def copy_object(self, store, info, dst):
+        async with self.sem:
+            await retry(store.copy_gs_file, info[0], dst)
+        return f'copied {info[0]} to {dst}'
+
+    async def upload(self, store, src, dst):
+        async with self.sem:
+            await retry(store.upload_gs_file, src, dst)
+        self.bytes_uploaded += os.path.getsize(src)
+        return f'copied {src} to {dst}'
+
+    async def download(self, store, info, dst):
+        uri, size, generation = info
+        if size > self.max_cache_size:
+            await self.download_parts(store, uri, generation, size, dst)
+            return f'copied {uri} to {dst}'
+
+        key = (uri, generation)
+        # pinned, so it is not evicted before it is copied out
+        self.n_users[key] += 1
+        try:
+            hit = key in self.cached
+            if hit:
+                self.hits += 1
+                self.cached.move_to_end(key)
+            else:
+                self.misses += 1
+                fut = self.downloads.get(key)
+                if fut is None:
+                    fut = asyncio.ensure_future(self.download_to_cache(store, key, size))
+                    self.downloads[key] = fut
+                    fut.add_done_callback(lambda _: self.downloads.pop(key, None))
+                # a cancelled job must not cancel a download others are waiting on
+                await asyncio.shield(fut)
+            await blocking_to_async(self.blocking_pool, _copy_file, self.cache_path(key), dst)
+        finally:
+            self.n_users[key] -= 1
+            if self.n_users[key] == 0:
+                del self.n_users[key]
+            self.evict()
+
+        return f'copied {uri} to {dst}{" (cached)" if hit else ""}'
+
+    async def download_to_cache(self, store, key, size):
+        uri, generation = key
+        path = self.cache_path(key)
+        tmp_path = f'{path}.tmp'
+        try:
+            await self.download_parts(store, uri, generation, size, tmp_path)
+            os.rename(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self.cached[key] = size
+        self.cache_size += size
+
+    async def download_parts(self, store, uri, generation, size, path):
+        await blocking_to_async(self.blocking_pool, _allocate, path, size)
+
+        async def download_part(start, end):
+            async with self.sem:
+                await retry(store.download_gs_file_range, uri, generation, path, start, end)
+            self.bytes_downloaded += end - start
+
+        await asyncio.gather(*[
+            download_part(start, min(start + self.part_size, size))
+            for start in range(0, size, self.part_size)
+        ])
+
+    def evict(self):
+        while self.cache_size > self.max_cache_size:
+            key = next((key for key in self.cached if key not in self.n_users), None)
+            if key is None:
+                return
+            self.cache_size -= self.cached.pop(key)
+            try:
+                os.remove(self.cache_path(key))
+            except OSError:
+                log.exception(f'while removing cached {key}, ignoring')
+
+    def report(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'cached': len(self.cached),
+            'cache_size': self.cache_size,
+            'bytes_downloaded': self.bytes_downloaded,
+            'bytes_uploaded': self.bytes_uploaded
+        }
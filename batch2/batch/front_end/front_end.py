@@ -2,6 +2,7 @@ import os
 import concurrent
 import logging
 import json
+import urllib.parse
 import asyncio
 import aiohttp
 from aiohttp import web
@@ -32,6 +33,7 @@ from ..batch import batch_record_to_dict, job_record_to_dict
 from ..log_store import LogStore
 from ..database import CallError, check_call_procedure
 from ..batch_configuration import BATCH_PODS_NAMESPACE
+from ..globals import valid_state_transitions
 
 from . import schemas
 
@@ -62,13 +64,40 @@ deploy_config = get_deploy_config()
 BATCH_JOB_DEFAULT_CPU = os.environ.get('HAIL_BATCH_JOB_DEFAULT_CPU', '1')
 BATCH_JOB_DEFAULT_MEMORY = os.environ.get('HAIL_BATCH_JOB_DEFAULT_MEMORY', '3.75G')
 
+# maximum, and default, number of records per page
+JOBS_PAGE_SIZE = 1000
+BATCHES_PAGE_SIZE = 1000
+
 
 @routes.get('/healthcheck')
 async def get_healthcheck(request):  # pylint: disable=W0613
     return web.Response()
 
 
-async def _get_batch_jobs(app, batch_id, user):
+def _query_limit(params, default, maximum):
+    limit = params.get('limit')
+    if limit is None:
+        return default
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise web.HTTPBadRequest(reason=f'invalid limit {limit}') from None
+    if not 1 <= limit <= maximum:
+        raise web.HTTPBadRequest(reason=f'limit must be between 1 and {maximum}')
+    return limit
+
+
+def _query_id(params, name):
+    id = params.get(name)
+    if id is None:
+        return None
+    try:
+        return int(id)
+    except ValueError:
+        raise web.HTTPBadRequest(reason=f'invalid {name} {id}') from None
+
+
+async def _query_batch_jobs(app, batch_id, user, params, paged=True):
     db = app['db']
 
     record = await db.execute_and_fetchone(
@@ -79,14 +108,52 @@ WHERE user = %s AND id = %s AND NOT deleted;
     if not record:
         raise web.HTTPNotFound()
 
-    jobs = [
-        job_record_to_dict(record)
-        async for record
-        in db.execute_and_fetchall(
-            'SELECT * FROM jobs WHERE batch_id = %s',
-            (batch_id,))
-    ]
-    return sorted(jobs, key=lambda j: j['job_id'])
+    where_conditions = ['batch_id = %s']
+    where_args = [batch_id]
+
+    last_job_id = _query_id(params, 'last_job_id')
+    if last_job_id is not None:
+        where_conditions.append('job_id > %s')
+        where_args.append(last_job_id)
+
+    state = params.get('state')
+    if state is not None:
+        states = state.split(',')
+        for s in states:
+            if s not in valid_state_transitions:
+                raise web.HTTPBadRequest(reason=f'unknown state {s}')
+        where_conditions.append(f'state IN ({", ".join(["%s"] * len(states))})')
+        where_args.extend(states)
+
+    for k in params:
+        if k not in ('last_job_id', 'limit', 'state'):
+            raise web.HTTPBadRequest(reason=f'unknown query parameter {k}')
+
+    if paged:
+        limit = _query_limit(params, JOBS_PAGE_SIZE, JOBS_PAGE_SIZE)
+        limit_clause = 'LIMIT %s'
+        where_args.append(limit)
+    else:
+        limit = None
+        limit_clause = ''
+
+    # jobs are read from the primary key, or from the
+    # (batch_id, state) index if filtering on state, in job_id order
+    sql = f'''
+SELECT * FROM jobs
+WHERE {" AND ".join(where_conditions)}
+ORDER BY batch_id, job_id
+{limit_clause};
+'''
+    jobs = [job_record_to_dict(record)
+            async for record in db.execute_and_fetchall(sql, where_args)]
+
+    # there may be more jobs
+    if len(jobs) == limit:
+        last_job_id = jobs[-1]['job_id']
+    else:
+        last_job_id = None
+    return jobs, last_job_id
 
 
 @routes.get('/api/v1alpha/batches/{batch_id}/jobs')
@@ -95,7 +162,19 @@ WHERE user = %s AND id = %s AND NOT deleted;
 async def get_jobs(request, userdata):
     batch_id = int(request.match_info['batch_id'])
     user = userdata['username']
-    return web.json_response(await _get_batch_jobs(request.app, batch_id, user))
+    params = request.query
+    # clients from before paging send neither parameter, and get every job
+    # as a list
+    if 'limit' not in params and 'last_job_id' not in params:
+        jobs, _ = await _query_batch_jobs(request.app, batch_id, user, params, paged=False)
+        return web.json_response(jobs)
+    jobs, last_job_id = await _query_batch_jobs(request.app, batch_id, user, params)
+    resp = {
+        'jobs': jobs
+    }
+    if last_job_id is not None:
+        resp['last_job_id'] = last_job_id
+    return web.json_response(resp)
 
 
 async def _get_job_log_from_record(app, batch_id, job_id, record):
@@ -168,12 +247,17 @@ async def get_job_log(request, userdata):  # pylint: disable=R1710
     return web.json_response(job_log)
 
 
-async def _get_batches(app, params, user):
+async def _query_batches(app, params, user, paged=True):
     db = app['db']
 
     where_conditions = ['user = %s', 'NOT deleted']
     where_args = [user]
 
+    last_batch_id = _query_id(params, 'last_batch_id')
+    if last_batch_id is not None:
+        where_conditions.append('id < %s')
+        where_args.append(last_batch_id)
+
     complete = params.get('complete')
     if complete is not None:
         complete_expr = '(closed AND n_completed = n_jobs)'
@@ -190,7 +274,7 @@ async def _get_batches(app, params, user):
             where_conditions.append(f'(NOT {success_expr})')
 
     for k, v in params.items():
-        if k in ('complete', 'success'):  # params does not support deletion
+        if k in ('complete', 'success', 'last_batch_id', 'limit'):  # params does not support deletion
             continue
         if not k.startswith('a:'):
             raise web.HTTPBadRequest(reason=f'unknown query parameter {k}')
@@ -203,13 +287,29 @@ async def _get_batches(app, params, user):
         where_args.append(k[2:])
         where_args.append(v)
 
+    if paged:
+        limit = _query_limit(params, BATCHES_PAGE_SIZE, BATCHES_PAGE_SIZE)
+        limit_clause = 'LIMIT %s'
+        where_args.append(limit)
+    else:
+        limit = None
+        limit_clause = ''
+
+    # newest first, from the user index, which includes the id
     sql = f'''
 SELECT * FROM batches
-WHERE {" AND ".join(where_conditions)};
+WHERE {" AND ".join(where_conditions)}
+ORDER BY id DESC
+{limit_clause};
 '''
+    batches = [batch_record_to_dict(record)
+               async for record in db.execute_and_fetchall(sql, where_args)]
 
-    return [batch_record_to_dict(record)
-            async for record in db.execute_and_fetchall(sql, where_args)]
+    if len(batches) == limit:
+        last_batch_id = batches[-1]['id']
+    else:
+        last_batch_id = None
+    return batches, last_batch_id
 
 
 @routes.get('/api/v1alpha/batches')
@@ -218,7 +318,18 @@ WHERE {" AND ".join(where_conditions)};
 async def get_batches(request, userdata):
     params = request.query
     user = userdata['username']
-    return web.json_response(await _get_batches(request.app, params, user))
+    # clients from before paging send neither parameter, and get every
+    # batch as a list
+    if 'limit' not in params and 'last_batch_id' not in params:
+        batches, _ = await _query_batches(request.app, params, user, paged=False)
+        return web.json_response(batches)
+    batches, last_batch_id = await _query_batches(request.app, params, user)
+    resp = {
+        'batches': batches
+    }
+    if last_batch_id is not None:
+        resp['last_batch_id'] = last_batch_id
+    return web.json_response(resp)
 
 
 @routes.post('/api/v1alpha/batches/{batch_id}/jobs/create')
@@ -551,13 +662,17 @@ async def ui_batch(request, userdata):
     user = userdata['username']
 
     batch = await _get_batch(app, batch_id, user)
-    jobs = await _get_batch_jobs(app, batch_id, user)
+    params = {}
+    if 'last_job_id' in request.query:
+        params['last_job_id'] = request.query['last_job_id']
+    jobs, last_job_id = await _query_batch_jobs(app, batch_id, user, params)
     for job in jobs:
         job['exit_code'] = Job.exit_code(job)
         job['duration'] = humanize.naturaldelta(Job.total_duration(job))
     batch['jobs'] = jobs
     page_context = {
-        'batch': batch
+        'batch': batch,
+        'last_job_id': last_job_id
     }
     return await render_template('batch2', request, userdata, 'batch.html', page_context)
 
@@ -582,9 +697,17 @@ async def ui_cancel_batch(request, userdata):
 async def ui_batches(request, userdata):
     params = request.query
     user = userdata['username']
-    batches = await _get_batches(request.app, params, user)
+    batches, last_batch_id = await _query_batches(request.app, params, user)
+    if last_batch_id is not None:
+        # keep the filters
+        next_page_params = [(k, v) for k, v in params.items() if k != 'last_batch_id']
+        next_page_params.append(('last_batch_id', last_batch_id))
+        next_page_query = urllib.parse.urlencode(next_page_params)
+    else:
+        next_page_query = None
     page_context = {
-        'batch_list': batches[::-1]
+        'batch_list': batches,
+        'next_page_query': next_page_query
     }
     return await render_template('batch2', request, userdata, 'batches.html', page_context)
 
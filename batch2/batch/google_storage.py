@@ -1,3 +1,5 @@
+import os
+import mimetypes
 import google.api_core.exceptions
 import google.oauth2.service_account
 import google.cloud.storage
@@ -8,7 +10,7 @@ class GCS:
     @staticmethod
     def _parse_uri(uri):
         assert uri.startswith('gs://'), uri
-        uri = uri.lstrip('gs://').split('/')
+        uri = uri[len('gs://'):].split('/')
         bucket = uri[0]
         path = '/'.join(uri[1:])
         return bucket, path
@@ -27,6 +29,11 @@ class GCS:
         self._wrapped_read_gs_file = self._wrap_network_call(GCS._read_gs_file)
         self._wrapped_delete_gs_file = self._wrap_network_call(GCS._delete_gs_file)
         self._wrapped_delete_gs_files = self._wrap_network_call(GCS._delete_gs_files)
+        self._wrapped_get_gs_file_info = self._wrap_network_call(GCS._get_gs_file_info)
+        self._wrapped_list_gs_files = self._wrap_network_call(GCS._list_gs_files)
+        self._wrapped_download_gs_file_range = self._wrap_network_call(GCS._download_gs_file_range)
+        self._wrapped_upload_gs_file = self._wrap_network_call(GCS._upload_gs_file)
+        self._wrapped_copy_gs_file = self._wrap_network_call(GCS._copy_gs_file)
 
     async def write_gs_file(self, uri, string):
         return await self._wrapped_write_gs_file(self, uri, string)
@@ -40,6 +47,21 @@ class GCS:
     async def delete_gs_files(self, uri_prefix):
         return await self._wrapped_delete_gs_files(self, uri_prefix)
 
+    async def get_gs_file_info(self, uri):
+        return await self._wrapped_get_gs_file_info(self, uri)
+
+    async def list_gs_files(self, uri_prefix):
+        return await self._wrapped_list_gs_files(self, uri_prefix)
+
+    async def download_gs_file_range(self, uri, generation, path, start, end):
+        return await self._wrapped_download_gs_file_range(self, uri, generation, path, start, end)
+
+    async def upload_gs_file(self, path, uri):
+        return await self._wrapped_upload_gs_file(self, path, uri)
+
+    async def copy_gs_file(self, src_uri, dst_uri):
+        return await self._wrapped_copy_gs_file(self, src_uri, dst_uri)
+
     def _wrap_network_call(self, fun):
         async def wrapped(*args, **kwargs):
             return await blocking_to_async(self.blocking_pool,
@@ -75,3 +97,45 @@ class GCS:
         bucket = self.gcs_client.bucket(bucket)
         f = bucket.blob(path)
         f.delete()
+
+    def _get_gs_file_info(self, uri):
+        # (uri, size, generation), or None if there is no such object
+        bucket_name, path = GCS._parse_uri(uri)
+        bucket = self.gcs_client.bucket(bucket_name)
+        f = bucket.get_blob(path)
+        if f is None:
+            return None
+        return (uri, f.size, f.generation)
+
+    def _list_gs_files(self, uri_prefix):
+        bucket_name, prefix = GCS._parse_uri(uri_prefix)
+        bucket = self.gcs_client.bucket(bucket_name)
+        return [(f'gs://{bucket_name}/{f.name}', f.size, f.generation)
+                for f in bucket.list_blobs(prefix=prefix)]
+
+    def _download_gs_file_range(self, uri, generation, path, start, end):
+        # writes bytes [start, end) of the object to the same range of the
+        # existing file at path
+        bucket, name = GCS._parse_uri(uri)
+        bucket = self.gcs_client.bucket(bucket)
+        f = bucket.blob(name)
+        # Blob takes no generation argument in this version of the
+        # client; downloads request the generation in its properties
+        f._properties['generation'] = generation
+        with open(path, 'r+b') as dst:
+            dst.seek(start)
+            f.download_to_file(dst, start=start, end=end - 1)
+
+    def _upload_gs_file(self, path, uri):
+        bucket, name = GCS._parse_uri(uri)
+        bucket = self.gcs_client.bucket(bucket)
+        f = bucket.blob(name)
+        # not through a symbolic link
+        with os.fdopen(os.open(path, os.O_RDONLY | os.O_NOFOLLOW), 'rb') as src:
+            f.upload_from_file(src, content_type=mimetypes.guess_type(path)[0])
+
+    def _copy_gs_file(self, src_uri, dst_uri):
+        src_bucket, src_name = GCS._parse_uri(src_uri)
+        dst_bucket, dst_name = GCS._parse_uri(dst_uri)
+        src_bucket = self.gcs_client.bucket(src_bucket)
+        src_bucket.copy_blob(src_bucket.blob(src_name), self.gcs_client.bucket(dst_bucket), dst_name)
@@ -0,0 +1,196 @@
+import time
+import shutil
+import asyncio
+import logging
+import collections
+from aiodocker.exceptions import DockerError
+
+log = logging.getLogger('image_cache')
+
+
+async def _call(f, *args, **kwargs):
+    return await f(*args, **kwargs)
+
+
+class ImageCache:
+    """Images on this worker, and the users known to have access to them.
+
+    Pulling a private image with a user's credentials verifies the user can
+    read it. The verification is keyed on the user and the ID of the image
+    the name resolved to, and is trusted for `verify_ttl_secs` before the
+    image is pulled again. Concurrent pulls of the same image by the same
+    user share one pull. Public images are pulled only if they are not on
+    the worker.
+
+    When the disk holding `disk_path` is more than `max_disk_fraction` full,
+    images pulled through the cache that no container is using are removed,
+    least recently used first. Images are looked up and pinned for use under
+    the same lock as they are chosen and removed for eviction, so an image
+    is never removed between a pull finding it and a container using it.
+
+    `call(f, *args, **kwargs)` is used to make Docker API calls, for
+    instance to retry them.
+    """
+
+    def __init__(self, docker, call=_call, verify_ttl_secs=5 * 60,
+                 disk_path='/batch', max_disk_fraction=0.8, disk_usage=shutil.disk_usage):
+        self.docker = docker
+        self.call = call
+        self.verify_ttl_secs = verify_ttl_secs
+        self.disk_path = disk_path
+        self.max_disk_fraction = max_disk_fraction
+        self.disk_usage = disk_usage
+
+        # (user, image_id) -> time of the last pull with the user's credentials
+        self.verified = {}
+        # (user, image) -> future for the pull in progress
+        self.pulls = {}
+        # image_id -> time last used, least recently used first
+        self.last_used = collections.OrderedDict()
+        # image_id -> names it was pulled by
+        self.names = collections.defaultdict(set)
+        # image_id -> number of containers using it
+        self.n_users = collections.Counter()
+        # held while looking up and pinning images, and while removing them
+        self.lock = asyncio.Lock()
+        self.evicting = False
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def image_id(self, image):
+        try:
+            return (await self.call(self.docker.images.get, image))['Id']
+        except DockerError as e:
+            if e.status == 404:
+                return None
+            raise
+
+    async def _pull(self, user, image, auth):
+        if auth is not None:
+            await self.call(self.docker.images.pull, image, auth=auth)
+        else:
+            await self.call(self.docker.images.pull, image)
+        image_id = await self.image_id(image)
+        if image_id is None:
+            raise ValueError(f'image {image} not found after pull')
+        if auth is not None:
+            self.verified[(user, image_id)] = time.time()
+        return image_id
+
+    async def _coalesced_pull(self, user, image, auth):
+        key = (user, image)
+        fut = self.pulls.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(self._pull(user, image, auth))
+            self.pulls[key] = fut
+            fut.add_done_callback(lambda _: self.pulls.pop(key, None))
+        # a cancelled job must not cancel the pull others are waiting on
+        return await asyncio.shield(fut)
+
+    async def pull(self, user, image, auth=None):
+        """Make `image` available to `user`, pulling it with `auth` if the
+        user's access to it has not been verified recently. Images pulled
+        without `auth` are public and are not verified.
+
+        The image is in use, and will not be evicted, until :meth:`release`
+        is called with the returned image ID.
+
+        Returns
+        -------
+        (:obj:`str`, :obj:`bool`)
+            The image ID and whether the pull was avoided.
+        """
+        async with self.lock:
+            image_id = await self.image_id(image)
+            if image_id is not None:
+                if auth is None:
+                    hit = True
+                else:
+                    verified_time = self.verified.get((user, image_id))
+                    hit = verified_time is not None and time.time() - verified_time < self.verify_ttl_secs
+                if hit:
+                    self.hits += 1
+                    self.pin(image_id, image)
+                    return image_id, True
+
+        self.misses += 1
+        while True:
+            pulled_image_id = await self._coalesced_pull(None if auth is None else user, image, auth)
+            async with self.lock:
+                # the image may have been evicted, or the name moved to
+                # another image, since it was pulled
+                if await self.image_id(image) == pulled_image_id:
+                    self.pin(pulled_image_id, image)
+                    break
+
+        asyncio.ensure_future(self.evict())
+
+        return pulled_image_id, False
+
+    def pin(self, image_id, image):
+        self.names[image_id].add(image)
+        self.last_used[image_id] = time.time()
+        self.last_used.move_to_end(image_id)
+        self.n_users[image_id] += 1
+
+    def release(self, image_id):
+        self.n_users[image_id] -= 1
+        if self.n_users[image_id] == 0:
+            del self.n_users[image_id]
+        if image_id in self.last_used:
+            self.last_used[image_id] = time.time()
+            self.last_used.move_to_end(image_id)
+
+    def disk_fraction(self):
+        usage = self.disk_usage(self.disk_path)
+        return usage.used / usage.total
+
+    async def evict(self):
+        """Remove unused images, least recently used first, until the disk
+        is no more than `max_disk_fraction` full."""
+        if self.evicting:
+            return
+        self.evicting = True
+        try:
+            while self.disk_fraction() > self.max_disk_fraction:
+                async with self.lock:
+                    image_id = next((image_id for image_id in self.last_used
+                                     if image_id not in self.n_users), None)
+                    if image_id is None:
+                        log.warning('disk over limit but all cached images are in use')
+                        return
+                    await self.remove(image_id)
+        except Exception:  # pylint: disable=broad-except
+            log.exception('while evicting images, ignoring')
+        finally:
+            self.evicting = False
+
+    async def remove(self, image_id):
+        del self.last_used[image_id]
+        for user, verified_image_id in list(self.verified):
+            if verified_image_id == image_id:
+                del self.verified[(user, verified_image_id)]
+        names = self.names.pop(image_id, set())
+        log.info(f'evicting image {image_id} {names}')
+        self.evictions += 1
+        # by name: an image with several names cannot be removed by ID
+        # without force, which would also remove it from under a container
+        for name in names:
+            try:
+                await self.call(self.docker.images.delete, name)
+            except DockerError as e:
+                # 404 already removed, 409 used by a container
+                if e.status in (404, 409):
+                    log.info(f'could not remove image {name}: {e}')
+                else:
+                    raise
+
+    def report(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'images': len(self.last_used)
+        }
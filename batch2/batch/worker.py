@@ -1,7 +1,6 @@
 import os
 import sys
 import json
-from shlex import quote as shq
 import time
 import logging
 import asyncio
@@ -9,6 +8,7 @@ import random
 import traceback
 import base64
 import uuid
+import posixpath
 import shutil
 import aiohttp
 from aiohttp import web
@@ -27,6 +27,9 @@ from .utils import parse_cpu_in_mcpu, parse_image_tag, parse_memory_in_bytes, \
     adjust_cores_for_memory_request, cores_mcpu_to_memory_bytes
 from .semaphore import WeightedSemaphore
 from .log_store import LogStore
+from .google_storage import GCS
+from .file_transfer import FileTransfer
+from .image_cache import ImageCache
 
 # uvloop.install()
 
@@ -119,6 +122,7 @@ class Container:
             log.info(f'adding latest tag to image {self.spec["image"]} for {self}')
             image += ':latest'
         self.image = image
+        self.image_id = None
 
         req_cpu_in_mcpu = parse_cpu_in_mcpu(spec['cpu'])
         req_memory_in_bytes = parse_memory_in_bytes(spec['memory'])
@@ -198,19 +202,13 @@ class Container:
                         'username': '_json_key',
                         'password': key
                     }
-                    # Pull to verify this user has access to this
-                    # image.
-                    # FIXME improve the performance of this with a
-                    # per-user image cache.
-                    await docker_call_retry(
-                        docker.images.pull, self.image, auth=auth)
                 else:
-                    # this caches public images
-                    try:
-                        await docker_call_retry(docker.images.get, self.image)
-                    except DockerError as e:
-                        if e.status == 404:
-                            await docker_call_retry(docker.images.pull, self.image)
+                    auth = None
+                # private images are pulled to verify this user has
+                # access to them, unless verified recently
+                self.image_id, cache_hit = await worker.image_cache.pull(
+                    self.job.user, self.image, auth=auth)
+                self.timing['pulling']['cache_hit'] = cache_hit
 
             async with self.step('creating'):
                 config = self.container_config()
@@ -251,6 +249,9 @@ class Container:
             self.error = traceback.format_exc()
         finally:
             await self.delete_container()
+            if self.image_id:
+                worker.image_cache.release(self.image_id)
+                self.image_id = None
 
     async def get_container_log(self):
         logs = await docker_call_retry(self.container.log, stderr=True, stdout=True)
@@ -322,44 +323,92 @@ def populate_secret_host_path(host_path, secret_data):
                 f.write(base64.b64decode(data).decode())
 
 
-def copy_command(src, dst):
-    if not dst.startswith('gs://'):
-        mkdirs = f'mkdir -p {shq(os.path.dirname(dst))} && '
-    else:
-        mkdirs = ''
-    return f'{mkdirs}retry gsutil -m cp -R {shq(src)} {shq(dst)}'
+class FileCopy:
+    """Copies a job's input or output files with the worker's
+    :class:`.FileTransfer`, in place of a container running gsutil. Its
+    status has the same form as a :class:`.Container`'s, with the exit code
+    1 if a copy failed."""
 
+    def __init__(self, job, name, files):
+        self.job = job
+        self.name = name
+        self.files = files
 
-def copy(files):
-    assert files
+        self.state = 'pending'
+        self.error = None
+        self.timing = {}
+        self.exit_code = None
+        self.messages = []
 
-    copies = ' && '.join([copy_command(f['from'], f['to']) for f in files])
-    return f'''
-set -ex
+    def step(self, name, **kwargs):
+        state = kwargs.get('state', name)
+        return ContainerStepManager(self, name, state)
 
-function retry() {{
-    "$@" ||
-        (sleep 2 && "$@") ||
-        (sleep 5 && "$@")
-}}
+    def store(self, worker):
+        # the user's credentials, so copies are limited to what they can read and write
+        key = json.loads(base64.b64decode(self.job.gsa_key['privateKeyData']).decode())
+        credentials = google.oauth2.service_account.Credentials.from_service_account_info(key)
+        return GCS(worker.file_transfer.blocking_pool, project=key['project_id'], credentials=credentials)
 
-retry gcloud -q auth activate-service-account --key-file=/gsa-key/privateKeyData
+    async def run(self, worker):
+        try:
+            async with self.step('runtime', state=None):
+                async with self.step('copying'):
+                    try:
+                        files = [{'from': self.job.host_path(f['from']), 'to': self.job.host_path(f['to'])}
+                                 for f in self.files]
+                        await worker.file_transfer.copy(
+                            self.store(worker), self.job.io_host_path(), files, self.messages)
+                        self.exit_code = 0
+                    except JobDeletedError:
+                        raise
+                    except Exception:
+                        log.exception(f'while copying for {self}')
+                        self.messages.append(traceback.format_exc())
+                        self.exit_code = 1
 
-{copies}
-'''
+            async with self.step('uploading_log'):
+                await worker.log_store.write_log_file(
+                    self.job.batch_id, self.job.job_id, self.name,
+                    await self.get_log())
 
+            if self.exit_code == 0:
+                self.state = 'succeeded'
+            else:
+                self.state = 'failed'
+        except Exception:
+            log.exception(f'while running {self}')
 
-def copy_container(job, name, files, volume_mounts):
-    sh_expression = copy(files)
-    copy_spec = {
-        'image': 'google/cloud-sdk:269.0.0-alpine',
-        'name': name,
-        'command': ['/bin/sh', '-c', sh_expression],
-        'cpu': '500m' if files else '100m',
-        'memory': '0.5Gi',
-        'volume_mounts': volume_mounts
-    }
-    return Container(job, name, copy_spec)
+            self.state = 'error'
+            self.error = traceback.format_exc()
+
+    async def get_log(self):
+        return ''.join(f'{message}\n' for message in self.messages)
+
+    async def delete(self):
+        # copies in progress stop at their next step
+        pass
+
+    async def status(self, state=None):
+        if not state:
+            state = self.state
+        status = {
+            'name': self.name,
+            'state': state,
+            'timing': self.timing
+        }
+        if self.error:
+            status['error'] = self.error
+        if self.exit_code is not None:
+            status['container_status'] = {
+                'state': 'exited',
+                'exit_code': self.exit_code,
+                'out_of_memory': False
+            }
+        return status
+
+    def __str__(self):
+        return f'copy {self.job.id}/{self.name}'
 
 
 class Job:
@@ -369,6 +418,18 @@ class Job:
     def io_host_path(self):
         return f'{self.scratch}/io'
 
+    def host_path(self, path):
+        # files are copied to and from /io as the job's containers see it
+        if path.startswith('gs://'):
+            return path
+        # so .. cannot leave /io; links are checked when files are copied
+        path = posixpath.normpath(path)
+        if path == '/io' or path.startswith('/io/'):
+            if not self.mount_io:
+                raise ValueError(f'/io is not mounted: {path}')
+            return self.io_host_path() + path[len('/io'):]
+        raise ValueError(f'files can only be copied to and from gs:// and /io: {path}')
+
     def __init__(self, batch_id, user, gsa_key, job_spec):
         self.batch_id = batch_id
         self.user = user
@@ -387,7 +448,6 @@ class Job:
         input_files = job_spec.get('input_files')
         output_files = job_spec.get('output_files')
 
-        copy_volume_mounts = []
         main_volume_mounts = []
 
         if job_spec.get('mount_docker_socket'):
@@ -397,7 +457,6 @@ class Job:
             self.mount_io = True
             volume_mount = f'{self.io_host_path()}:/io'
             main_volume_mounts.append(volume_mount)
-            copy_volume_mounts.append(volume_mount)
         else:
             self.mount_io = False
 
@@ -407,9 +466,6 @@ class Job:
             for secret in secrets:
                 volume_mount = f'{self.secret_host_path(secret)}:{secret["mount_path"]}'
                 main_volume_mounts.append(volume_mount)
-                # this will be the user gsa-key
-                if secret.get('mount_in_copy', False):
-                    copy_volume_mounts.append(volume_mount)
 
         env = []
         for item in job_spec.get('env', []):
@@ -419,8 +475,7 @@ class Job:
         containers = {}
 
         if input_files:
-            containers['input'] = copy_container(
-                self, 'input', input_files, copy_volume_mounts)
+            containers['input'] = FileCopy(self, 'input', input_files)
 
         # main container
         main_spec = {
@@ -435,8 +490,7 @@ class Job:
         containers['main'] = Container(self, 'main', main_spec)
 
         if output_files:
-            containers['output'] = copy_container(
-                self, 'output', output_files, copy_volume_mounts)
+            containers['output'] = FileCopy(self, 'output', output_files)
 
         self.containers = containers
 
@@ -555,6 +609,10 @@ class Worker:
         self.cpu_sem = WeightedSemaphore(self.cores_mcpu)
         self.pool = concurrent.futures.ThreadPoolExecutor()
         self.jobs = {}
+        self.image_cache = ImageCache(docker, call=docker_call_retry)
+        self.file_transfer = FileTransfer(
+            '/batch/file-transfer-cache',
+            max_cache_size=shutil.disk_usage('/batch').total // 10)
 
         # filled in during activation
         self.log_store = None
@@ -566,9 +624,7 @@ class Worker:
         except Exception:
             log.exception(f'while running {job}, ignoring')
 
-    async def create_job_1(self, request):
-        body = await request.json()
-
+    def add_job(self, body):
         batch_id = body['batch_id']
         job_spec = body['job_spec']
         job_id = job_spec['job_id']
@@ -576,7 +632,7 @@ class Worker:
 
         # already running
         if id in self.jobs:
-            return web.Response()
+            return
 
         job = Job(batch_id, body['user'], body['gsa_key'], job_spec)
 
@@ -586,11 +642,30 @@ class Worker:
 
         asyncio.ensure_future(self.run_job(job))
 
+    async def create_job_1(self, request):
+        body = await request.json()
+        self.add_job(body)
         return web.Response()
 
     async def create_job(self, request):
         return await asyncio.shield(self.create_job_1(request))
 
+    async def create_jobs_1(self, request):
+        body = await request.json()
+        # a bad job does not stop the rest; the driver is told which failed
+        errors = []
+        for job_body in body['jobs']:
+            try:
+                self.add_job(job_body)
+                errors.append(None)
+            except Exception:
+                log.exception('while creating job')
+                errors.append(traceback.format_exc())
+        return web.json_response({'errors': errors})
+
+    async def create_jobs(self, request):
+        return await asyncio.shield(self.create_jobs_1(request))
+
     async def get_job_log(self, request):
         batch_id = int(request.match_info['batch_id'])
         job_id = int(request.match_info['job_id'])
@@ -637,6 +712,7 @@ class Worker:
             app = web.Application()
             app.add_routes([
                 web.post('/api/v1alpha/batches/jobs/create', self.create_job),
+                web.post('/api/v1alpha/batches/jobs/create_many', self.create_jobs),
                 web.delete('/api/v1alpha/batches/{batch_id}/jobs/{job_id}/delete', self.delete_job),
                 web.get('/api/v1alpha/batches/{batch_id}/jobs/{job_id}/log', self.get_job_log),
                 web.get('/api/v1alpha/batches/{batch_id}/jobs/{job_id}/status', self.get_job_status),
@@ -652,7 +728,8 @@ class Worker:
 
             idle_duration = time.time() - self.last_updated
             while self.jobs or idle_duration < MAX_IDLE_TIME_SECS:
-                log.info(f'n_jobs {len(self.jobs)} free_cores {self.free_cores_mcpu / 1000} idle {idle_duration}')
+                log.info(f'n_jobs {len(self.jobs)} free_cores {self.free_cores_mcpu / 1000} idle {idle_duration} '
+                         f'image_cache {self.image_cache.report()} file_transfer {self.file_transfer.report()}')
                 await asyncio.sleep(15)
                 idle_duration = time.time() - self.last_updated
 
@@ -58,6 +58,7 @@ CREATE TABLE IF NOT EXISTS `jobs` (
   FOREIGN KEY (`instance_name`) REFERENCES instances(name)
 ) ENGINE = InnoDB;
 CREATE INDEX `jobs_state` ON `jobs` (`state`);
+CREATE INDEX `jobs_batch_id_state` ON `jobs` (`batch_id`, `state`);
 CREATE INDEX `jobs_instance_name` ON `jobs` (`instance_name`);
 
 CREATE TABLE IF NOT EXISTS `ready_cores` (
@@ -172,6 +172,39 @@ class Test(unittest.TestCase):
         s = b1.status(include_jobs=False)
         assert 'jobs' not in s
 
+    def test_list_jobs(self):
+        b = self.client.create_batch()
+        for command in ['true', 'false', 'true']:
+            b.create_job('ubuntu:18.04', [command])
+        b = b.submit()
+        status = b.wait()
+        assert 'jobs' not in status, status
+        status = b.wait(include_jobs=True)
+        assert [j['job_id'] for j in status['jobs']] == [1, 2, 3], status
+
+        assert [j['job_id'] for j in b.jobs()] == [1, 2, 3]
+        assert [j['job_id'] for j in b.jobs(state=['Failed'])] == [2]
+        assert [j['job_id'] for j in b.jobs(state=['Success', 'Failed'])] == [1, 2, 3]
+
+        url = deploy_config.url('batch2', f'/api/v1alpha/batches/{b.id}/jobs')
+        headers = service_auth_headers(deploy_config, 'batch2')
+        r = requests.get(url, params={'limit': 2}, headers=headers)
+        r.raise_for_status()
+        page = r.json()
+        assert [j['job_id'] for j in page['jobs']] == [1, 2] and page['last_job_id'] == 2, page
+        r = requests.get(url, params={'limit': 2, 'last_job_id': 2}, headers=headers)
+        r.raise_for_status()
+        page = r.json()
+        assert [j['job_id'] for j in page['jobs']] == [3] and 'last_job_id' not in page, page
+
+        # without paging parameters, all jobs as before
+        r = requests.get(url, headers=headers)
+        r.raise_for_status()
+        assert [j['job_id'] for j in r.json()] == [1, 2, 3], r.json()
+
+        r = requests.get(url, params={'state': 'Finished'}, headers=headers)
+        assert r.status_code == 400, r
+
     def test_fail(self):
         b = self.client.create_batch()
         j = b.create_job('ubuntu:18.04', ['false'])
@@ -273,7 +306,8 @@ class Test(unittest.TestCase):
         j1.wait()
         j2.wait()
         b.cancel()
-        bstatus = b.wait()
+        b.wait()
+        bstatus = b.status()
 
         assert len(bstatus['jobs']) == 3, bstatus
         state_count = collections.Counter([j['state'] for j in bstatus['jobs']])
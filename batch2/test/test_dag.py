@@ -31,7 +31,8 @@ def test_simple(client):
     head = batch.create_job('ubuntu:18.04', command=['echo', 'head'])
     tail = batch.create_job('ubuntu:18.04', command=['echo', 'tail'], parents=[head])
     batch = batch.submit()
-    status = batch.wait()
+    batch.wait()
+    status = batch.status()
     assert batch_status_job_counter(status, 'Success') == 2, status
     assert batch_status_exit_codes(status) == [
         {'main': 0}, {'main': 0}], status
@@ -57,7 +58,8 @@ def test_dag(client):
     right = batch.create_job('ubuntu:18.04', command=['echo', 'right'], parents=[head])
     tail = batch.create_job('ubuntu:18.04', command=['echo', 'tail'], parents=[left, right])
     batch = batch.submit()
-    status = batch.wait()
+    batch.wait()
+    status = batch.status()
     assert batch_status_job_counter(status, 'Success') == 4, status
     for node in [head, left, right, tail]:
         status = node.status()
@@ -78,7 +80,8 @@ def test_cancel_tail(client):
     left.wait()
     right.wait()
     batch.cancel()
-    status = batch.wait()
+    batch.wait()
+    status = batch.status()
     assert batch_status_job_counter(status, 'Success') == 3, status
     for node in [head, left, right]:
         status = node.status()
@@ -100,7 +103,8 @@ def test_cancel_left_after_tail(client):
     head.wait()
     right.wait()
     batch.cancel()
-    status = batch.wait()
+    batch.wait()
+    status = batch.status()
     assert batch_status_job_counter(status, 'Success') == 2, status
     for node in [head, right]:
         status = node.status()
@@ -212,7 +216,8 @@ def test_always_run_cancel(client):
     batch = batch.submit()
     right.wait()
     batch.cancel()
-    status = batch.wait()
+    batch.wait()
+    status = batch.status()
     assert batch_status_job_counter(status, 'Success') == 3, status
     assert batch_status_job_counter(status, 'Cancelled') == 1, status
 
@@ -230,7 +235,8 @@ def test_always_run_error(client):
                             parents=[head],
                             always_run=True)
     batch = batch.submit()
-    status = batch.wait()
+    batch.wait()
+    status = batch.status()
     assert batch_status_job_counter(status, 'Failed') == 1
     assert batch_status_job_counter(status, 'Success') == 1
 
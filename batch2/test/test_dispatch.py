@@ -0,0 +1,256 @@
+import json
+import time
+import asyncio
+import collections
+import pytest
+import aiohttp
+from aiohttp import web
+from batch.batch import job_config, schedule_jobs
+from batch.database import check_call_procedure
+
+pytestmark = pytest.mark.asyncio
+
+# simulated round-trip latencies, in seconds
+HTTP_LATENCY = 0.005
+DB_LATENCY = 0.002
+
+
+class FakeWorker:
+    """Worker that accepts jobs on `host`:5000 without running them.
+
+    Jobs with IDs in `bad_job_ids` are rejected. Without `create_many`, the
+    worker predates creating several jobs in one request.
+    """
+
+    def __init__(self, host, create_many=True, bad_job_ids=()):
+        self.host = host
+        self.create_many = create_many
+        self.bad_job_ids = set(bad_job_ids)
+        self.jobs = set()
+        self.n_requests = 0
+        self.runner = None
+
+    def add_job(self, body):
+        job_id = body['job_spec']['job_id']
+        if job_id in self.bad_job_ids:
+            raise ValueError(f'bad job {job_id}')
+        self.jobs.add((body['batch_id'], job_id))
+
+    async def create_job(self, request):
+        body = await request.json()
+        await asyncio.sleep(HTTP_LATENCY)
+        self.n_requests += 1
+        self.add_job(body)
+        return web.Response()
+
+    async def create_jobs(self, request):
+        body = await request.json()
+        await asyncio.sleep(HTTP_LATENCY)
+        self.n_requests += 1
+        errors = []
+        for job_body in body['jobs']:
+            try:
+                self.add_job(job_body)
+                errors.append(None)
+            except ValueError as e:
+                errors.append(str(e))
+        return web.json_response({'errors': errors})
+
+    async def start(self):
+        app = web.Application()
+        routes = [web.post('/api/v1alpha/batches/jobs/create', self.create_job)]
+        if self.create_many:
+            routes.append(web.post('/api/v1alpha/batches/jobs/create_many', self.create_jobs))
+        app.add_routes(routes)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, 5000).start()
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+class FakeInstance:
+    def __init__(self, worker):
+        self.name = f'instance-{worker.host}'
+        self.ip_address = worker.host
+        self.state = 'active'
+
+    async def mark_healthy(self):
+        pass
+
+    async def incr_failed_request_count(self):
+        pass
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+    async def execute(self, sql, args=None):
+        await asyncio.sleep(DB_LATENCY)
+        self.db.calls.append(args)
+
+    async def fetchone(self):
+        return {'rc': 0}
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        # acquiring a connection costs a round trip
+        await asyncio.sleep(DB_LATENCY)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+    def cursor(self):
+        return FakeCursor(self.db)
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.calls = []
+        # (batch_id, job_id, state) of jobs marked complete
+        self.completed = []
+        self.pool = self
+
+    def acquire(self):
+        return FakeConnection(self)
+
+    async def execute_and_fetchone(self, sql, args=None):
+        if 'mark_job_complete' in sql:
+            self.completed.append(args[:3])
+            return {'rc': 0, 'old_state': 'Ready', 'instance_name': None, 'cores_mcpu': 1000}
+        if 'FROM batches' in sql:
+            # no callback
+            return None
+        async with self.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, args)
+                return await cursor.fetchone()
+
+
+class FakeK8sClient:
+    class Secret:
+        data = {'key.json': 'e30='}
+
+    async def read_namespaced_secret(self, name, namespace, _request_timeout=None):
+        return self.Secret()
+
+
+def job_records(n_jobs):
+    userdata = json.dumps({'gsa_key_secret_name': 'gsa-key'})
+    for job_id in range(1, n_jobs + 1):
+        spec = {
+            'job_id': job_id,
+            'secrets': [{'name': 'gsa-key', 'namespace': 'batch-pods', 'mount_path': '/gsa-key'}]
+        }
+        yield {'batch_id': 1, 'job_id': job_id, 'spec': json.dumps(spec), 'cores_mcpu': 1000,
+               'userdata': userdata, 'user': 'test'}
+
+
+async def schedule_serially(app, records, instances):
+    # one job at a time, each with its own session and database call, as
+    # the driver did before jobs were dispatched in batches
+    for i, record in enumerate(records):
+        instance = instances[i % len(instances)]
+        body = await job_config(app, record)
+        async with aiohttp.ClientSession(
+                raise_for_status=True, timeout=aiohttp.ClientTimeout(total=60)) as session:
+            url = (f'http://{instance.ip_address}:5000'
+                   f'/api/v1alpha/batches/jobs/create')
+            async with session.post(url, json=body):
+                pass
+        await check_call_procedure(
+            app['db'],
+            'CALL schedule_job(%s, %s, %s);',
+            (record['batch_id'], record['job_id'], instance.name))
+
+
+async def schedule_in_batches(app, records, instances, jobs_per_round=50):
+    # like Scheduler.schedule_1: up to jobs_per_round jobs per round,
+    # dispatched to each instance in one request, instances concurrently
+    for start in range(0, len(records), jobs_per_round):
+        instance_records = collections.defaultdict(list)
+        for i, record in enumerate(records[start:start + jobs_per_round]):
+            instance_records[instances[(start + i) % len(instances)]].append(record)
+        await asyncio.gather(*[
+            schedule_jobs(app, instance_records, instance)
+            for instance, instance_records in instance_records.items()
+        ])
+
+
+async def run_benchmark(schedule, n_jobs=1000, n_workers=4):
+    """Returns the number of jobs dispatched per second and the fake
+    workers."""
+    workers = [FakeWorker(f'127.0.0.{i + 1}') for i in range(n_workers)]
+    for worker in workers:
+        await worker.start()
+    try:
+        async with aiohttp.ClientSession(
+                raise_for_status=True, timeout=aiohttp.ClientTimeout(total=60)) as session:
+            app = {'db': FakeDatabase(), 'k8s_client': FakeK8sClient(), 'client_session': session}
+            records = list(job_records(n_jobs))
+            instances = [FakeInstance(worker) for worker in workers]
+            start = time.time()
+            await schedule(app, records, instances)
+            elapsed = time.time() - start
+    finally:
+        for worker in workers:
+            await worker.stop()
+    return n_jobs / elapsed, workers
+
+
+async def test_batched_dispatch():
+    n_jobs = 200
+    serial_throughput, _ = await run_benchmark(schedule_serially, n_jobs)
+    batched_throughput, workers = await run_benchmark(schedule_in_batches, n_jobs)
+    print(f'dispatched jobs/s: serial {serial_throughput:.1f}, batched {batched_throughput:.1f}')
+
+    assert sum(len(worker.jobs) for worker in workers) == n_jobs
+    # 4 rounds of 50 jobs, one request per worker per round
+    assert [worker.n_requests for worker in workers] == [4, 4, 4, 4]
+
+
+
+async def test_rejected_jobs_and_old_workers():
+    for create_many in [True, False]:
+        worker = FakeWorker('127.0.0.1', create_many=create_many, bad_job_ids=[2])
+        await worker.start()
+        try:
+            async with aiohttp.ClientSession(
+                    raise_for_status=True, timeout=aiohttp.ClientTimeout(total=60)) as session:
+                db = FakeDatabase()
+                app = {'db': db, 'k8s_client': FakeK8sClient(), 'client_session': session,
+                       'scheduler_state_changed': asyncio.Event(), 'inst_pool': None}
+                scheduled = await schedule_jobs(app, list(job_records(4)), FakeInstance(worker))
+        finally:
+            await worker.stop()
+
+        assert [record['job_id'] for record in scheduled] == [1, 3, 4]
+        assert worker.jobs == {(1, 1), (1, 3), (1, 4)}
+        if create_many:
+            # the other jobs are started, and the rejected job fails
+            assert worker.n_requests == 1
+            assert db.completed == [(1, 2, 'Error')]
+        else:
+            # one request per job; the failed job is left ready
+            assert worker.n_requests == 4
+            assert db.completed == []
+
+
+if __name__ == '__main__':
+    loop = asyncio.get_event_loop()
+    for name, schedule in [('serial', schedule_serially), ('batched', schedule_in_batches)]:
+        throughput, _ = loop.run_until_complete(run_benchmark(schedule))
+        print(f'{name}: {throughput:.1f} jobs/s')
@@ -0,0 +1,186 @@
+import heapq
+import asyncio
+import collections
+import pytest
+import sortedcontainers
+from batch.driver.fair_share import FairShare, find_instance
+
+pytestmark = pytest.mark.asyncio
+
+
+class SimInstance:
+    def __init__(self, inst_pool, name, cores_mcpu):
+        self.inst_pool = inst_pool
+        self.name = name
+        self._free_cores_mcpu = cores_mcpu
+
+    @property
+    def free_cores_mcpu(self):
+        return self._free_cores_mcpu
+
+    def adjust_free_cores_in_memory(self, delta_mcpu):
+        self.inst_pool.healthy_instances_by_free_cores.remove(self)
+        self._free_cores_mcpu += delta_mcpu
+        self.inst_pool.healthy_instances_by_free_cores.add(self)
+
+
+class SimInstancePool:
+    def __init__(self, n_instances, worker_cores_mcpu):
+        self.healthy_instances_by_free_cores = sortedcontainers.SortedSet(
+            key=lambda instance: instance.free_cores_mcpu)
+        for i in range(n_instances):
+            self.healthy_instances_by_free_cores.add(SimInstance(self, f'instance-{i}', worker_cores_mcpu))
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+
+async def simulate(jobs, fair_share=None, n_instances=4, worker_cores_mcpu=16000, max_jobs=50):
+    """Replay `jobs`, a list of dicts with `user`, `submitted`, `duration`
+    and `cores_mcpu`, in one second steps against a stubbed instance pool.
+
+    Ready jobs are scheduled by `fair_share` if given, otherwise in
+    submission order like the default scheduler. Returns the queueing
+    latencies by user and the peak running cores by user.
+    """
+    inst_pool = SimInstancePool(n_instances, worker_cores_mcpu)
+    pending = collections.deque(sorted(
+        ({**job, 'batch_id': 1, 'job_id': i} for i, job in enumerate(jobs)),
+        key=lambda job: job['submitted']))
+    ready = collections.OrderedDict()
+    ready_by_user = collections.defaultdict(collections.deque)
+    running = []
+    running_mcpu = collections.defaultdict(int)
+    peak_running_mcpu = collections.defaultdict(int)
+    latencies = collections.defaultdict(list)
+    now = 0
+
+    async def ready_jobs(user):
+        return list(ready_by_user[user])[:max_jobs]
+
+    async def start_job(record):
+        instance = find_instance(inst_pool, record['cores_mcpu'])
+        if instance is None:
+            return False
+        user = record['user']
+        assert ready_by_user[user][0] is record
+        ready_by_user[user].popleft()
+        del ready[record['job_id']]
+        instance.adjust_free_cores_in_memory(-record['cores_mcpu'])
+        if fair_share is not None:
+            fair_share.job_started(record['batch_id'], record['job_id'], user, record['cores_mcpu'])
+        heapq.heappush(running, (now + record['duration'], record['job_id'], record, instance))
+        running_mcpu[user] += record['cores_mcpu']
+        peak_running_mcpu[user] = max(peak_running_mcpu[user], running_mcpu[user])
+        latencies[user].append(now - record['submitted'])
+        return True
+
+    while pending or ready or running:
+        while running and running[0][0] <= now:
+            _, _, record, instance = heapq.heappop(running)
+            instance.adjust_free_cores_in_memory(record['cores_mcpu'])
+            running_mcpu[record['user']] -= record['cores_mcpu']
+            if fair_share is not None:
+                fair_share.job_stopped(record['batch_id'], record['job_id'])
+
+        while pending and pending[0]['submitted'] <= now:
+            job = pending.popleft()
+            ready[job['job_id']] = job
+            ready_by_user[job['user']].append(job)
+
+        while True:
+            if fair_share is not None:
+                users = [user for user, queue in ready_by_user.items() if queue]
+                n = await fair_share.schedule(users, ready_jobs, start_job, max_jobs)
+            else:
+                n = 0
+                for record in list(ready.values())[:max_jobs]:
+                    if await start_job(record):
+                        n += 1
+            if n == 0:
+                break
+
+        now += 1
+
+    return latencies, peak_running_mcpu
+
+
+def report(latencies):
+    return {
+        user: {q: percentile(values, q) for q in (50, 95, 99)}
+        for user, values in latencies.items()
+    }
+
+
+def big_and_small_workload():
+    # one user's large backlog, then a few jobs from another user
+    jobs = [{'user': 'big', 'submitted': 0, 'duration': 10, 'cores_mcpu': 1000} for _ in range(2000)]
+    jobs += [{'user': 'small', 'submitted': 5 + i, 'duration': 10, 'cores_mcpu': 1000} for i in range(20)]
+    return jobs
+
+
+async def test_fair_share_does_not_starve_small_user():
+    default_latencies, _ = await simulate(big_and_small_workload())
+    fair_latencies, _ = await simulate(big_and_small_workload(), FairShare())
+    default_report = report(default_latencies)
+    fair_report = report(fair_latencies)
+    print(f'default: {default_report}\nfair share: {fair_report}')
+
+    assert default_report['small'][95] > 200
+    assert fair_report['small'][95] <= 10
+    assert len(fair_latencies['big']) == 2000
+
+
+async def test_fair_share_weights_and_limits():
+    jobs = [{'user': user, 'submitted': 0, 'duration': 10, 'cores_mcpu': 1000}
+            for user in ('a', 'b') for _ in range(500)]
+
+    fair_share = FairShare(weights={'a': 3})
+    latencies, peak_running_mcpu = await simulate(jobs, fair_share)
+    # while both have ready jobs, a runs three times as many as b
+    assert peak_running_mcpu['a'] == 48000
+    assert percentile(latencies['a'], 50) < percentile(latencies['b'], 50)
+    assert not fair_share.running_jobs and not fair_share.user_running_cores_mcpu
+
+    latencies, peak_running_mcpu = await simulate(jobs, FairShare(limits_mcpu={'a': 8000}))
+    assert peak_running_mcpu['a'] == 8000
+    assert len(latencies['a']) == 500
+
+
+
+async def test_ready_users_maintained_incrementally():
+    fair_share = FairShare()
+    ready_by_user = {'a': [], 'b': [{'batch_id': 1, 'job_id': 1, 'user': 'b', 'cores_mcpu': 1000}]}
+
+    async def ready_jobs(user):
+        if user == 'c':
+            # c's batch is closed while their jobs are read
+            fair_share.user_ready('c')
+        return ready_by_user.get(user, [])
+
+    async def start_job(record):
+        fair_share.job_started(record['batch_id'], record['job_id'], record['user'], record['cores_mcpu'])
+        return True
+
+    for user in 'abc':
+        fair_share.user_ready(user)
+    assert await fair_share.schedule(list(fair_share.ready_users), ready_jobs, start_job, 50) == 1
+    # a has no ready jobs; b's may not all have been read
+    assert set(fair_share.ready_users) == {'b', 'c'}
+
+    ready_by_user['b'] = []
+    assert await fair_share.schedule(list(fair_share.ready_users), ready_jobs, start_job, 50) == 0
+    assert set(fair_share.ready_users) == {'c'}
+
+    # a stopped job's children may be ready
+    fair_share.job_stopped(1, 1)
+    assert set(fair_share.ready_users) == {'b', 'c'}
+
+
+if __name__ == '__main__':
+    loop = asyncio.get_event_loop()
+    for name, fair_share in [('default', None), ('fair share', FairShare())]:
+        latencies, _ = loop.run_until_complete(simulate(big_and_small_workload(), fair_share))
+        print(f'{name}: queueing latency percentiles (s) by user: {report(latencies)}')
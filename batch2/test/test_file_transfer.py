@@ -0,0 +1,189 @@
+import os
+import asyncio
+import pytest
+from batch.file_transfer import FileTransfer
+
+pytestmark = pytest.mark.asyncio
+
+
+class LocalObjectStore:
+    """Object store in a local directory, with the methods of
+    batch.google_storage.GCS that FileTransfer uses."""
+
+    def __init__(self, root):
+        self.root = root
+        self.generations = {}
+        self.n_ranges = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def path(self, uri):
+        assert uri.startswith('gs://')
+        return os.path.join(self.root, uri[len('gs://'):])
+
+    def put(self, uri, data):
+        path = self.path(uri)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        self.generations[uri] = self.generations.get(uri, 0) + 1
+
+    def get(self, uri):
+        with open(self.path(uri), 'rb') as f:
+            return f.read()
+
+    async def get_gs_file_info(self, uri):
+        if uri not in self.generations:
+            return None
+        return (uri, os.path.getsize(self.path(uri)), self.generations[uri])
+
+    async def list_gs_files(self, uri_prefix):
+        return [await self.get_gs_file_info(uri) for uri in sorted(self.generations)
+                if uri.startswith(uri_prefix)]
+
+    async def download_gs_file_range(self, uri, generation, path, start, end):
+        assert self.generations[uri] == generation
+        self.n_ranges += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            with open(self.path(uri), 'rb') as src:
+                src.seek(start)
+                data = src.read(end - start)
+            with open(path, 'r+b') as dst:
+                dst.seek(start)
+                dst.write(data)
+        finally:
+            self.in_flight -= 1
+
+    async def upload_gs_file(self, path, uri):
+        with open(path, 'rb') as f:
+            self.put(uri, f.read())
+
+    async def copy_gs_file(self, src_uri, dst_uri):
+        self.put(dst_uri, self.get(src_uri))
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def store(tmpdir):
+    return LocalObjectStore(str(tmpdir.join('store')))
+
+
+async def test_download_in_parts_and_from_cache(store, tmpdir):
+    data = os.urandom(1000)
+    store.put('gs://b/big', data)
+    transfer = FileTransfer(str(tmpdir.join('cache')), max_concurrent=4, part_size=100)
+
+    messages = []
+    await transfer.copy(store, str(tmpdir), [{'from': 'gs://b/big', 'to': str(tmpdir.join('io/big'))}], messages)
+    assert read(str(tmpdir.join('io/big'))) == data
+    assert store.n_ranges == 10
+    assert store.max_in_flight == 4
+
+    # another job gets the cached object
+    await transfer.copy(store, str(tmpdir), [{'from': 'gs://b/big', 'to': str(tmpdir.join('io2/big'))}], messages)
+    assert read(str(tmpdir.join('io2/big'))) == data
+    assert store.n_ranges == 10
+    assert messages[1].endswith('(cached)')
+
+    # a new generation is downloaded again
+    store.put('gs://b/big', data[::-1])
+    await transfer.copy(store, str(tmpdir), [{'from': 'gs://b/big', 'to': str(tmpdir.join('io3/big'))}], messages)
+    assert read(str(tmpdir.join('io3/big'))) == data[::-1]
+    assert store.n_ranges == 20
+    assert transfer.report()['hits'] == 1 and transfer.report()['misses'] == 2
+
+
+async def test_concurrent_downloads_are_coalesced(store, tmpdir):
+    store.put('gs://b/x', b'x' * 100)
+    transfer = FileTransfer(str(tmpdir.join('cache')))
+
+    await asyncio.gather(*[
+        transfer.copy(store, str(tmpdir), [{'from': 'gs://b/x', 'to': str(tmpdir.join(f'io{i}/x'))}], [])
+        for i in range(5)])
+    assert store.n_ranges == 1
+    assert all(read(str(tmpdir.join(f'io{i}/x'))) == b'x' * 100 for i in range(5))
+    assert not transfer.downloads and not transfer.n_users
+
+
+async def test_directories(store, tmpdir):
+    for name in ['a', 'd/b', 'd/c']:
+        store.put(f'gs://b/in/{name}', name.encode())
+    transfer = FileTransfer(str(tmpdir.join('cache')))
+
+    io = tmpdir.join('io')
+    await transfer.copy(store, str(tmpdir), [{'from': 'gs://b/in', 'to': str(io.join('in'))}], [])
+    assert {name: read(str(io.join('in', name))) for name in ['a', 'd/b', 'd/c']} == \
+        {'a': b'a', 'd/b': b'd/b', 'd/c': b'd/c'}
+
+    await transfer.copy(store, str(tmpdir), [{'from': str(io.join('in')), 'to': 'gs://b/out'}], [])
+    assert {uri: store.get(uri) for uri in store.generations if uri.startswith('gs://b/out/')} == \
+        {'gs://b/out/a': b'a', 'gs://b/out/d/b': b'd/b', 'gs://b/out/d/c': b'd/c'}
+
+    with pytest.raises(FileNotFoundError):
+        await transfer.copy(store, str(tmpdir), [{'from': 'gs://b/missing', 'to': str(io.join('missing'))}], [])
+
+
+async def test_cache_evicts_least_recently_used(store, tmpdir):
+    for name in 'abc':
+        store.put(f'gs://b/{name}', name.encode() * 10)
+    transfer = FileTransfer(str(tmpdir.join('cache')), max_cache_size=20)
+
+    for name in 'abac':
+        await transfer.copy(store, str(tmpdir), [{'from': f'gs://b/{name}', 'to': str(tmpdir.join('io', name))}], [])
+    assert list(transfer.cached) == [('gs://b/a', 1), ('gs://b/c', 1)]
+    assert transfer.cache_size == 20
+    assert sorted(os.listdir(str(tmpdir.join('cache')))) == \
+        sorted(os.path.basename(transfer.cache_path(key)) for key in transfer.cached)
+
+
+async def test_local_paths_stay_in_root(store, tmpdir):
+    transfer = FileTransfer(str(tmpdir.join('cache')))
+    io = tmpdir.join('io')
+    io.ensure(dir=True)
+    outside = tmpdir.join('outside')
+    outside.ensure(dir=True)
+    outside.join('secret').write('secret')
+    root = str(io)
+
+    def copy(src, dst):
+        return transfer.copy(store, root, [{'from': src, 'to': dst}], [])
+
+    io.join('link').mksymlinkto(outside.join('secret'))
+    io.join('dir').ensure(dir=True)
+    io.join('dir', 'link').mksymlinkto(outside.join('secret'))
+    io.join('dir_link').mksymlinkto(outside)
+    store.put('gs://b/x', b'x')
+    store.put('gs://b/in/../../escaped', b'x')
+
+    for src, dst in [
+            # links to files and directories outside the root are not read
+            (str(io.join('link')), 'gs://b/out'),
+            (str(io.join('dir')), 'gs://b/out'),
+            (str(io.join('dir_link', 'secret')), 'gs://b/out'),
+            (str(io.join('..', 'outside', 'secret')), 'gs://b/out'),
+            # or written through
+            ('gs://b/x', str(io.join('link'))),
+            ('gs://b/x', str(io.join('dir_link', 'x'))),
+            ('gs://b/x', str(io.join('..', 'outside', 'x'))),
+            # object names cannot leave the destination
+            ('gs://b/in', str(io.join('in')))]:
+        with pytest.raises(PermissionError):
+            await copy(src, dst)
+
+    assert not any(uri.startswith('gs://b/out') for uri in store.generations)
+    assert outside.listdir() == [outside.join('secret')]
+    assert outside.join('secret').read() == 'secret'
+    assert not tmpdir.join('escaped').exists()
+
+    # links are not followed by a directory walk either
+    io.join('dir', 'link').remove()
+    io.join('dir', 'sub').mksymlinkto(outside)
+    with pytest.raises(PermissionError):
+        await copy(str(io.join('dir')), 'gs://b/out')
@@ -0,0 +1,128 @@
+import asyncio
+import collections
+import pytest
+from aiodocker.exceptions import DockerError
+from batch.image_cache import ImageCache
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeImages:
+    def __init__(self, remote):
+        # name -> image ID in the registry
+        self.remote = remote
+        # name -> image ID on the worker
+        self.local = {}
+        self.pulls = []
+        self.get_delay = 0
+
+    async def get(self, name):
+        await asyncio.sleep(self.get_delay)
+        if name not in self.local:
+            raise DockerError(404, {'message': f'no such image: {name}'})
+        return {'Id': self.local[name]}
+
+    async def pull(self, name, auth=None):
+        self.pulls.append((name, auth))
+        await asyncio.sleep(0.01)
+        self.local[name] = self.remote[name]
+
+    async def delete(self, name):
+        if name not in self.local:
+            raise DockerError(404, {'message': f'no such image: {name}'})
+        del self.local[name]
+
+
+class FakeDocker:
+    def __init__(self, remote):
+        self.images = FakeImages(remote)
+
+
+def fake_disk_usage(docker):
+    # the disk holds one unit per image
+    DiskUsage = collections.namedtuple('DiskUsage', ['total', 'used', 'free'])
+
+    def disk_usage(path):  # pylint: disable=unused-argument
+        used = len(set(docker.images.local.values()))
+        return DiskUsage(10, used, 10 - used)
+    return disk_usage
+
+
+async def test_verified_pulls_are_cached_per_user():
+    docker = FakeDocker({'gcr.io/p/a:1': 'sha256:a'})
+    cache = ImageCache(docker, disk_usage=fake_disk_usage(docker))
+
+    assert await cache.pull('u1', 'gcr.io/p/a:1', auth='k1') == ('sha256:a', False)
+    cache.release('sha256:a')
+    assert await cache.pull('u1', 'gcr.io/p/a:1', auth='k1') == ('sha256:a', True)
+    cache.release('sha256:a')
+    # another user must verify their own access
+    assert await cache.pull('u2', 'gcr.io/p/a:1', auth='k2') == ('sha256:a', False)
+    cache.release('sha256:a')
+    assert docker.images.pulls == [('gcr.io/p/a:1', 'k1'), ('gcr.io/p/a:1', 'k2')]
+
+    # verification expires
+    cache.verified[('u1', 'sha256:a')] -= cache.verify_ttl_secs
+    assert await cache.pull('u1', 'gcr.io/p/a:1', auth='k1') == ('sha256:a', False)
+    cache.release('sha256:a')
+
+    # public images are pulled only if missing
+    docker.images.local['ubuntu:18.04'] = 'sha256:u'
+    assert await cache.pull('u1', 'ubuntu:18.04') == ('sha256:u', True)
+    cache.release('sha256:u')
+    assert cache.report() == {'hits': 2, 'misses': 3, 'evictions': 0, 'images': 2}
+
+
+async def test_concurrent_pulls_are_coalesced():
+    docker = FakeDocker({'gcr.io/p/a:1': 'sha256:a'})
+    cache = ImageCache(docker, disk_usage=fake_disk_usage(docker))
+
+    results = await asyncio.gather(*[cache.pull('u1', 'gcr.io/p/a:1', auth='k1') for _ in range(5)])
+    assert results == [('sha256:a', False)] * 5
+    assert len(docker.images.pulls) == 1
+    assert cache.n_users['sha256:a'] == 5
+    assert not cache.pulls
+
+
+async def test_unused_images_evicted_least_recently_used_first():
+    docker = FakeDocker({f'gcr.io/p/{name}:1': f'sha256:{name}' for name in 'abcdefghij'})
+    cache = ImageCache(docker, max_disk_fraction=0.3, disk_usage=fake_disk_usage(docker))
+
+    image_ids = []
+    for name in 'abc':
+        image_id, _ = await cache.pull('u1', f'gcr.io/p/{name}:1', auth='k1')
+        image_ids.append(image_id)
+    # a is used most recently; b is still in use
+    cache.release(image_ids[2])
+    cache.release(image_ids[0])
+
+    await cache.pull('u1', 'gcr.io/p/d:1', auth='k1')
+    await cache.evict()
+    assert set(docker.images.local) == {'gcr.io/p/a:1', 'gcr.io/p/b:1', 'gcr.io/p/d:1'}
+    assert ('u1', 'sha256:c') not in cache.verified
+    assert cache.evictions == 1
+
+    # evicted images are pulled again
+    assert await cache.pull('u1', 'gcr.io/p/c:1', auth='k1') == ('sha256:c', False)
+
+
+async def test_images_in_use_are_not_evicted():
+    docker = FakeDocker({f'gcr.io/p/{name}:1': f'sha256:{name}' for name in 'ab'})
+    cache = ImageCache(docker, disk_usage=fake_disk_usage(docker))
+    for name in 'ab':
+        image_id, _ = await cache.pull('u1', f'gcr.io/p/{name}:1', auth='k1')
+        cache.release(image_id)
+    # let the evictions started by the pulls finish
+    await asyncio.sleep(0)
+
+    # a is found by a pull while it is chosen for eviction
+    cache.max_disk_fraction = 0.05
+    docker.images.get_delay = 0.01
+    (image_id, hit), _ = await asyncio.gather(cache.pull('u1', 'gcr.io/p/a:1', auth='k1'), cache.evict())
+    assert (image_id, hit) == ('sha256:a', True)
+    assert set(docker.images.local) == {'gcr.io/p/a:1'}
+
+    cache.release(image_id)
+    await cache.evict()
+    assert not docker.images.local
+    assert not cache.last_used and not cache.n_users
@@ -27,7 +27,8 @@ def test_scale(client):
         batch.create_job('alpine:3.8', command=['sleep', str(round(sleep_time))])
 
     batch = batch.submit()
-    status = batch.wait()
+    batch.wait()
+    status = batch.status()
 
     assert batch_status_job_counter(status, 'Success') == n_jobs, status
 
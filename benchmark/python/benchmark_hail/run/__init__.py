@@ -4,6 +4,8 @@ from . import table_benchmarks
 from . import methods_benchmarks
 from . import linalg_benchmarks
 from . import shuffle_benchmarks
+from . import startup_benchmarks
+from . import ir_benchmarks
 
 __all__ = [
     'run_all',
@@ -14,5 +16,7 @@ __all__ = [
     'table_benchmarks',
     'linalg_benchmarks',
     'methods_benchmarks',
-    'shuffle_benchmarks'
+    'shuffle_benchmarks',
+    'startup_benchmarks',
+    'ir_benchmarks'
 ]
@@ -0,0 +1,47 @@
+import hail as hl
+import hail.ir as ir
+from hail.ir.renderer import CSERenderer
+
+from .utils import benchmark
+
+
+def _balanced_ir(n_nodes):
+    # ~n_nodes nodes: a layer of `x * i` leaves combined pairwise with `+`
+    level = [ir.ApplyBinaryPrimOp('*', ir.Ref('x'), ir.I32(i)) for i in range(n_nodes // 4)]
+    while len(level) > 1:
+        level = [ir.ApplyBinaryPrimOp('+', level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                 for i in range(0, len(level), 2)]
+    return level[0]
+
+
+def _all_nodes(root):
+    nodes = []
+    stack = [root]
+    while stack:
+        x = stack.pop()
+        nodes.append(x)
+        stack.extend(x.children)
+    return nodes
+
+
+@benchmark()
+def ir_hash_50k_nodes():
+    nodes = _all_nodes(_balanced_ir(50_000))
+    assert len(set(nodes)) > 1
+
+
+@benchmark()
+def ir_render_repeated_queries():
+    t = ir.TableRange(1_000_000, 8)
+    for i in range(200):
+        idx = ir.GetField(ir.Ref('row'), 'idx')
+        t = ir.TableFilter(t, ir.ApplyComparisonOp('GT', ir.ApplyBinaryPrimOp('+', idx, idx), ir.I32(i)))
+    for i in range(50):
+        CSERenderer()(ir.TableAggregate(t, ir.MakeTuple([ir.I32(i)])))
+
+
+@benchmark()
+def large_literal_reused():
+    s = hl.literal(set(range(1_000_000)))
+    for i in range(5):
+        hl.eval(s.contains(i))
@@ -0,0 +1,12 @@
+import subprocess
+import sys
+
+from .utils import benchmark
+
+
+@benchmark()
+def import_hail():
+    # equivalent to `python -X importtime -c 'import hail'`; the per-module
+    # breakdown is written to stderr
+    subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import hail'],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
@@ -58,6 +58,17 @@ def table_python_construction():
         ht = ht.annotate(**{f'x_{i}': 0})
 
 
+@benchmark()
+def table_python_construction_wide():
+    n_fields = 5_000
+    ht = hl.utils.range_table(100)
+    ht = ht.annotate_globals(**{f'g_{i}': i for i in range(n_fields)})
+    ht = ht.annotate(**{f'x_{i}': ht.idx + i for i in range(n_fields)})
+    for i in range(50):
+        ht = ht.annotate(y=ht.x_0 + i)
+        ht = ht.filter(ht.y > i)
+
+
 @benchmark()
 def table_big_aggregate_compilation():
     n = 1_000
@@ -228,6 +239,56 @@ def table_expr_take(ht_path):
     hl.tuple([ht.f1, ht.f2]).take(100)
 
 
+def _wide_collect_ir():
+    ht = hl.utils.range_table(100_000, 16)
+    ht = ht.annotate(**{f'f{i}': ht.idx * i for i in range(50)},
+                     **{f's{i}': hl.str(ht.idx + i) for i in range(10)})
+    return hl.ir.TableCollect(ht._tir)
+
+
+def _deep_collect_ir():
+    ht = hl.utils.range_table(10_000, 16)
+    ht = ht.annotate(x=hl.range(0, 10).map(
+        lambda i: hl.struct(a=hl.range(0, i).map(lambda j: hl.struct(b=hl.float(j), c=hl.str(j))),
+                            d=hl.dict({hl.str(i): hl.set({i})}))))
+    return hl.ir.TableCollect(ht._tir)
+
+
+@benchmark()
+def table_collect_wide_json():
+    hl.current_backend()._execute_json(_wide_collect_ir())
+
+
+@benchmark()
+def table_collect_wide_encoded():
+    hl.current_backend()._execute_encoded(_wide_collect_ir())
+
+
+@benchmark()
+def table_collect_deep_json():
+    hl.current_backend()._execute_json(_deep_collect_ir())
+
+
+@benchmark()
+def table_collect_deep_encoded():
+    hl.current_backend()._execute_encoded(_deep_collect_ir())
+
+
+@benchmark()
+def python_decode_rows():
+    n = 500_000
+    row_type = hl.tarray(hl.tstruct(locus=hl.tlocus('GRCh37'),
+                                    interval=hl.tinterval(hl.tint32),
+                                    info=hl.tstruct(AC=hl.tint32, AF=hl.tfloat64, name=hl.tstr)))
+    row = ('{"locus": {"contig": "1", "position": 1000},'
+           ' "interval": {"start": 1, "end": 5, "includeStart": true, "includeEnd": false},'
+           ' "info": {"AC": 3, "AF": 0.5, "name": "x"}}')
+    rows = row_type._from_json('[' + ', '.join([row] * n) + ']')
+    for r in rows:
+        r.info.AC
+        r['locus'].position
+
+
 @benchmark(args=many_partitions_tables.handle(1000))
 def read_force_count_p1000(path):
     hl.read_table(path)._force_count()
@@ -361,3 +422,15 @@ def group_by_collect_per_row(path):
 def group_by_take_rekey(path):
     ht = hl.read_matrix_table(path).localize_entries('e', 'c')
     ht.group_by(k=hl.int(ht.row_idx / 50)).aggregate(value=hl.agg.take(ht.row_value, 1))._force_count()
+
+
+@benchmark(args=many_ints_table.handle('ht'))
+def table_aggregate_result_cache(ht_path):
+    backend = hl.utils.java.Env.backend()
+    backend.enable_result_cache()
+    try:
+        ht = hl.read_table(ht_path)
+        for _ in range(20):
+            ht.aggregate(hl.agg.stats(ht.i0))
+    finally:
+        backend.disable_result_cache()
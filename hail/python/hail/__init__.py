@@ -39,7 +39,6 @@ from . import methods
 from . import expr
 from . import stats
 from . import linalg
-from . import plot
 from . import experimental
 from . import ir
 from . import backend
@@ -47,6 +46,11 @@ from . import nd as _nd
 from hail.expr import aggregators as agg
 from hail.utils import Struct, Interval, hadoop_copy, hadoop_open, hadoop_ls, \
     hadoop_stat, hadoop_exists, hadoop_is_file, hadoop_is_dir, copy_log
+from hail.utils.misc import lazy_import as _lazy_import
+
+# plotting pulls in bokeh and pandas, so only load it when first used
+plot = _lazy_import('hail.plot')
+del _lazy_import
 
 scan = agg.aggregators.ScanFunctions({name: getattr(agg, name) for name in agg.__all__})
 
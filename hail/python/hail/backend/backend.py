@@ -1,22 +1,123 @@
 import abc
+import concurrent.futures
+import gzip
 import os
+import threading
+from collections import OrderedDict
 import requests
+import urllib3
 import pyspark
 from hail.utils.java import *
-from hail.expr.types import dtype
+from hail.expr.types import dtype, _has_encoding
 from hail.expr.table_type import *
 from hail.expr.matrix_type import *
 from hail.expr.blockmatrix_type import *
 from hail.ir.renderer import CSERenderer, Renderer
+from .result_cache import ResultCache, input_fingerprint
 from hail.table import Table
 from hail.matrixtable import MatrixTable
 
+# Results are shipped from the JVM unblocked and uncompressed, so they can be
+# decoded directly by `HailType._from_encoding`. Large literals are shipped to
+# the JVM in the same format, see `HailType._to_encoding`.
+RESULT_BUFFER_SPEC = '{"name":"StreamBufferSpec"}'
+
+
+def _is_connect_error(e):
+    # the request was never sent, so it is safe to retry even if it is not
+    # idempotent
+    if isinstance(e, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(e, requests.exceptions.ConnectionError) and e.args:
+        reason = getattr(e.args[0], 'reason', e.args[0])
+        return isinstance(reason, urllib3.exceptions.NewConnectionError)
+    return False
+
 
 class Backend(abc.ABC):
-    @abc.abstractmethod
+    _result_cache = None
+    # maximum number of queries submitted with `execute_async` that run at
+    # once; the rest wait for a free thread
+    max_concurrent_queries = 8
+    _executor = None
+    _executor_lock = threading.Lock()
+
     def execute(self, ir, timed=False):
+        if self._result_cache is None:
+            value, timings = self._execute(ir)
+        else:
+            value, timings = self._result_cache.execute(ir, self._execute)
+        return (value, timings) if timed else value
+
+    def execute_async(self, ir, timed=False):
+        """Start executing `ir` on a background thread.
+
+        Returns
+        -------
+        :class:`concurrent.futures.Future`
+            Future of the result, or of the result and timings if `timed`.
+        """
+        with Backend._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_concurrent_queries, thread_name_prefix='hail-query')
+        return self._executor.submit(self.execute, ir, timed)
+
+    def stop(self):
+        """Wait for queries submitted with :meth:`.execute_async` to finish."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @abc.abstractmethod
+    def _execute(self, ir):
         pass
 
+    def enable_result_cache(self, max_size=1 << 30, spill_dir=None, max_spill_size=1 << 34):
+        """Reuse the results of repeated queries.
+
+        Results of :func:`.eval`, :meth:`.Table.aggregate`,
+        :meth:`.Table.collect` and the like are keyed on the query and on the
+        size and modification time of the files it reads. Queries that write,
+        use random functions, or refer to persisted datasets always execute.
+
+        Warning
+        -------
+        Changes to reference genomes, their sequences, and liftover chains are
+        not tracked. Call :meth:`.disable_result_cache` or clear the cache after
+        modifying them.
+
+        Parameters
+        ----------
+        max_size : :obj:`int`
+            Maximum size, in bytes, of the results held in memory.
+        spill_dir : :obj:`str`, optional
+            Local directory to which results evicted from memory are written.
+        max_spill_size : :obj:`int`
+            Maximum size, in bytes, of the results in `spill_dir`.
+        """
+        self._result_cache = ResultCache(self.fs, max_size, spill_dir, max_spill_size)
+
+    def disable_result_cache(self):
+        """Stop caching query results and discard those already cached."""
+        if self._result_cache is not None:
+            self._result_cache.clear()
+            self._result_cache = None
+
+    def result_cache_report(self):
+        """Hit and miss counts and the size of the result cache.
+
+        Returns
+        -------
+        :obj:`dict` or :obj:`None`
+            ``None`` if the result cache is not enabled.
+        """
+        if self._result_cache is None:
+            return None
+        report = self._result_cache.report()
+        info(f'result cache: {report}')
+        return report
+
     @abc.abstractmethod
     def value_type(self, ir):
         pass
@@ -88,8 +189,15 @@ class Backend(abc.ABC):
 
 
 class SparkBackend(Backend):
+    _max_literal_jirs = 64
+
     def __init__(self):
         self._fs = None
+        # JVM literals decoded from large literals, by encoded id, least
+        # recently used first
+        self._literal_jirs = OrderedDict()
+        # guards _literal_jirs against concurrent queries
+        self._lock = threading.Lock()
 
     @property
     def fs(self):
@@ -100,17 +208,40 @@ class SparkBackend(Backend):
 
     def _to_java_ir(self, ir):
         if not hasattr(ir, '_jir'):
-            r = CSERenderer(stop_at_jir=True)
+            r = CSERenderer(stop_at_jir=True, large_literals=True)
+            code = r(ir)
+            ir_map = dict(r.jirs)
+            for literal_id, literal in r.literals.items():
+                ir_map[literal_id] = self._literal_jir(literal_id, literal)
             # FIXME parse should be static
-            ir._jir = ir.parse(r(ir), ir_map=r.jirs)
+            ir._jir = ir.parse(code, ir_map=ir_map)
         return ir._jir
 
-    def execute(self, ir, timed=False):
+    def _literal_jir(self, literal_id, literal):
+        with self._lock:
+            jir = self._literal_jirs.get(literal_id)
+            if jir is not None:
+                self._literal_jirs.move_to_end(literal_id)
+                return jir
+            jir = Env.hc()._jhc.backend().decodeLiteral(
+                literal._typ._parsable_string(), literal._encoding(), RESULT_BUFFER_SPEC)
+            self._literal_jirs[literal_id] = jir
+            if len(self._literal_jirs) > SparkBackend._max_literal_jirs:
+                self._literal_jirs.popitem(last=False)
+            return jir
+
+    def _execute(self, ir):
+        if _has_encoding(ir.typ):
+            return self._execute_encoded(ir)
+        return self._execute_json(ir)
+
+    def _execute_json(self, ir):
         result = json.loads(Env.hc()._jhc.backend().executeJSON(self._to_java_ir(ir)))
-        value = ir.typ._from_json(result['value'])
-        timings = result['timings']
+        return ir.typ._from_json(result['value']), result['timings']
 
-        return (value, timings) if timed else value
+    def _execute_encoded(self, ir):
+        result = Env.hc()._jhc.backend().executeEncode(self._to_java_ir(ir), RESULT_BUFFER_SPEC)
+        return ir.typ._from_encoding(result._1()), json.loads(result._2())
 
     def value_type(self, ir):
         jir = self._to_java_ir(ir)
@@ -202,15 +333,17 @@ class LocalBackend(Backend):
             ir._jir = ir.parse(r(ir), ir_map=r.jirs)
         return ir._jir
 
-    def execute(self, ir, timed=False):
+    def _execute(self, ir):
         result = json.loads(Env.hail().expr.ir.LocalBackend.executeJSON(self._to_java_ir(ir)))
-        value = ir.typ._from_json(result['value'])
-        timings = result['timings']
-        return (value, timings) if timed else value
+        return ir.typ._from_json(result['value']), result['timings']
 
 
 class ServiceBackend(Backend):
-    def __init__(self, deploy_config=None):
+    _max_types = 256
+    # request bodies smaller than this are not worth compressing
+    _min_compressed_size = 1024
+
+    def __init__(self, deploy_config=None, max_retries=5):
         from hailtop.config import get_deploy_config
         from hailtop.auth import service_auth_headers
 
@@ -218,7 +351,22 @@ class ServiceBackend(Backend):
             deploy_config = get_deploy_config()
         self.url = deploy_config.base_url('apiserver')
         self.headers = service_auth_headers(deploy_config, 'apiserver')
+        # a single session keeps connections to the apiserver alive
+        # between requests, one per concurrently running query
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(self.max_concurrent_queries, 10))
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers.update(self.headers)
+        self._max_retries = max_retries
         self._fs = None
+        # ids of large literals already uploaded to the apiserver
+        self._uploaded_literals = set()
+        # types of leaf relational IRs, by kind, rendered IR and input
+        # fingerprints, least recently used first
+        self._types = OrderedDict()
+        # guards _types against concurrent queries
+        self._lock = threading.Lock()
 
     @property
     def fs(self):
@@ -227,62 +375,154 @@ class ServiceBackend(Backend):
             self._fs = GoogleCloudStorageFS()
         return self._fs
 
-    def _render(self, ir):
-        r = CSERenderer()
+    def _request(self, method, path, *, body=None, data=None, check=True, idempotent=None):
+        """Send a request to the apiserver, retrying transient errors.
+
+        `body` is sent as JSON, `data` as bytes; either is gzip-compressed
+        if large. If `check`, raise a :class:`.FatalError` on a 400 response
+        and an :class:`requests.HTTPError` on other error responses.
+
+        Requests that are not `idempotent`, by default all but GETs, are
+        only retried if the connection could not be made, since otherwise
+        the apiserver may already have acted on them.
+        """
+        from hailtop.utils import is_transient_error, sync_sleep_and_backoff
+
+        headers = {}
+        if body is not None:
+            data = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        if data is not None and len(data) >= self._min_compressed_size:
+            data = gzip.compress(data, compresslevel=6)
+            headers['Content-Encoding'] = 'gzip'
+
+        if idempotent is None:
+            idempotent = method == 'get'
+
+        delay = 0.1
+        retries = 0
+        while True:
+            try:
+                resp = self._session.request(method, f'{self.url}/{path}', data=data, headers=headers)
+                if idempotent and resp.status_code in (408, 502, 503, 504):
+                    resp.raise_for_status()
+                break
+            except Exception as e:  # pylint: disable=broad-except
+                retryable = is_transient_error(e) if idempotent else _is_connect_error(e)
+                if retries >= self._max_retries or not retryable:
+                    raise
+            retries += 1
+            delay = sync_sleep_and_backoff(delay)
+
+        if check:
+            if resp.status_code == 400:
+                resp_json = resp.json()
+                raise FatalError(resp_json['message'])
+            resp.raise_for_status()
+        return resp
+
+    def _upload_literals(self, literals):
+        for literal_id, literal in literals.items():
+            # literals are stored under their content's ID
+            self._request('post', f'literals/{literal_id}', data=literal._encoding(), idempotent=True)
+            self._uploaded_literals.add(literal_id)
+
+    def _post_ir(self, path, ir, idempotent=False):
+        r = CSERenderer(large_literals=True)
+        code = r(ir)
         assert len(r.jirs) == 0
-        return r(ir)
-
-    def execute(self, ir, timed=False):
-        code = self._render(ir)
-        resp = requests.post(f'{self.url}/execute', json=code, headers=self.headers)
+        body = code
+        if r.literals:
+            self._upload_literals({literal_id: literal
+                                   for literal_id, literal in r.literals.items()
+                                   if literal_id not in self._uploaded_literals})
+            body = {
+                'code': code,
+                'literals': {literal_id: literal._typ._parsable_string()
+                             for literal_id, literal in r.literals.items()}
+            }
+        resp = self._request('post', path, body=body, check=False, idempotent=idempotent)
+        if resp.status_code == 400:
+            resp_json = resp.json()
+            if 'missing_literals' in resp_json:
+                # the apiserver restarted or evicted literals uploaded earlier
+                self._upload_literals({literal_id: r.literals[literal_id]
+                                       for literal_id in resp_json['missing_literals']})
+                resp = self._request('post', path, body=body, check=False, idempotent=idempotent)
         if resp.status_code == 400:
             resp_json = resp.json()
             raise FatalError(resp_json['message'])
         resp.raise_for_status()
+        return resp
 
+    def _execute(self, ir):
+        if _has_encoding(ir.typ):
+            return self._execute_encoded(ir)
+        return self._execute_json(ir)
+
+    def _execute_json(self, ir):
+        resp = self._post_ir('execute', ir)
         resp_json = resp.json()
         typ = dtype(resp_json['type'])
         result = json.loads(resp_json['result'])
-        value = typ._from_json(result['value'])
-        timings = result['timings']
-
-        return (value, timings) if timed else value
-
-    def _request_type(self, ir, kind):
-        code = self._render(ir)
-        resp = requests.post(f'{self.url}/type/{kind}', json=code, headers=self.headers)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
-
-        return resp.json()
+        return typ._from_json(result['value']), result['timings']
+
+    def _execute_encoded(self, ir):
+        resp = self._post_ir('execute/encoded', ir)
+        return ir.typ._from_encoding(resp.content), json.loads(resp.headers['Hail-Timings'])
+
+    def _type_key(self, ir, kind):
+        # Relational nodes compute their types locally, so the service is
+        # only asked for the types of leaves, which are determined by the
+        # reader's parameters and the files it reads.
+        reader = getattr(ir, 'reader', None)
+        if reader is None or ir.children:
+            return None
+        paths = reader._input_paths()
+        if paths is None:
+            return None
+        fingerprints = []
+        for path in sorted(set(paths)):
+            fingerprint = input_fingerprint(self.fs, path)
+            if fingerprint is None:
+                return None
+            fingerprints.append(fingerprint)
+        return kind, str(ir), tuple(fingerprints)
+
+    def _request_type(self, ir, kind, from_json):
+        key = self._type_key(ir, kind)
+        if key is not None:
+            with self._lock:
+                typ = self._types.get(key)
+                if typ is not None:
+                    self._types.move_to_end(key)
+                    return typ
+        resp = self._post_ir(f'type/{kind}', ir, idempotent=True)
+        typ = from_json(resp.json())
+        if key is not None:
+            with self._lock:
+                self._types[key] = typ
+                if len(self._types) > self._max_types:
+                    self._types.popitem(last=False)
+        return typ
 
     def value_type(self, ir):
-        resp = self._request_type(ir, 'value')
-        return dtype(resp)
+        return self._request_type(ir, 'value', dtype)
 
     def table_type(self, tir):
-        resp = self._request_type(tir, 'table')
-        return ttable._from_json(resp)
+        return self._request_type(tir, 'table', ttable._from_json)
 
     def matrix_type(self, mir):
-        resp = self._request_type(mir, 'matrix')
-        return tmatrix._from_json(resp)
+        return self._request_type(mir, 'matrix', tmatrix._from_json)
 
     def blockmatrix_type(self, bmir):
-        resp = self._request_type(bmir, 'blockmatrix')
-        return tblockmatrix._from_json(resp)
+        return self._request_type(bmir, 'blockmatrix', tblockmatrix._from_json)
 
     def add_reference(self, config):
-        resp = requests.post(f'{self.url}/references/create', json=config, headers=self.headers)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
+        self._request('post', 'references/create', body=config)
 
     def from_fasta_file(self, name, fasta_file, index_file, x_contigs, y_contigs, mt_contigs, par):
-        resp = requests.post(f'{self.url}/references/create/fasta', json={
+        self._request('post', 'references/create/fasta', body={
             'name': name,
             'fasta_file': fasta_file,
             'index_file': index_file,
@@ -290,77 +530,32 @@ class ServiceBackend(Backend):
             'y_contigs': y_contigs,
             'mt_contigs': mt_contigs,
             'par': par
-        }, headers=self.headers)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
+        })
 
     def remove_reference(self, name):
-        resp = requests.delete(f'{self.url}/references/delete',
-                               json={'name': name},
-                               headers=self.headers)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
+        self._request('delete', 'references/delete', body={'name': name})
 
     def get_reference(self, name):
-        resp = requests.get(f'{self.url}/references/get',
-                            json={'name': name},
-                            headers=self.headers)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
-        return resp.json()
+        return self._request('get', 'references/get', body={'name': name}).json()
 
     def load_references_from_dataset(self, path):
         raise NotImplementedError
 
     def add_sequence(self, name, fasta_file, index_file):
-        resp = requests.post(f'{self.url}/references/sequence/set',
-                             json={'name': name, 'fasta_file': fasta_file, 'index_file': index_file},
-                             headers=self.headers)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
+        self._request('post', 'references/sequence/set',
+                      body={'name': name, 'fasta_file': fasta_file, 'index_file': index_file})
 
     def remove_sequence(self, name):
-        resp = requests.delete(f'{self.url}/references/sequence/delete',
-                               json={'name': name},
-                               headers=self.headers)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
+        self._request('delete', 'references/sequence/delete', body={'name': name})
 
     def add_liftover(self, name, chain_file, dest_reference_genome):
-        resp = requests.post(f'{self.url}/references/liftover/add',
-                             json={'name': name, 'chain_file': chain_file,
-                                   'dest_reference_genome': dest_reference_genome},
-                             headers=self.headers)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
+        self._request('post', 'references/liftover/add',
+                      body={'name': name, 'chain_file': chain_file,
+                            'dest_reference_genome': dest_reference_genome})
 
     def remove_liftover(self, name, dest_reference_genome):
-        resp = requests.delete(f'{self.url}/references/liftover/remove',
-                               json={'name': name, 'dest_reference_genome': dest_reference_genome},
-                               headers=self.headers)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
+        self._request('delete', 'references/liftover/remove',
+                      body={'name': name, 'dest_reference_genome': dest_reference_genome})
 
     def parse_vcf_metadata(self, path):
-        resp = requests.post(f'{self.url}/parse-vcf-metadata',
-                             json={'path': path},
-                             headers=self.headers)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
-        return resp.json()
+        return self._request('post', 'parse-vcf-metadata', body={'path': path}).json()
@@ -0,0 +1,242 @@
+import hashlib
+import io
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+from hail import ir
+from hail.genetics.reference_genome import ReferenceGenome
+from hail.ir.renderer import CSERenderer
+
+
+# Nodes whose results must not be reused: they have side effects, or they are
+# random (their seeds come from the IR, but repeating an identical query is
+# expected to draw again).
+_uncacheable_irs = (
+    ir.TableWrite, ir.MatrixWrite, ir.MatrixMultiWrite, ir.BlockMatrixWrite,
+    ir.BlockMatrixMultiWrite, ir.NDArrayWrite, ir.TableToValueApply,
+    ir.MatrixToValueApply, ir.BlockMatrixToValueApply, ir.BlockMatrixRandom)
+
+
+def input_fingerprint(fs, path):
+    """Size and modification time of the file or directory `path`, or
+    ``None`` if it cannot be determined."""
+    try:
+        stat = fs.stat(path)
+        if stat['is_dir']:
+            # a directory's own modification time does not reliably change
+            # when its contents are rewritten
+            stats = sorted(fs.ls(path), key=lambda s: s['path'])
+        else:
+            stats = [stat]
+    except Exception:  # pylint: disable=broad-except
+        # missing inputs and glob patterns cannot be fingerprinted
+        return None
+    return repr([(s['path'], s['size_bytes'], s['modification_time']) for s in stats])
+
+
+class _Pickler(pickle.Pickler):
+    # reference genomes are stored by name, so cached results refer to the
+    # registered genome rather than a detached copy
+    def persistent_id(self, obj):
+        if isinstance(obj, ReferenceGenome):
+            return ('ReferenceGenome', obj.name)
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        kind, name = pid
+        assert kind == 'ReferenceGenome', pid
+        return ReferenceGenome._references[name]
+
+
+def _dumps(value):
+    f = io.BytesIO()
+    _Pickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(value)
+    return f.getvalue()
+
+
+def _loads(data):
+    return _Unpickler(io.BytesIO(data)).load()
+
+
+class ResultCache(object):
+    """Size-bounded, least-recently-used cache of query results.
+
+    Results are keyed on the rendered IR together with the size and
+    modification time of every file the query reads, so rewriting an input
+    invalidates them. Queries with side effects, random functions, or
+    references to JVM objects (for instance persisted tables) are executed
+    without the cache. Results are stored pickled, so every hit returns a
+    fresh copy.
+
+    Parameters
+    ----------
+    fs : :class:`.FS`
+        File system used to fingerprint inputs.
+    max_size : :obj:`int`
+        Maximum total size, in bytes, of the pickled results held in memory.
+    spill_dir : :obj:`str`, optional
+        Local directory to which results evicted from memory are written.
+    max_spill_size : :obj:`int`, optional
+        Maximum total size, in bytes, of the results in `spill_dir`. Unbounded
+        if not given.
+    """
+
+    def __init__(self, fs, max_size, spill_dir=None, max_spill_size=None):
+        self._fs = fs
+        self._max_size = max_size
+        self._spill_dir = spill_dir
+        self._max_spill_size = max_spill_size
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+        # queries submitted with `Backend.execute_async` share the cache
+        self._lock = threading.Lock()
+        # key -> pickled result, least recently used first
+        self._entries = OrderedDict()
+        self._size = 0
+        # key -> size of the pickled result in 'spill_dir'
+        self._spilled = OrderedDict()
+        self._spilled_size = 0
+        self.hits = 0
+        self.spill_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def execute(self, x, execute):
+        """Return the result of `execute(x)`, from the cache if possible.
+
+        Returns
+        -------
+        (:obj:`object`, :obj:`dict`)
+            The result and the timings of the execution, which are empty on
+            a hit.
+        """
+        key = self._key(x)
+        if key is None:
+            with self._lock:
+                self.bypassed += 1
+            return execute(x)
+
+        with self._lock:
+            data = self._get(key)
+            if data is None:
+                self.misses += 1
+        if data is not None:
+            return _loads(data), {}
+
+        value, timings = execute(x)
+        data = _dumps(value)
+        with self._lock:
+            self._put(key, data)
+        return value, timings
+
+    def _key(self, x):
+        paths = set()
+        seen = set()
+        stack = [x]
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            if isinstance(node, _uncacheable_irs) or node.is_effectful():
+                return None
+            reader = getattr(node, 'reader', None)
+            if reader is not None:
+                input_paths = reader._input_paths()
+                if input_paths is None:
+                    return None
+                paths.update(input_paths)
+            stack.extend(node.children)
+
+        r = CSERenderer(large_literals=True)
+        code = r(x)
+        if r.jirs:
+            return None
+
+        h = hashlib.sha256(code.encode('utf-8'))
+        for path in sorted(paths):
+            fingerprint = input_fingerprint(self._fs, path)
+            if fingerprint is None:
+                return None
+            h.update(b'\0')
+            h.update(fingerprint.encode('utf-8'))
+        return h.hexdigest()
+
+    def _get(self, key):
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+        if key in self._spilled:
+            spill_path = os.path.join(self._spill_dir, key)
+            try:
+                with open(spill_path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                self._spilled_size -= self._spilled.pop(key)
+                return None
+            self._remove_spilled(key)
+            self._put(key, data)
+            self.spill_hits += 1
+            return data
+        return None
+
+    def _put(self, key, data):
+        if len(data) > self._max_size:
+            self._spill(key, data)
+            return
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self._max_size:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self._spill(evicted_key, evicted)
+
+    def _spill(self, key, data):
+        max_spill_size = self._max_spill_size
+        if self._spill_dir is None or (max_spill_size is not None and len(data) > max_spill_size):
+            return
+        with open(os.path.join(self._spill_dir, key), 'wb') as f:
+            f.write(data)
+        self._spilled[key] = len(data)
+        self._spilled_size += len(data)
+        while max_spill_size is not None and self._spilled_size > max_spill_size:
+            self._remove_spilled(next(iter(self._spilled)))
+
+    def _remove_spilled(self, key):
+        self._spilled_size -= self._spilled.pop(key)
+        try:
+            os.remove(os.path.join(self._spill_dir, key))
+        except OSError:
+            pass
+
+    def clear(self):
+        """Remove all results, in memory and spilled."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            for key in list(self._spilled):
+                self._remove_spilled(key)
+
+    def report(self):
+        """Hit and miss counts and the size of the cache.
+
+        Returns
+        -------
+        :obj:`dict`
+        """
+        return {
+            'hits': self.hits,
+            'spill_hits': self.spill_hits,
+            'misses': self.misses,
+            'bypassed': self.bypassed,
+            'entries': len(self._entries),
+            'size': self._size,
+            'spilled_entries': len(self._spilled),
+            'spilled_size': self._spilled_size
+        }
@@ -170,6 +170,7 @@ class HailContext(object):
         return self._default_ref
 
     def stop(self):
+        self._backend.stop()
         Env.hail().HailContext.clear()
         self.sc.stop()
         self.sc = None
@@ -181,6 +182,7 @@ class HailContext(object):
         Env._seed_generator = None
         hail.ir.clear_session_functions()
         ReferenceGenome._references = {}
+        hail.expr.types._clear_type_caches()
 
 
 @typecheck(sc=nullable(SparkContext),
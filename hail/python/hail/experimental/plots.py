@@ -1,13 +1,7 @@
 import json
 import numpy as np
-import pandas as pd
 
 import hail as hl
-from bokeh.layouts import gridplot
-from bokeh.models import *
-from bokeh.palettes import Spectral8
-from bokeh.plotting import figure
-from bokeh.transform import factor_cmap
 from hail.typecheck import *
 from hail.utils.hadoop_utils import *
 
@@ -41,6 +35,9 @@ def plot_roc_curve(ht, scores, tp_label='tp', fp_label='fp', colors=None, title=
     :obj:`tuple` of :class:`.Figure` and :obj:`list` of :obj:`str`
         Figure, and list of AUCs corresponding to scores.
     """
+    from bokeh.models import ColumnDataSource, HoverTool, Title
+    from bokeh.plotting import figure
+
     if colors is None:
         # Get a palette automatically
         from bokeh.palettes import d3
@@ -92,6 +89,13 @@ def hail_metadata(t_path):
     -------
     :class:`bokeh.plotting.figure.Figure` or :class:`bokeh.models.widgets.panels.Tabs` or :class:`bokeh.models.layouts.Column`
     """
+    import pandas as pd
+    from bokeh.layouts import gridplot
+    from bokeh.models import ColumnDataSource, Div, HoverTool, Panel, Tabs
+    from bokeh.palettes import Spectral8
+    from bokeh.plotting import figure
+    from bokeh.transform import factor_cmap
+
     def get_rows_data(rows_files):
         file_sizes = []
         partition_bounds = []
@@ -34,6 +34,8 @@ __all__ = ['HailType',
            'eval',
            'eval_typed',
            'eval_timed',
+           'eval_async',
+           'eval_many',
            'literal',
            'chi_squared_test',
            'if_else',
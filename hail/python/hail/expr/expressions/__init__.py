@@ -47,6 +47,8 @@ __all__ = ['Indices',
            'eval',
            'eval_typed',
            'eval_timed',
+           'eval_async',
+           'eval_many',
            'expr_any',
            'expr_int32',
            'expr_int64',
@@ -129,6 +129,22 @@ def analyze(caller: str,
         raise errors[0]
 
 
+def _eval_ir(caller, expression):
+    from hail.utils.java import Env
+
+    analyze(caller, expression, Indices(expression._indices.source))
+
+    if expression._indices.source is None:
+        ir_type = expression._ir.typ
+        expression_type = expression.dtype
+        if ir_type != expression.dtype:
+            raise ExpressionException(f'Expression type and IR type differed: \n{ir_type}\n vs \n{expression_type}')
+        return expression._ir
+    else:
+        uid = Env.get_uid()
+        return expression._indices.source.select_globals(**{uid: expression}).index_globals()[uid]._ir
+
+
 @typecheck(expression=expr_any)
 def eval_timed(expression):
     """Evaluate a Hail expression, returning the result and the times taken for
@@ -146,18 +162,7 @@ def eval_timed(expression):
     """
     from hail.utils.java import Env
 
-    analyze('eval_timed', expression, Indices(expression._indices.source))
-
-    if expression._indices.source is None:
-        ir_type = expression._ir.typ
-        expression_type = expression.dtype
-        if ir_type != expression.dtype:
-            raise ExpressionException(f'Expression type and IR type differed: \n{ir_type}\n vs \n{expression_type}')
-        return Env.backend().execute(expression._ir, True)
-    else:
-        uid = Env.get_uid()
-        ir = expression._indices.source.select_globals(**{uid: expression}).index_globals()[uid]._ir
-        return Env.backend().execute(ir, True)
+    return Env.backend().execute(_eval_ir('eval_timed', expression), True)
 
 
 @typecheck(expression=expr_any)
@@ -190,6 +195,59 @@ def eval(expression):
     return eval_timed(expression)[0]
 
 
+@typecheck(expression=expr_any)
+def eval_async(expression):
+    """Start evaluating a Hail expression, returning a future of the result.
+
+    Queries started with :func:`.eval_async` run concurrently, up to the
+    backend's ``max_concurrent_queries``.
+
+    Examples
+    --------
+    Evaluate two expressions at once:
+
+    >>> x = hl.eval_async(hl.sum(hl.range(10)))
+    >>> y = hl.eval_async(hl.len('Hail'))
+    >>> x.result(), y.result()
+    (45, 4)
+
+    Parameters
+    ----------
+    expression : :class:`.Expression`
+        Any expression, or a Python value that can be implicitly interpreted as an expression.
+
+    Returns
+    -------
+    :class:`concurrent.futures.Future`
+    """
+    from hail.utils.java import Env
+
+    return Env.backend().execute_async(_eval_ir('eval_async', expression))
+
+
+@typecheck(expressions=expr_any)
+def eval_many(*expressions):
+    """Evaluate several Hail expressions concurrently, returning their results.
+
+    Examples
+    --------
+
+    >>> hl.eval_many(hl.sum(hl.range(10)), hl.len('Hail'))
+    [45, 4]
+
+    Parameters
+    ----------
+    expressions : varargs of :class:`.Expression`
+        Any expressions, or Python values that can be implicitly interpreted as expressions.
+
+    Returns
+    -------
+    :obj:`list`
+    """
+    futures = [eval_async(e) for e in expressions]
+    return [f.result() for f in futures]
+
+
 @typecheck(expression=expr_any)
 def eval_typed(expression):
     """Evaluate a Hail expression, returning the result and the type of the result.
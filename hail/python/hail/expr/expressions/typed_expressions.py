@@ -1,3 +1,4 @@
+import functools
 from typing import *
 
 import hail as hl
@@ -9,7 +10,7 @@ from hail.ir import *
 from hail.typecheck import *
 from hail.utils.java import *
 from hail.utils.linkedlist import LinkedList
-from hail.utils.misc import get_nice_field_error, get_nice_attr_error
+from hail.utils.misc import get_nice_field_error, get_nice_attr_error, LazyFields
 from hail.genetics.reference_genome import reference_genome_type
 
 import tempfile
@@ -1417,6 +1418,16 @@ class DictExpression(Expression):
             hl.agg.explode(lambda elt: hl.tuple((elt[0]._all_summary_aggs(), elt[1]._all_summary_aggs())), hl.array(self))))
 
 
+def _construct_struct_field(ir, type, indices, aggregations, name):
+    if isinstance(ir, MakeStruct):
+        field_ir = ir.fields[type._struct_field_index[name]][1]
+    elif isinstance(ir, SelectFields):
+        field_ir = GetField(ir.old, name)
+    else:
+        field_ir = GetField(ir, name)
+    return construct_expr(field_ir, type._field_types[name], indices, aggregations)
+
+
 class StructExpression(Mapping[str, Expression], Expression):
     """Expression of type :class:`.tstruct`.
 
@@ -1447,33 +1458,18 @@ class StructExpression(Mapping[str, Expression], Expression):
         ir = MakeStruct([(n, expr._ir) for (n, expr) in fields.items()])
         indices, aggregations = unify_all(*fields.values())
         s = StructExpression.__new__(cls)
-        s._fields = {}
-        for k, v in fields.items():
-            s._set_field(k, v)
+        fields = dict(fields)
+        s._fields = LazyFields(fields, fields.__getitem__)
         super(StructExpression, s).__init__(ir, t, indices, aggregations)
         return s
 
     @typecheck_method(ir=IR, type=HailType, indices=Indices, aggregations=LinkedList)
     def __init__(self, ir, type, indices=Indices(), aggregations=LinkedList(Aggregation)):
         super(StructExpression, self).__init__(ir, type, indices, aggregations)
-        self._fields: Dict[str, Expression] = {}
-
-        for i, (f, t) in enumerate(self.dtype.items()):
-            if isinstance(self._ir, MakeStruct):
-                expr = construct_expr(self._ir.fields[i][1], t, self._indices,
-                                          self._aggregations)
-            elif isinstance(self._ir, SelectFields):
-                expr = construct_expr(GetField(self._ir.old, f), t, self._indices,
-                                      self._aggregations)
-            else:
-                expr = construct_expr(GetField(self._ir, f), t, self._indices,
-                                          self._aggregations)
-            self._set_field(f, expr)
-
-    def _set_field(self, key, value):
-        self._fields[key] = value
-        if key not in self.__dict__:
-            self.__dict__[key] = value
+        # field expressions are constructed on first access
+        self._fields: Dict[str, Expression] = LazyFields(
+            self.dtype._field_types,
+            functools.partial(_construct_struct_field, self._ir, self.dtype, self._indices, self._aggregations))
 
     def _get_field(self, item):
         if item in self._fields:
@@ -1484,8 +1480,13 @@ class StructExpression(Mapping[str, Expression], Expression):
     def __getattr__(self, item):
         if item in self.__dict__:
             return self.__dict__[item]
-        else:
-            raise AttributeError(get_nice_attr_error(self, item))
+        fields = self.__dict__.get('_fields')
+        if fields is not None and item in fields:
+            return fields[item]
+        raise AttributeError(get_nice_attr_error(self, item))
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()).union(self.__dict__.get('_fields', ())))
 
     def __len__(self):
         return len(self._fields)
@@ -1543,7 +1544,7 @@ class StructExpression(Mapping[str, Expression], Expression):
         def get_type(field):
             e = insertions_dict.get(field)
             if e is None:
-                e = self._fields[field]
+                return self.dtype._field_types[field]
             return e.dtype
 
         new_type = hl.tstruct(**{f: get_type(f) for f in field_order})
@@ -1580,7 +1581,7 @@ class StructExpression(Mapping[str, Expression], Expression):
         :class:`.StructExpression`
             Struct with new or updated fields.
         """
-        new_types = {n: t for (n, t) in self.dtype.items()}
+        new_types = dict(self.dtype._field_types)
 
         for f, e in named_exprs.items():
             new_types[f] = e.dtype
@@ -1,6 +1,8 @@
 import abc
 import json
 import math
+import weakref
+from collections import OrderedDict
 from collections.abc import Mapping, Sequence
 
 import numpy as np
@@ -123,8 +125,54 @@ def dtype(type_str):
     -------
     :class:`.HailType`
     """
-    tree = type_grammar.parse(type_str)
-    return type_node_visitor.visit(tree)
+    t = _parsed_types.get(type_str)
+    if t is None:
+        t = type_node_visitor.visit(type_grammar.parse(type_str))
+        if '?' not in type_str:
+            # types with variables keep their state in shared boxes, so they
+            # are safe to reuse but have no canonical string to intern by
+            t = _intern(t)
+        if len(_parsed_types) >= _max_parsed_types:
+            _parsed_types.popitem(last=False)
+        _parsed_types[type_str] = t
+    else:
+        _parsed_types.move_to_end(type_str)
+    return t
+
+
+# parsed type strings, least recently used first
+_parsed_types = OrderedDict()
+_max_parsed_types = 4096
+
+# canonical instance of each type parsed by `dtype`, keyed by `str(t)`
+_canonical_types = weakref.WeakValueDictionary()
+
+
+def _intern(t):
+    return _canonical_types.setdefault(str(t), t)
+
+
+def _clear_type_caches():
+    # parsed locus types hold on to reference genomes, which are
+    # re-created for each session
+    _parsed_types.clear()
+    _canonical_types.clear()
+
+
+def _cached(f):
+    """Memoize a method with no arguments on an immutable type."""
+    attr = '_cached_' + f.__name__
+
+    def wrapper(self):
+        d = self.__dict__
+        v = d.get(attr)
+        if v is None:
+            v = f(self)
+            d[attr] = v
+        return v
+    wrapper.__name__ = f.__name__
+    wrapper.__doc__ = f.__doc__
+    return wrapper
 
 
 class HailTypeContext(object):
@@ -175,12 +223,13 @@ class HailType(object):
         return
 
     def __eq__(self, other):
-        return isinstance(other, HailType) and self._eq(other)
+        return self is other or (isinstance(other, HailType) and self._eq(other))
 
     @abc.abstractmethod
     def __str__(self):
         return
 
+    @_cached
     def __hash__(self):
         # FIXME this is a bit weird
         return 43 + hash(str(self))
@@ -256,6 +305,30 @@ class HailType(object):
     def _convert_from_json(self, x):
         return x
 
+    def _from_encoding(self, encoding):
+        # results are encoded as a single-field tuple in which every type is
+        # optional, see `Backend.executeEncode` on the JVM
+        from hail.utils.byte_reader import ByteReader
+        byte_reader = ByteReader(memoryview(encoding))
+        if byte_reader.read_missing_bits(1)[0]:
+            return None
+        return self._convert_from_encoding(byte_reader)
+
+    def _convert_from_encoding(self, byte_reader):
+        raise NotImplementedError(f"cannot decode values of type '{self}'")
+
+    def _to_encoding(self, value):
+        # the inverse of `_from_encoding`, see `Backend.decodeLiteral` on the
+        # JVM
+        from hail.utils.byte_writer import ByteWriter
+        byte_writer = ByteWriter()
+        byte_writer.write_missing_bits([value is None])
+        if value is not None:
+            self._convert_to_encoding(byte_writer, value)
+        return byte_writer.to_bytes()
+
+    def _convert_to_encoding(self, byte_writer, x):
+        raise NotImplementedError(f"cannot encode values of type '{self}'")
 
     def _traverse(self, obj, f):
         """Traverse a nested type and object.
@@ -344,6 +417,12 @@ class _tint32(HailType):
     def _parsable_string(self):
         return "Int32"
 
+    def _convert_from_encoding(self, byte_reader):
+        return byte_reader.read_int32()
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_int32(x)
+
     @property
     def min_value(self):
         return -(1 << 31)
@@ -393,6 +472,12 @@ class _tint64(HailType):
     def _parsable_string(self):
         return "Int64"
 
+    def _convert_from_encoding(self, byte_reader):
+        return byte_reader.read_int64()
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_int64(x)
+
     @property
     def min_value(self):
         return -(1 << 63)
@@ -439,6 +524,12 @@ class _tfloat32(HailType):
     def _convert_from_json(self, x):
         return float(x)
 
+    def _convert_from_encoding(self, byte_reader):
+        return byte_reader.read_float32()
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_float32(x)
+
     def _convert_to_json(self, x):
         if math.isfinite(x):
             return x
@@ -482,6 +573,12 @@ class _tfloat64(HailType):
     def _convert_from_json(self, x):
         return float(x)
 
+    def _convert_from_encoding(self, byte_reader):
+        return byte_reader.read_float64()
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_float64(x)
+
     def _convert_to_json(self, x):
         if math.isfinite(x):
             return x
@@ -523,6 +620,15 @@ class _tstr(HailType):
     def _parsable_string(self):
         return "String"
 
+    def _convert_from_encoding(self, byte_reader):
+        length = byte_reader.read_int32()
+        return str(byte_reader.read_bytes_view(length), 'utf-8')
+
+    def _convert_to_encoding(self, byte_writer, x):
+        b = x.encode('utf-8')
+        byte_writer.write_int32(len(b))
+        byte_writer.write_bytes(b)
+
     def unify(self, t):
         return t == tstr
 
@@ -555,6 +661,12 @@ class _tbool(HailType):
     def _parsable_string(self):
         return "Boolean"
 
+    def _convert_from_encoding(self, byte_reader):
+        return byte_reader.read_bool()
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_bool(x)
+
     def unify(self, t):
         return t == tbool
 
@@ -631,6 +743,7 @@ class tndarray(HailType):
         if annotation is not None and not isinstance(annotation, np.ndarray):
             raise TypeError("type 'ndarray' expected Python 'numpy.ndarray', but found type '%s'" % type(annotation))
 
+    @_cached
     def __str__(self):
         return "ndarray<{}, {}>".format(self.element_type, self.ndim)
 
@@ -644,6 +757,7 @@ class tndarray(HailType):
         l.append(str(self.ndim))
         l.append('>')
 
+    @_cached
     def _parsable_string(self):
         return f'NDArray[{self._element_type._parsable_string()},{self.ndim}]'
 
@@ -725,6 +839,7 @@ class tarray(HailType):
             if not isinstance(annotation, Sequence):
                 raise TypeError("type 'array' expected Python 'list', but found type '%s'" % type(annotation))
 
+    @_cached
     def __str__(self):
         return "array<{}>".format(self.element_type)
 
@@ -736,12 +851,19 @@ class tarray(HailType):
         self.element_type._pretty(l, indent, increment)
         l.append('>')
 
+    @_cached
     def _parsable_string(self):
         return "Array[" + self.element_type._parsable_string() + "]"
 
     def _convert_from_json(self, x):
         return [self.element_type._convert_from_json_na(elt) for elt in x]
 
+    def _convert_from_encoding(self, byte_reader):
+        return _decode_array_elements(self.element_type, byte_reader)
+
+    def _convert_to_encoding(self, byte_writer, x):
+        _encode_array_elements(self.element_type, byte_writer, x)
+
     def _convert_to_json(self, x):
         return [self.element_type._convert_to_json_na(elt) for elt in x]
 
@@ -808,6 +930,7 @@ class tset(HailType):
             if not isinstance(annotation, set):
                 raise TypeError("type 'set' expected Python 'set', but found type '%s'" % type(annotation))
 
+    @_cached
     def __str__(self):
         return "set<{}>".format(self.element_type)
 
@@ -819,12 +942,19 @@ class tset(HailType):
         self.element_type._pretty(l, indent, increment)
         l.append('>')
 
+    @_cached
     def _parsable_string(self):
         return "Set[" + self.element_type._parsable_string() + "]"
 
     def _convert_from_json(self, x):
         return {self.element_type._convert_from_json_na(elt) for elt in x}
 
+    def _convert_from_encoding(self, byte_reader):
+        return set(_decode_array_elements(self.element_type, byte_reader))
+
+    def _convert_to_encoding(self, byte_writer, x):
+        _encode_array_elements(self.element_type, byte_writer, list(x))
+
     def _convert_to_json(self, x):
         return [self.element_type._convert_to_json_na(elt) for elt in x]
 
@@ -909,6 +1039,7 @@ class tdict(HailType):
             if not isinstance(annotation, dict):
                 raise TypeError("type 'dict' expected Python 'dict', but found type '%s'" % type(annotation))
 
+    @_cached
     def __str__(self):
         return "dict<{}, {}>".format(self.key_type, self.value_type)
 
@@ -922,6 +1053,7 @@ class tdict(HailType):
         self.value_type._pretty(l, indent, increment)
         l.append('>')
 
+    @_cached
     def _parsable_string(self):
         return "Dict[{},{}]".format(self.key_type._parsable_string(), self.value_type._parsable_string())
 
@@ -929,6 +1061,29 @@ class tdict(HailType):
         return {self.key_type._convert_from_json_na(elt['key']): self.value_type._convert_from_json_na(elt['value']) for
                 elt in x}
 
+    def _convert_from_encoding(self, byte_reader):
+        # entries are required structs with optional key and value
+        length = byte_reader.read_int32()
+        kt = self.key_type
+        vt = self.value_type
+        d = {}
+        for _ in range(length):
+            key_missing, value_missing = byte_reader.read_missing_bits(2)
+            k = None if key_missing else kt._convert_from_encoding(byte_reader)
+            d[k] = None if value_missing else vt._convert_from_encoding(byte_reader)
+        return d
+
+    def _convert_to_encoding(self, byte_writer, x):
+        kt = self.key_type
+        vt = self.value_type
+        byte_writer.write_int32(len(x))
+        for k, v in x.items():
+            byte_writer.write_missing_bits([k is None, v is None])
+            if k is not None:
+                kt._convert_to_encoding(byte_writer, k)
+            if v is not None:
+                vt._convert_to_encoding(byte_writer, v)
+
     def _convert_to_json(self, x):
         return [{'key': self.key_type._convert_to_json(k),
                  'value':self.value_type._convert_to_json(v)} for k, v in x.items()]
@@ -972,6 +1127,8 @@ class tstruct(HailType, Mapping):
     def __init__(self, **field_types):
         self._field_types = field_types
         self._fields = tuple(field_types)
+        # shared by every Struct value decoded with this type
+        self._struct_field_index = {f: i for i, f in enumerate(self._fields)}
         super(tstruct, self).__init__()
 
     @property
@@ -1025,6 +1182,7 @@ class tstruct(HailType, Mapping):
     def __len__(self):
         return len(self._fields)
 
+    @_cached
     def __str__(self):
         return "struct{{{}}}".format(
             ', '.join('{}: {}'.format(escape_parsable(f), str(t)) for f, t in self.items()))
@@ -1053,13 +1211,29 @@ class tstruct(HailType, Mapping):
         l.append(' ' * pre_indent)
         l.append('}')
 
+    @_cached
     def _parsable_string(self):
         return "Struct{{{}}}".format(
             ','.join('{}:{}'.format(escape_parsable(f), t._parsable_string()) for f, t in self.items()))
 
     def _convert_from_json(self, x):
         from hail.utils import Struct
-        return Struct(**{f: t._convert_from_json_na(x.get(f)) for f, t in self.items()})
+        return Struct._from_values(self._struct_field_index,
+                                   tuple(t._convert_from_json_na(x.get(f)) for f, t in self._field_types.items()))
+
+    def _convert_from_encoding(self, byte_reader):
+        from hail.utils import Struct
+        missing = byte_reader.read_missing_bits(len(self._fields))
+        return Struct._from_values(self._struct_field_index,
+                                   tuple(None if m else t._convert_from_encoding(byte_reader)
+                                         for t, m in zip(self._field_types.values(), missing)))
+
+    def _convert_to_encoding(self, byte_writer, x):
+        values = [x[f] for f in self._fields]
+        byte_writer.write_missing_bits([v is None for v in values])
+        for t, v in zip(self._field_types.values(), values):
+            if v is not None:
+                t._convert_to_encoding(byte_writer, v)
 
     def _convert_to_json(self, x):
         return {f: t._convert_to_json_na(x[f]) for f, t in self.items()}
@@ -1181,6 +1355,7 @@ class tunion(HailType, Mapping):
     def __len__(self):
         return len(self._cases)
 
+    @_cached
     def __str__(self):
         return "union{{{}}}".format(
             ', '.join('{}: {}'.format(escape_parsable(f), str(t)) for f, t in self.items()))
@@ -1209,6 +1384,7 @@ class tunion(HailType, Mapping):
         l.append(' ' * pre_indent)
         l.append('}')
 
+    @_cached
     def _parsable_string(self):
         return "Union{{{}}}".format(
             ','.join('{}:{}'.format(escape_parsable(f), t._parsable_string()) for f, t in self.items()))
@@ -1287,6 +1463,7 @@ class ttuple(HailType, Sequence):
     def __len__(self):
         return len(self._types)
 
+    @_cached
     def __str__(self):
         return "tuple({})".format(", ".join([str(t) for t in self.types]))
 
@@ -1309,12 +1486,24 @@ class ttuple(HailType, Sequence):
         l.append(' ' * pre_indent)
         l.append(')')
 
+    @_cached
     def _parsable_string(self):
         return "Tuple[{}]".format(",".join([t._parsable_string() for t in self.types]))
 
     def _convert_from_json(self, x):
         return tuple(self.types[i]._convert_from_json_na(x[i]) for i in range(len(self.types)))
 
+    def _convert_from_encoding(self, byte_reader):
+        missing = byte_reader.read_missing_bits(len(self._types))
+        return tuple(None if m else t._convert_from_encoding(byte_reader)
+                     for t, m in zip(self._types, missing))
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_missing_bits([v is None for v in x])
+        for t, v in zip(self._types, x):
+            if v is not None:
+                t._convert_to_encoding(byte_writer, v)
+
     def _convert_to_json(self, x):
         return [self.types[i]._convert_to_json_na(x[i]) for i in range(len(self.types))]
 
@@ -1361,7 +1550,13 @@ class _tcall(HailType):
         return "Call"
 
     def _convert_from_json(self, x):
-        return hl.Call._from_java(hl.Call._call_jobject().parse(x))
+        return hl.Call._parse(x)
+
+    def _convert_from_encoding(self, byte_reader):
+        return hl.Call._from_java(byte_reader.read_int32())
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_int32(x._to_java())
 
     def _convert_to_json(self, x):
         return str(x)
@@ -1406,9 +1601,11 @@ class tlocus(HailType):
                 raise TypeError("type '{}' encountered Locus with reference genome {}"
                                 .format(self, repr(annotation.reference_genome)))
 
+    @_cached
     def __str__(self):
         return "locus<{}>".format(escape_parsable(str(self.reference_genome)))
 
+    @_cached
     def _parsable_string(self):
         return "Locus({})".format(escape_parsable(str(self.reference_genome)))
 
@@ -1432,7 +1629,17 @@ class tlocus(HailType):
         l.append('locus<{}>'.format(escape_parsable(self.reference_genome.name)))
 
     def _convert_from_json(self, x):
-        return genetics.Locus(x['contig'], x['position'], reference_genome=self.reference_genome)
+        return genetics.Locus._from_fields(x['contig'], x['position'], self.reference_genome)
+
+    def _convert_from_encoding(self, byte_reader):
+        # contig and position are required
+        contig = tstr._convert_from_encoding(byte_reader)
+        position = byte_reader.read_int32()
+        return genetics.Locus._from_fields(contig, position, self.reference_genome)
+
+    def _convert_to_encoding(self, byte_writer, x):
+        tstr._convert_to_encoding(byte_writer, x.contig)
+        byte_writer.write_int32(x.position)
 
     def _convert_to_json(self, x):
         return {'contig': x.contig, 'position': x.position}
@@ -1497,6 +1704,7 @@ class tinterval(HailType):
                 raise TypeError("type '{}' encountered Interval with point type {}"
                                 .format(self, repr(annotation.point_type)))
 
+    @_cached
     def __str__(self):
         return "interval<{}>".format(str(self.point_type))
 
@@ -1508,15 +1716,36 @@ class tinterval(HailType):
         self.point_type._pretty(l, indent, increment)
         l.append('>')
 
+    @_cached
     def _parsable_string(self):
         return "Interval[{}]".format(self.point_type._parsable_string())
 
     def _convert_from_json(self, x):
         from hail.utils import Interval
-        return Interval(self.point_type._convert_from_json_na(x['start']),
-                        self.point_type._convert_from_json_na(x['end']),
-                        x['includeStart'],
-                        x['includeEnd'])
+        return Interval._from_fields(self.point_type._convert_from_json_na(x['start']),
+                                     self.point_type._convert_from_json_na(x['end']),
+                                     x['includeStart'],
+                                     x['includeEnd'],
+                                     self.point_type)
+
+    def _convert_from_encoding(self, byte_reader):
+        from hail.utils import Interval
+        # includes_start and includes_end are required
+        start_missing, end_missing = byte_reader.read_missing_bits(2)
+        start = None if start_missing else self.point_type._convert_from_encoding(byte_reader)
+        end = None if end_missing else self.point_type._convert_from_encoding(byte_reader)
+        includes_start = byte_reader.read_bool()
+        includes_end = byte_reader.read_bool()
+        return Interval._from_fields(start, end, includes_start, includes_end, self.point_type)
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_missing_bits([x.start is None, x.end is None])
+        if x.start is not None:
+            self.point_type._convert_to_encoding(byte_writer, x.start)
+        if x.end is not None:
+            self.point_type._convert_to_encoding(byte_writer, x.end)
+        byte_writer.write_bool(x.includes_start)
+        byte_writer.write_bool(x.includes_end)
 
     def _convert_to_json(self, x):
         return {'start': self.point_type._convert_to_json_na(x.start),
@@ -1685,6 +1914,51 @@ def is_compound(t) -> bool:
             or isinstance(t, tndarray))
 
 
+def _has_encoding(t) -> bool:
+    if isinstance(t, (tarray, tset)):
+        return _has_encoding(t.element_type)
+    if isinstance(t, tdict):
+        return _has_encoding(t.key_type) and _has_encoding(t.value_type)
+    if isinstance(t, (tstruct, ttuple)):
+        return all(_has_encoding(ft) for ft in t.types)
+    if isinstance(t, tinterval):
+        return _has_encoding(t.point_type)
+    return t.__class__ in _interned_types or isinstance(t, tlocus)
+
+
+_fixed_width_encodings = {_tint32: '<i4', _tint64: '<i8', _tfloat32: '<f4', _tfloat64: '<f8'}
+
+
+def _decode_array_elements(element_type, byte_reader):
+    length = byte_reader.read_int32()
+    missing = byte_reader.read_missing_bits(length)
+    np_dtype = _fixed_width_encodings.get(element_type.__class__)
+    if np_dtype is not None:
+        # present elements are stored contiguously, decode them in one pass
+        n_present = length - sum(missing)
+        itemsize = np.dtype(np_dtype).itemsize
+        values = np.frombuffer(byte_reader.read_bytes_view(n_present * itemsize), dtype=np_dtype).tolist()
+        if n_present == length:
+            return values
+        it = iter(values)
+        return [None if m else next(it) for m in missing]
+    return [None if m else element_type._convert_from_encoding(byte_reader) for m in missing]
+
+
+def _encode_array_elements(element_type, byte_writer, values):
+    byte_writer.write_int32(len(values))
+    missing = [v is None for v in values]
+    byte_writer.write_missing_bits(missing)
+    np_dtype = _fixed_width_encodings.get(element_type.__class__)
+    if np_dtype is not None:
+        present = [v for v in values if v is not None] if any(missing) else values
+        byte_writer.write_bytes(np.array(present, dtype=np_dtype).tobytes())
+        return
+    for v in values:
+        if v is not None:
+            element_type._convert_to_encoding(byte_writer, v)
+
+
 def types_match(left, right) -> bool:
     return (len(left) == len(right)
             and all(map(lambda lr: lr[0].dtype == lr[1].dtype, zip(left, right))))
@@ -1,5 +1,7 @@
+import math
+
 from hail.typecheck import *
-from hail.utils.java import *
+from hail.utils.java import FatalError
 
 
 class Call(object):
@@ -26,46 +28,82 @@ class Call(object):
      - :func:`.parse_call`
     """
 
-    _cached_jobject = None
-
-    @staticmethod
-    def _call_jobject():
-        if not Call._cached_jobject:
-            Call._cached_jobject = scala_object(Env.hail().variant, 'Call')
-        return Call._cached_jobject
+    __slots__ = ['_alleles', '_phased']
 
     @typecheck_method(alleles=sequenceof(int),
                       phased=bool)
     def __init__(self, alleles, phased=False):
         if len(alleles) > 2:
             raise NotImplementedError("Calls with greater than 2 alleles are not supported.")
-        self._phased = phased
+        for a in alleles:
+            if a < 0:
+                raise FatalError(f"allele indices must be >= 0. Found {list(alleles)}.")
+        alleles = list(alleles)
+        # unphased diploid calls are stored as an unordered pair
+        if len(alleles) == 2 and not phased and alleles[0] > alleles[1]:
+            alleles.reverse()
         self._alleles = alleles
-        self._ploidy = len(alleles)
-        self._call = scala_object(Env.hail().variant, 'CallN').apply(alleles, phased)
+        self._phased = phased
+        if _allele_repr(self._alleles, phased) >> 29 != 0:
+            raise FatalError(f"invalid allele representation for call {self}. Max value is 2^29 - 1")
 
     @classmethod
-    def _from_java(cls, jc):
+    def _from_fields(cls, alleles, phased):
         c = Call.__new__(cls)
-        c._call = jc
-        c._alleles = None
-        c._phased = None
-        c._ploidy = None
-        super(Call, c).__init__()
+        c._alleles = alleles
+        c._phased = phased
         return c
 
+    @classmethod
+    def _from_java(cls, jc):
+        """Decode the integer encoding of a call used on the JVM."""
+        phased = (jc & 0x1) == 1
+        ploidy = (jc >> 1) & 0x3
+        ar = jc >> 3
+        if ploidy == 0:
+            alleles = []
+        elif ploidy == 1:
+            alleles = [ar]
+        elif ploidy == 2:
+            j, k = _allele_pair(ar)
+            alleles = [j, k - j] if phased else [j, k]
+        else:
+            raise NotImplementedError("Calls with greater than 2 alleles are not supported.")
+        return cls._from_fields(alleles, phased)
+
+    def _to_java(self):
+        """Return the integer encoding of this call used on the JVM."""
+        return (_allele_repr(self._alleles, self._phased) << 3) | (len(self._alleles) << 1) | int(self._phased)
+
+    @classmethod
+    def _parse(cls, s):
+        """Parse the string representation produced by :meth:`__str__`."""
+        phased = '|' in s
+        if s in ('-', '|-'):
+            alleles = []
+        else:
+            alleles = [int(a) for a in s.lstrip('|').split('|' if phased else '/')]
+        return cls(alleles, phased)
+
     def __str__(self):
-        return Call._call_jobject().toString(self._call)
+        alleles = self._alleles
+        ploidy = len(alleles)
+        if ploidy == 0:
+            return '|-' if self._phased else '-'
+        if ploidy == 1:
+            return f'|{alleles[0]}' if self._phased else str(alleles[0])
+        sep = '|' if self._phased else '/'
+        return f'{alleles[0]}{sep}{alleles[1]}'
 
     def __repr__(self):
         return 'Call(alleles=%s, phased=%s)' % (self.alleles, self.phased)
 
     def __eq__(self, other):
-        return isinstance(other, Call) and self._call == other._call
+        return isinstance(other, Call) and self._phased == other._phased and self._alleles == other._alleles
 
     def __hash__(self):
         # hash('Call') = 0x16f6c8bfbd18ab94
-        return hash(self._call) ^ 0x16f6c8bfbd18ab94
+        return hash(self._to_java()) ^ 0x16f6c8bfbd18ab94
 
     def __getitem__(self, item):
         """Get the i*th* allele.
@@ -84,9 +122,6 @@ class Call(object):
         -------
         :obj:`list` of :obj:`int`
         """
-
-        if self._alleles is None:
-            self._alleles = jarray_to_list(Call._call_jobject().alleles(self._call))
         return self._alleles
 
     @property
@@ -97,10 +132,7 @@ class Call(object):
         -------
         :obj:`int`
         """
-
-        if not self._ploidy:
-            self._ploidy = Call._call_jobject().ploidy(self._call)
-        return self._ploidy
+        return len(self._alleles)
 
     @property
     def phased(self):
@@ -110,9 +142,6 @@ class Call(object):
         -------
         :obj:`bool`
         """
-
-        if not self._phased:
-            self._phased = Call._call_jobject().isPhased(self._call)
         return self._phased
 
     def is_haploid(self):
@@ -121,7 +150,7 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHaploid(self._call)
+        return len(self._alleles) == 1
 
     def is_diploid(self):
         """True if the ploidy == 2.
@@ -129,7 +158,7 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isDiploid(self._call)
+        return len(self._alleles) == 2
 
     def is_hom_ref(self):
         """True if the call has no alternate alleles.
@@ -137,7 +166,7 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHomRef(self._call)
+        return len(self._alleles) > 0 and all(a == 0 for a in self._alleles)
 
     def is_het(self):
         """True if the call contains two different alleles.
@@ -145,7 +174,7 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHet(self._call)
+        return len(self._alleles) == 2 and self._alleles[0] != self._alleles[1]
 
     def is_hom_var(self):
         """True if the call contains two identical alternate alleles.
@@ -153,7 +182,10 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHomVar(self._call)
+        alleles = self._alleles
+        if len(alleles) == 1:
+            return alleles[0] > 0
+        return len(alleles) == 2 and alleles[0] == alleles[1] and alleles[0] > 0
 
     def is_non_ref(self):
         """True if the call contains any non-reference alleles.
@@ -161,7 +193,7 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isNonRef(self._call)
+        return any(a != 0 for a in self._alleles)
 
     def is_het_non_ref(self):
         """True if the call contains two different alternate alleles.
@@ -169,7 +201,7 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHetNonRef(self._call)
+        return self.is_het() and self._alleles[0] > 0 and self._alleles[1] > 0
 
     def is_het_ref(self):
         """True if the call contains one reference and one alternate allele.
@@ -177,7 +209,7 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHetRef(self._call)
+        return self.is_het() and (self._alleles[0] == 0 or self._alleles[1] == 0)
 
     def n_alt_alleles(self):
         """Returns the count of non-reference alleles.
@@ -185,7 +217,7 @@ class Call(object):
         :rtype: int
         """
 
-        return Call._call_jobject().nNonRefAlleles(self._call)
+        return sum(a != 0 for a in self._alleles)
 
     @typecheck_method(n_alleles=int)
     def one_hot_alleles(self, n_alleles):
@@ -222,7 +254,11 @@ class Call(object):
         -------
         :obj:`list` of :obj:`int`
         """
-        return jiterable_to_list(Call._call_jobject().oneHotAlleles(self._call, n_alleles))
+        one_hot = [0] * n_alleles
+        for a in self._alleles:
+            if a < n_alleles:
+                one_hot[a] += 1
+        return one_hot
 
     def unphased_diploid_gt_index(self):
         """Return the genotype index for unphased, diploid calls.
@@ -235,4 +271,26 @@ class Call(object):
         if self.ploidy != 2 or self.phased:
             raise FatalError(
                 "'unphased_diploid_gt_index' is only valid for unphased, diploid calls. Found {}.".format(repr(self)))
-        return Call._call_jobject().unphasedDiploidGtIndex(self._call)
+        j, k = self._alleles
+        return k * (k + 1) // 2 + j
+
+
+def _allele_pair(gt_index):
+    k = int((math.sqrt(8 * gt_index + 1) - 1) / 2)
+    # guard against floating point error for large indices
+    while k * (k + 1) // 2 > gt_index:
+        k -= 1
+    while (k + 1) * (k + 2) // 2 <= gt_index:
+        k += 1
+    return gt_index - k * (k + 1) // 2, k
+
+
+def _allele_repr(alleles, phased):
+    if len(alleles) == 0:
+        return 0
+    if len(alleles) == 1:
+        return alleles[0]
+    j, k = alleles
+    if phased:
+        k = j + k
+    return k * (k + 1) // 2 + j
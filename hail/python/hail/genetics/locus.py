@@ -27,6 +27,8 @@ class Locus(object):
      - :func:`.locus_from_global_position`
     """
 
+    __slots__ = ['_contig', '_position', '_rg']
+
     @typecheck_method(contig=oneof(str, int),
                       position=int,
                       reference_genome=reference_genome_type)
@@ -38,6 +40,15 @@ class Locus(object):
         self._position = position
         self._rg = reference_genome
 
+    @classmethod
+    def _from_fields(cls, contig, position, reference_genome):
+        # fast path for decoding, `reference_genome` must be a ReferenceGenome
+        l = Locus.__new__(cls)
+        l._contig = contig
+        l._position = position
+        l._rg = reference_genome
+        return l
+
     def __str__(self):
         return f'{self._contig}:{self._position}'
 
@@ -1,3 +1,4 @@
+import os
 import abc
 
 from hail.utils.java import Env
@@ -16,7 +17,35 @@ def _env_bind(env, bindings):
         return env
 
 
+def _compute_hashes(root):
+    # post-order without recursion, so deep trees can be hashed; each node's
+    # hash is computed once from its head and its children's cached hashes
+    stack = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if node._hash is not None:
+            continue
+        if not children_done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children
+                         if isinstance(child, BaseIR) and child._hash is None)
+        elif type(node).__hash__ is BaseIR.__hash__:
+            node._hash = hash((type(node),
+                               node.head_str(),
+                               tuple(hash(child) for child in node.children)))
+        else:
+            # nodes defining their own hash combine their children's
+            node._hash = hash(node)
+
+
 class BaseIR(Renderable):
+    # structural hash, computed on first use; nodes must not be mutated after
+    # construction, which is checked when HAIL_CHECK_IR_MUTATION is set
+    _hash = None
+    # text rendered by 'CSERenderer', keyed by its options; see
+    # 'CSERenderer.__call__'
+    _rendered = None
+
     def __init__(self, *children):
         super().__init__()
         self._type = None
@@ -63,7 +92,12 @@ class BaseIR(Renderable):
         return
 
     def __eq__(self, other):
-        return isinstance(other, self.__class__) and self.children == other.children and self._eq(other)
+        if self is other:
+            return True
+        return isinstance(other, self.__class__) \
+            and hash(self) == hash(other) \
+            and self.children == other.children \
+            and self._eq(other)
 
     def __ne__(self, other):
         return not self == other
@@ -83,7 +117,9 @@ class BaseIR(Renderable):
         return True
 
     def __hash__(self):
-        return 31 + hash(str(self))
+        if self._hash is None:
+            _compute_hashes(self)
+        return self._hash
 
     def new_block(self, i: int) -> bool:
         return self.renderable_new_block(self.renderable_idx_of_child(i))
@@ -182,6 +218,20 @@ class BaseIR(Renderable):
         return set()
 
 
+def _check_mutation_setattr(self, name, value):
+    # attributes with a leading underscore hold derived values and caches,
+    # like the type; the others determine the hash
+    if self._hash is not None and not name.startswith('_'):
+        raise AttributeError(f"cannot set '{name}' on {self._ir_name()}: "
+                             f"IRs are immutable once hashed")
+    object.__setattr__(self, name, value)
+
+
+# the check slows down building IR by nearly half, so it is for debugging
+if os.environ.get('HAIL_CHECK_IR_MUTATION'):
+    BaseIR.__setattr__ = _check_mutation_setattr
+
+
 class IR(BaseIR):
     def __init__(self, *children):
         super().__init__(*children)
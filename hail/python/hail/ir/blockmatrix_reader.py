@@ -14,12 +14,20 @@ class BlockMatrixReader(object):
     def __eq__(self, other):
         pass
 
+    def _input_paths(self):
+        """Paths of the files this reader reads, or ``None`` if they are not
+        known."""
+        return None
+
 
 class BlockMatrixNativeReader(BlockMatrixReader):
     @typecheck_method(path=str)
     def __init__(self, path):
         self.path = path
 
+    def _input_paths(self):
+        return [self.path]
+
     def render(self):
         reader = {'name': 'BlockMatrixNativeReader',
                   'path': self.path}
@@ -37,6 +45,9 @@ class BlockMatrixBinaryReader(BlockMatrixReader):
         self.shape = shape
         self.block_size = block_size
 
+    def _input_paths(self):
+        return [self.path]
+
     def render(self):
         reader = {'name': 'BlockMatrixBinaryReader',
                   'path': self.path,
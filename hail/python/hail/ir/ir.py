@@ -1,10 +1,12 @@
 import copy
-from collections import defaultdict
+import hashlib
+from collections import defaultdict, OrderedDict
 
 import decorator
 
 import hail
 from hail.expr.types import *
+from hail.expr.types import _has_encoding
 from hail.ir.blockmatrix_writer import BlockMatrixWriter, BlockMatrixMultiWriter
 from hail.typecheck import *
 from hail.utils.misc import escape_str, dump_json, parsable_strings, escape_id
@@ -1338,10 +1340,87 @@ class AggArrayPerElement(IR):
         return self.renderable_agg_bindings(i, default_value)
 
 
+def _parse_signature(sig):
+    if isinstance(sig, str):
+        return dtype(sig)
+    if isinstance(sig, tuple):
+        return tuple(_parse_signature(t) for t in sig)
+    return sig
+
+
+class _Registry(object):
+    """Overloads by function name.
+
+    Signatures may be registered as type strings; those for a given name are
+    only parsed the first time the name is looked up. Overload resolution for
+    concrete argument types is memoized, for the `max_resolved` most recently
+    used names and argument types, until that name's overloads change.
+    """
+
+    def __init__(self, max_resolved=4096):
+        self._parsed = defaultdict(list)
+        self._unparsed = defaultdict(list)
+        self._max_resolved = max_resolved
+        # (name, arg_types) -> result, least recently used first
+        self._resolved = OrderedDict()
+        # name -> arg_types in _resolved
+        self._resolved_arg_types = defaultdict(set)
+
+    def _invalidate(self, name):
+        for arg_types in self._resolved_arg_types.pop(name, ()):
+            del self._resolved[(name, arg_types)]
+
+    def register(self, name, sig):
+        self._unparsed[name].append(sig)
+        self._invalidate(name)
+
+    def _parse(self, name):
+        unparsed = self._unparsed.pop(name, None)
+        if unparsed is not None:
+            self._parsed[name].extend(_parse_signature(sig) for sig in unparsed)
+
+    def __contains__(self, name):
+        return name in self._unparsed or name in self._parsed
+
+    def __getitem__(self, name):
+        self._parse(name)
+        return self._parsed.get(name, [])
+
+    def resolve(self, name, arg_types, resolve):
+        """Return ``resolve(self[name])``, memoized on `arg_types`, which must
+        be hashable and fully determine the result."""
+        key = (name, arg_types)
+        try:
+            result = self._resolved[key]
+            self._resolved.move_to_end(key)
+            return result
+        except KeyError:
+            pass
+        result = resolve(self[name])
+        self._resolved[key] = result
+        self._resolved_arg_types[name].add(arg_types)
+        if len(self._resolved) > self._max_resolved:
+            (evicted_name, evicted_arg_types), _ = self._resolved.popitem(last=False)
+            evicted = self._resolved_arg_types[evicted_name]
+            evicted.discard(evicted_arg_types)
+            if not evicted:
+                del self._resolved_arg_types[evicted_name]
+        return result
+
+    def remove(self, name, sig):
+        self._invalidate(name)
+        self._parse(name)
+        sig = _parse_signature(sig)
+        bindings = [b for b in self._parsed.pop(name, []) if b != sig]
+        if bindings:
+            self._parsed[name] = bindings
+
+
 def _register(registry, name, f):
-    registry[name].append(f)
+    registry.register(name, f)
 
-_aggregator_registry = defaultdict(list)
+
+_aggregator_registry = _Registry()
 
 
 def register_aggregator(name, ctor_params, init_params, seq_params, ret_type):
@@ -1350,27 +1429,39 @@ def register_aggregator(name, ctor_params, init_params, seq_params, ret_type):
 
 def lookup_aggregator_return_type(name, ctor_args, init_args, seq_args):
     if name in _aggregator_registry:
-        fns = _aggregator_registry[name]
-        for f in fns:
-            (ctor_params, init_params, seq_params, ret_type) = f
-            for p in ctor_params:
-                p.clear()
-            if init_params:
-                for p in init_params:
-                    p.clear()
-            for p in seq_params:
-                p.clear()
-            if init_params:
-                init_match = all(p.unify(a) for p, a in zip(init_params, init_args))
-            else:
-                init_match = init_args is None
-            if (init_match
-                    and all(p.unify(a) for p, a in zip(ctor_params, ctor_args))
-                    and all(p.unify(a) for p, a in zip(seq_params, seq_args))):
-                return ret_type.subst()
+        ctor_args = tuple(ctor_args)
+        init_args = None if init_args is None else tuple(init_args)
+        seq_args = tuple(seq_args)
+        ret_type = _aggregator_registry.resolve(
+            name,
+            (ctor_args, init_args, seq_args),
+            lambda fns: _unify_aggregator_return_type(fns, ctor_args, init_args, seq_args))
+        if ret_type is not None:
+            return ret_type
     raise KeyError(f'aggregator {name}({ ",".join([str(t) for t in seq_args]) }) not found')
 
 
+def _unify_aggregator_return_type(fns, ctor_args, init_args, seq_args):
+    for f in fns:
+        (ctor_params, init_params, seq_params, ret_type) = f
+        for p in ctor_params:
+            p.clear()
+        if init_params:
+            for p in init_params:
+                p.clear()
+        for p in seq_params:
+            p.clear()
+        if init_params:
+            init_match = all(p.unify(a) for p, a in zip(init_params, init_args))
+        else:
+            init_match = init_args is None
+        if (init_match
+                and all(p.unify(a) for p, a in zip(ctor_params, ctor_args))
+                and all(p.unify(a) for p, a in zip(seq_params, seq_args))):
+            return ret_type.subst()
+    return None
+
+
 class BaseApplyAggOp(IR):
     @typecheck_method(agg_op=str,
                       constructor_args=sequenceof(IR),
@@ -1742,8 +1833,8 @@ class Die(IR):
         return True
 
 
-_function_registry = defaultdict(list)
-_seeded_function_registry = defaultdict(list)
+_function_registry = _Registry()
+_seeded_function_registry = _Registry()
 _session_functions = set()
 _udf_registry = dict()
 
@@ -1761,13 +1852,7 @@ def clear_session_functions():
 
 
 def remove_function(name, param_types, ret_type):
-    f = (param_types, ret_type)
-    bindings = _function_registry[name]
-    bindings = [b for b in bindings if b != f]
-    if not bindings:
-        del _function_registry[name]
-    else:
-        _function_registry[name] = bindings
+    _function_registry.remove(name, (param_types, ret_type))
 
 
 def register_session_function(name, param_types, ret_type):
@@ -2204,19 +2289,53 @@ class BlockMatrixToValueApply(IR):
         self._type = tfloat64
 
 
+def encoded_literal_id(type_string, encoding):
+    """Name under which an encoded literal is shipped to and cached by a
+    backend, derived from its type and encoded value."""
+    h = hashlib.sha256(type_string.encode('utf-8'))
+    h.update(b'\0')
+    h.update(encoding)
+    return f'__literal_{h.hexdigest()}'
+
+
 class Literal(IR):
+    # containers with at least this many elements are shipped out of band
+    _large_literal_length = 1024
+
     @typecheck_method(typ=hail_type,
                       value=anytype)
     def __init__(self, typ, value):
         super(Literal, self).__init__()
         self._typ: 'hail.HailType' = typ
         self.value = value
+        self._head_str = None
+        self._encoded = None
 
     def copy(self):
         return Literal(self._typ, self.value)
 
     def head_str(self):
-        return f'{self._typ._parsable_string()} {dump_json(self._typ._convert_to_json_na(self.value))}'
+        # serializing large values dominates rendering and hashing; do it once
+        if self._head_str is None:
+            self._head_str = f'{self._typ._parsable_string()} {dump_json(self._typ._convert_to_json_na(self.value))}'
+        return self._head_str
+
+    def _is_large(self):
+        """Whether this literal should be sent to the backend as an encoded
+        value referenced by :meth:`_encoded_id`, rather than rendered inline."""
+        return (isinstance(self.value, (list, set, frozenset, dict))
+                and len(self.value) >= Literal._large_literal_length
+                and _has_encoding(self._typ))
+
+    def _encoding(self):
+        """The value encoded by :meth:`.HailType._to_encoding`."""
+        if self._encoded is None:
+            self._encoded = self._typ._to_encoding(self.value)
+        return self._encoded
+
+    def _encoded_id(self):
+        """Content-addressed name of :meth:`_encoding`."""
+        return encoded_literal_id(self._typ._parsable_string(), self._encoding())
 
     def _eq(self, other):
         return other._typ == self._typ and \
@@ -377,7 +377,6 @@ class MatrixRepartition(MatrixIR):
 class MatrixUnionRows(MatrixIR):
     def __init__(self, *children):
         super().__init__(*children)
-        self.children = children
 
     def _compute_type(self):
         for c in self.children:
@@ -20,6 +20,11 @@ class MatrixReader(object):
     def __eq__(self, other):
         pass
 
+    def _input_paths(self):
+        """Paths of the files this reader reads, or ``None`` if they are not
+        known."""
+        return None
+
 
 class MatrixNativeReader(MatrixReader):
     @typecheck_method(path=str,
@@ -46,6 +51,9 @@ class MatrixNativeReader(MatrixReader):
         else:
             self.intervals = intervals
 
+    def _input_paths(self):
+        return [self.path]
+
     def render(self, r):
         reader = {'name': 'MatrixNativeReader',
                   'path': self.path}
@@ -75,6 +83,9 @@ class MatrixRangeReader(MatrixReader):
         self.n_cols = n_cols
         self.n_partitions = n_partitions
 
+    def _input_paths(self):
+        return []
+
     def render(self, r):
         reader = {'name': 'MatrixRangeReader',
                   'nRows': self.n_rows,
@@ -134,6 +145,9 @@ class MatrixVCFReader(MatrixReader):
         self.find_replace = find_replace
         self._partitions_json = _partitions_json
 
+    def _input_paths(self):
+        return self.path + ([self.header_file] if self.header_file else [])
+
     def render(self, r):
         reader = {'name': 'MatrixVCFReader',
                   'files': self.path,
@@ -188,6 +202,13 @@ class MatrixBGENReader(MatrixReader):
             assert (isinstance(included_variants, Table))
         self.included_variants = included_variants
 
+    def _input_paths(self):
+        if self.included_variants is not None:
+            return None
+        return (self.path
+                + ([self.sample_file] if self.sample_file else [])
+                + list(self.index_file_map.values()))
+
     def render(self, r):
         reader = {'name': 'MatrixBGENReader',
                   'files': self.path,
@@ -239,6 +260,9 @@ class TextMatrixReader(MatrixReader):
         self.gzip_as_bgzip = gzip_as_bgzip
         self.add_row_id = add_row_id
 
+    def _input_paths(self):
+        return self.paths
+
     def render(self, r):
         reader = {'name': 'TextMatrixReader',
                   'paths': self.paths,
@@ -285,6 +309,9 @@ class MatrixPLINKReader(MatrixReader):
         self.contig_recoding = contig_recoding
         self.skip_invalid_loci = skip_invalid_loci
 
+    def _input_paths(self):
+        return [self.bed, self.bim, self.fam]
+
     def render(self, r):
         reader = {'name': 'MatrixPLINKReader',
                   'bed': self.bed,
@@ -333,6 +360,9 @@ class MatrixGENReader(MatrixReader):
             'skipInvalidLoci': skip_invalid_loci
         }
 
+    def _input_paths(self):
+        return self.config['files'] + [self.config['sampleFile']]
+
     def render(self, r):
         return escape_str(json.dumps(self.config))
 
@@ -1,290 +1,284 @@
-import hail as hl
-from hail.expr.nat import NatVariable
 from .ir import register_function, register_session_function, register_seeded_function
 
 
 def register_reference_genome_functions(rg):
-    from hail.expr.types import dtype
+    register_session_function(f"isValidContig({rg})", ("str",), "bool")
+    register_session_function(f"isValidLocus({rg})", ("str","int32",), "bool")
 
-    register_session_function(f"isValidContig({rg})", (dtype("str"),), dtype("bool"))
-    register_session_function(f"isValidLocus({rg})", (dtype("str"),dtype("int32"),), dtype("bool"))
+    register_session_function(f"contigLength({rg})", ("str",), "int32")
 
-    register_session_function(f"contigLength({rg})", (dtype("str"),), dtype("int32"))
-
-    register_session_function(f"getReferenceSequenceFromValidLocus({rg})", (dtype("str"),dtype("int32"),dtype("int32"),dtype("int32"),), dtype("str"))
-    register_session_function(f"getReferenceSequence({rg})", (dtype("str"),dtype("int32"),dtype("int32"),dtype("int32"),), dtype("str"))
+    register_session_function(f"getReferenceSequenceFromValidLocus({rg})", ("str","int32","int32","int32",), "str")
+    register_session_function(f"getReferenceSequence({rg})", ("str","int32","int32","int32",), "str")
 
 
 def register_functions():
-    from hail.expr.types import dtype
-
-    register_function("flatten", (dtype("array<array<?T>>"),), dtype("array<?T>"))
-    register_function("difference", (dtype("set<?T>"),dtype("set<?T>"),), dtype("set<?T>"))
-    register_function("median", (dtype("set<?T:numeric>"),), dtype("?T"))
-    register_function("median", (dtype("array<?T:numeric>"),), dtype("?T"))
-    register_function("uniqueMinIndex", (dtype("array<?T>"),), dtype("int32"))
-    register_function("mean", (dtype("array<?T:numeric>"),), dtype("float64"))
-    register_function("toFloat32", (dtype("?T:numeric"),), dtype("float32"))
-    register_function("uniqueMaxIndex", (dtype("array<?T>"),), dtype("int32"))
-    register_function("toSet", (dtype("array<?T>"),), dtype("set<?T>"))
+    register_function("flatten", ("array<array<?T>>",), "array<?T>")
+    register_function("difference", ("set<?T>","set<?T>",), "set<?T>")
+    register_function("median", ("set<?T:numeric>",), "?T")
+    register_function("median", ("array<?T:numeric>",), "?T")
+    register_function("uniqueMinIndex", ("array<?T>",), "int32")
+    register_function("mean", ("array<?T:numeric>",), "float64")
+    register_function("toFloat32", ("?T:numeric",), "float32")
+    register_function("uniqueMaxIndex", ("array<?T>",), "int32")
+    register_function("toSet", ("array<?T>",), "set<?T>")
 
     def array_floating_point_divide(arg_type, ret_type):
-        register_function("/", (arg_type, hl.tarray(arg_type),), hl.tarray(ret_type))
-        register_function("/", (hl.tarray(arg_type),arg_type), hl.tarray(ret_type))
-        register_function("/", (hl.tarray(arg_type),hl.tarray(arg_type)), hl.tarray(ret_type))
-    array_floating_point_divide(hl.tint32, hl.tfloat32)
-    array_floating_point_divide(hl.tint64, hl.tfloat32)
-    array_floating_point_divide(hl.tfloat32, hl.tfloat32)
-    array_floating_point_divide(hl.tfloat64, hl.tfloat64)
+        register_function("/", (arg_type, f"array<{arg_type}>",), f"array<{ret_type}>")
+        register_function("/", (f"array<{arg_type}>",arg_type), f"array<{ret_type}>")
+        register_function("/", (f"array<{arg_type}>",f"array<{arg_type}>"), f"array<{ret_type}>")
+    array_floating_point_divide("int32", "float32")
+    array_floating_point_divide("int64", "float32")
+    array_floating_point_divide("float32", "float32")
+    array_floating_point_divide("float64", "float64")
 
     def ndarray_floating_point_divide(arg_type, ret_type):
-        register_function("/", (arg_type, hl.tndarray(arg_type, NatVariable()),), hl.tndarray(ret_type, NatVariable()))
-        register_function("/", (hl.tndarray(arg_type, NatVariable()), arg_type), hl.tndarray(ret_type, NatVariable()))
-        register_function("/", (hl.tndarray(arg_type, NatVariable()),
-                                hl.tndarray(arg_type, NatVariable())), hl.tndarray(ret_type, NatVariable()))
-    ndarray_floating_point_divide(hl.tint32, hl.tfloat32)
-    ndarray_floating_point_divide(hl.tint64, hl.tfloat32)
-    ndarray_floating_point_divide(hl.tfloat32, hl.tfloat32)
-    ndarray_floating_point_divide(hl.tfloat64, hl.tfloat64)
+        register_function("/", (arg_type, f"ndarray<{arg_type}, ?nat>",), f"ndarray<{ret_type}, ?nat>")
+        register_function("/", (f"ndarray<{arg_type}, ?nat>", arg_type), f"ndarray<{ret_type}, ?nat>")
+        register_function("/", (f"ndarray<{arg_type}, ?nat>",
+                                f"ndarray<{arg_type}, ?nat>"), f"ndarray<{ret_type}, ?nat>")
+    ndarray_floating_point_divide("int32", "float32")
+    ndarray_floating_point_divide("int64", "float32")
+    ndarray_floating_point_divide("float32", "float32")
+    ndarray_floating_point_divide("float64", "float64")
 
-    register_function("values", (dtype("dict<?key, ?value>"),), dtype("array<?value>"))
-    register_function("[*:]", (dtype("array<?T>"),dtype("int32"),), dtype("array<?T>"))
-    register_function("[*:]", (dtype("str"),dtype("int32"),), dtype("str"))
-    register_function("get", (dtype("dict<?key, ?value>"),dtype("?key"),), dtype("?value"))
-    register_function("get", (dtype("dict<?key, ?value>"),dtype("?key"),dtype("?value"),), dtype("?value"))
-    register_function("max", (dtype("array<?T:numeric>"),), dtype("?T"))
-    register_function("nanmax", (dtype("array<?T:numeric>"),), dtype("?T"))
-    register_function("max", (dtype("?T"),dtype("?T"),), dtype("?T"))
-    register_function("nanmax", (dtype("?T"),dtype("?T"),), dtype("?T"))
-    register_function("max_ignore_missing", (dtype("?T"),dtype("?T"),), dtype("?T"))
-    register_function("nanmax_ignore_missing", (dtype("?T"),dtype("?T"),), dtype("?T"))
-    register_function("product", (dtype("array<?T:numeric>"),), dtype("?T"))
-    register_function("toInt32", (dtype("?T:numeric"),), dtype("int32"))
-    register_function("extend", (dtype("array<?T>"),dtype("array<?T>"),), dtype("array<?T>"))
-    register_function("argmin", (dtype("array<?T>"),), dtype("int32"))
-    register_function("toFloat64", (dtype("?T:numeric"),), dtype("float64"))
-    register_function("sort", (dtype("array<?T>"),), dtype("array<?T>"))
-    register_function("sort", (dtype("array<?T>"),dtype("bool"),), dtype("array<?T>"))
-    register_function("isSubset", (dtype("set<?T>"),dtype("set<?T>"),), dtype("bool"))
-    register_function("[*:*]", (dtype("str"),dtype("int32"),dtype("int32"),), dtype("str"))
-    register_function("[*:*]", (dtype("array<?T>"),dtype("int32"),dtype("int32"),), dtype("array<?T>"))
-    register_function("+", (dtype("array<?T:numeric>"),dtype("array<?T>"),), dtype("array<?T>"))
-    register_function("+", (dtype("array<?T:numeric>"),dtype("?T"),), dtype("array<?T>"))
-    register_function("+", (dtype("?T:numeric"),dtype("array<?T>"),), dtype("array<?T>"))
-    register_function("+", (dtype("ndarray<?T:numeric, ?nat>"),dtype("ndarray<?T, ?nat>"),), dtype("ndarray<?T, ?nat>"))
-    register_function("+", (dtype("ndarray<?T:numeric, ?nat>"), dtype("?T"),), dtype("ndarray<?T, ?nat>"))
-    register_function("+", (dtype("?T:numeric"),dtype("ndarray<?T, ?nat>"),), dtype("ndarray<?T, ?nat>"))
-    register_function("**", (dtype("array<?T:numeric>"),dtype("array<?T>"),), dtype("array<float64>"))
-    register_function("**", (dtype("array<?T:numeric>"),dtype("?T"),), dtype("array<float64>"))
-    register_function("**", (dtype("?T:numeric"),dtype("array<?T>"),), dtype("array<float64>"))
-    register_function("**", (dtype("ndarray<?T:numeric, ?nat>"),dtype("ndarray<?T, ?nat>"),), dtype("ndarray<?T, ?nat>"))
-    register_function("**", (dtype("ndarray<?T:numeric, ?nat>"),dtype("?T"),), dtype("ndarray<?T, ?nat>"))
-    register_function("**", (dtype("?T:numeric"),dtype("ndarray<?T, ?nat>"),), dtype("ndarray<?T, ?nat>"))
-    register_function("append", (dtype("array<?T>"),dtype("?T"),), dtype("array<?T>"))
-    register_function("[:*]", (dtype("str"),dtype("int32"),), dtype("str"))
-    register_function("[:*]", (dtype("array<?T>"),dtype("int32"),), dtype("array<?T>"))
-    register_function("remove", (dtype("set<?T>"),dtype("?T"),), dtype("set<?T>"))
-    register_function("[]", (dtype("str"),dtype("int32"),), dtype("str"))
-    register_function("indexArray", (dtype("array<?T>"),dtype("int32"),), dtype("?T"))
-    register_function("[]", (dtype("dict<?key, ?value>"),dtype("?key"),), dtype("?value"))
-    register_function("dictToArray", (dtype("dict<?key, ?value>"),), dtype("array<tuple(?key, ?value)>"))
-    register_function("%", (dtype("array<?T:numeric>"),dtype("array<?T>"),), dtype("array<?T>"))
-    register_function("%", (dtype("array<?T:numeric>"),dtype("?T"),), dtype("array<?T>"))
-    register_function("%", (dtype("?T:numeric"),dtype("array<?T>"),), dtype("array<?T>"))
-    register_function("%", (dtype("ndarray<?T:numeric, ?nat>"),dtype("ndarray<?T, ?nat>"),), dtype("ndarray<?T, ?nat>"))
-    register_function("%", (dtype("ndarray<?T:numeric, ?nat>"),dtype("?T"),), dtype("ndarray<?T, ?nat>"))
-    register_function("%", (dtype("?T:numeric"),dtype("ndarray<?T, ?nat>"),), dtype("ndarray<?T, ?nat>"))
-    register_function("dict", (dtype("array<tuple(?key, ?value)>"),), dtype("dict<?key, ?value>"))
-    register_function("dict", (dtype("set<tuple(?key, ?value)>"),), dtype("dict<?key, ?value>"))
-    register_function("keys", (dtype("dict<?key, ?value>"),), dtype("array<?key>"))
-    register_function("min", (dtype("array<?T:numeric>"),), dtype("?T"))
-    register_function("nanmin", (dtype("array<?T:numeric>"),), dtype("?T"))
-    register_function("min", (dtype("?T"),dtype("?T"),), dtype("?T"))
-    register_function("nanmin", (dtype("?T"),dtype("?T"),), dtype("?T"))
-    register_function("min_ignore_missing", (dtype("?T"),dtype("?T"),), dtype("?T"))
-    register_function("nanmin_ignore_missing", (dtype("?T"),dtype("?T"),), dtype("?T"))
-    register_function("sum", (dtype("array<?T:numeric>"),), dtype("?T"))
-    register_function("toInt64", (dtype("?T:numeric"),), dtype("int64"))
-    register_function("contains", (dtype("dict<?key, ?value>"),dtype("?key"),), dtype("bool"))
-    register_function("contains", (dtype("array<?T>"),dtype("?T"),), dtype("bool"))
-    register_function("contains", (dtype("set<?T>"),dtype("?T"),), dtype("bool"))
-    register_function("-", (dtype("array<?T:numeric>"),dtype("?T"),), dtype("array<?T>"))
-    register_function("-", (dtype("array<?T:numeric>"),dtype("array<?T>"),), dtype("array<?T>"))
-    register_function("-", (dtype("?T:numeric"),dtype("array<?T>"),), dtype("array<?T>"))
-    register_function("-", (dtype("ndarray<?T:numeric, ?nat>"),dtype("ndarray<?T, ?nat>"),), dtype("ndarray<?T, ?nat>"))
-    register_function("-", (dtype("ndarray<?T:numeric, ?nat>"),dtype("?T"),), dtype("ndarray<?T, ?nat>"))
-    register_function("-", (dtype("?T:numeric"),dtype("ndarray<?T, ?nat>"),), dtype("ndarray<?T, ?nat>"))
-    register_function("addone", (dtype("int32"),), dtype("int32"))
-    register_function("isEmpty", (dtype("dict<?key, ?value>"),), dtype("bool"))
-    register_function("isEmpty", (dtype("array<?T>"),), dtype("bool"))
-    register_function("isEmpty", (dtype("set<?T>"),), dtype("bool"))
-    register_function("[:]", (dtype("array<?T>"),), dtype("array<?T>"))
-    register_function("[:]", (dtype("str"),), dtype("str"))
-    register_function("union", (dtype("set<?T>"),dtype("set<?T>"),), dtype("set<?T>"))
-    register_function("*", (dtype("array<?T:numeric>"),dtype("array<?T>"),), dtype("array<?T>"))
-    register_function("*", (dtype("array<?T:numeric>"),dtype("?T"),), dtype("array<?T>"))
-    register_function("*", (dtype("?T:numeric"),dtype("array<?T>"),), dtype("array<?T>"))
-    register_function("*", (dtype("ndarray<?T:numeric, ?nat>"),dtype("ndarray<?T, ?nat>"),), dtype("ndarray<?T, ?nat>"))
-    register_function("*", (dtype("ndarray<?T:numeric, ?nat>"),dtype("?T"),), dtype("ndarray<?T, ?nat>"))
-    register_function("*", (dtype("?T:numeric"),dtype("ndarray<?T, ?nat>"),), dtype("ndarray<?T, ?nat>"))
-    register_function("intersection", (dtype("set<?T>"),dtype("set<?T>"),), dtype("set<?T>"))
-    register_function("add", (dtype("set<?T>"),dtype("?T"),), dtype("set<?T>"))
-    register_function("argmax", (dtype("array<?T>"),), dtype("int32"))
-    register_function("//", (dtype("array<?T:numeric>"),dtype("array<?T>"),), dtype("array<?T>"))
-    register_function("//", (dtype("array<?T:numeric>"),dtype("?T"),), dtype("array<?T>"))
-    register_function("//", (dtype("?T:numeric"),dtype("array<?T>"),), dtype("array<?T>"))
-    register_function("//", (dtype("ndarray<?T:numeric, ?nat>"),dtype("ndarray<?T, ?nat>"),), dtype("ndarray<?T, ?nat>"))
-    register_function("//", (dtype("ndarray<?T:numeric, ?nat>"),dtype("?T"),), dtype("ndarray<?T, ?nat>"))
-    register_function("//", (dtype("?T:numeric"),dtype("ndarray<?T, ?nat>"),), dtype("ndarray<?T, ?nat>"))
-    register_function("keySet", (dtype("dict<?key, ?value>"),), dtype("set<?key>"))
-    register_function("qnorm", (dtype("float64"),), dtype("float64"))
-    register_function("oneHotAlleles", (dtype("call"),dtype("int32"),), dtype("array<int32>"))
-    register_function("dpois", (dtype("float64"),dtype("float64"),dtype("bool"),), dtype("float64"))
-    register_function("dpois", (dtype("float64"),dtype("float64"),), dtype("float64"))
-    register_function("ploidy", (dtype("call"),), dtype("int32"))
-    register_function("||", (dtype("bool"),dtype("bool"),), dtype("bool"))
-    register_function("ppois", (dtype("float64"),dtype("float64"),dtype("bool"),dtype("bool"),), dtype("float64"))
-    register_function("ppois", (dtype("float64"),dtype("float64"),), dtype("float64"))
-    register_function("log10", (dtype("float64"),), dtype("float64"))
-    register_function("isHet", (dtype("call"),), dtype("bool"))
-    register_function("isAutosomalOrPseudoAutosomal", (dtype("?T:locus"),), dtype("bool"))
-    register_function("testCodeUnification", (dtype("?x:numeric"),dtype("?x:int32"),), dtype("?x"))
-    register_seeded_function("rand_pois", (dtype("float64"),), dtype("float64"))
-    register_seeded_function("rand_pois", (dtype("int32"),dtype("float64"),), dtype("array<float64>"))
-    register_function("toFloat32", (dtype("str"),), dtype("float32"))
-    register_function("toFloat32", (dtype("bool"),), dtype("float32"))
-    register_function("isAutosomal", (dtype("?T:locus"),), dtype("bool"))
-    register_function("isPhased", (dtype("call"),), dtype("bool"))
-    register_function("isHomVar", (dtype("call"),), dtype("bool"))
-    register_function("corr", (dtype("array<float64>"),dtype("array<float64>"),), dtype("float64"))
-    register_function("log", (dtype("float64"),dtype("float64"),), dtype("float64"))
-    register_function("log", (dtype("float64"),), dtype("float64"))
-    register_function("foobar2", (), dtype("int32"))
-    register_function("approxEqual", (dtype("float64"),dtype("float64"),dtype("float64"),dtype("bool"),dtype("bool"),), dtype("bool"))
-    register_function("plDosage", (dtype("array<?N:int32>"),), dtype("float64"))
-    register_function("includesEnd", (dtype("interval<?T>"),), dtype("bool"))
-    register_function("position", (dtype("?T:locus"),), dtype("int32"))
-    register_seeded_function("rand_unif", (dtype("float64"),dtype("float64"),), dtype("float64"))
-    register_function("str", (dtype("?T"),), dtype("str"))
-    register_function("valuesSimilar", (dtype("?T"),dtype("?T"),dtype('float64'),dtype('bool'),), dtype("bool"))
-    register_function("replace", (dtype("str"),dtype("str"),dtype("str"),), dtype("str"))
-    register_function("exp", (dtype("float64"),), dtype("float64"))
-    register_function("&&", (dtype("bool"),dtype("bool"),), dtype("bool"))
-    register_function("compare", (dtype("int32"),dtype("int32"),), dtype("int32"))
-    register_function("triangle", (dtype("int32"),), dtype("int32"))
-    register_function("Interval", (dtype("?T"),dtype("?T"),dtype("bool"),dtype("bool"),), dtype("interval<?T>"))
-    register_function("contig", (dtype("?T:locus"),), dtype("str"))
-    register_function("Call", (dtype("bool"),), dtype("call"))
-    register_function("Call", (dtype("str"),), dtype("call"))
-    register_function("Call", (dtype("int32"),dtype("bool"),), dtype("call"))
-    register_function("Call", (dtype("int32"),dtype("int32"),dtype("bool"),), dtype("call"))
-    register_function("Call", (dtype("array<int32>"),dtype("bool"),), dtype("call"))
-    register_function("qchisqtail", (dtype("float64"),dtype("float64"),), dtype("float64"))
-    register_function("binomTest", (dtype("int32"),dtype("int32"),dtype("float64"),dtype("int32"),), dtype("float64"))
-    register_function("qpois", (dtype("float64"),dtype("float64"),), dtype("int32"))
-    register_function("qpois", (dtype("float64"),dtype("float64"),dtype("bool"),dtype("bool"),), dtype("int32"))
-    register_function("is_finite", (dtype("float32"),), dtype("bool"))
-    register_function("is_finite", (dtype("float64"),), dtype("bool"))
-    register_function("inYPar", (dtype("?T:locus"),), dtype("bool"))
-    register_function("contingency_table_test", (dtype("int32"),dtype("int32"),dtype("int32"),dtype("int32"),dtype("int32"),), dtype("struct{p_value: float64, odds_ratio: float64}"))
-    register_function("toInt32", (dtype("bool"),), dtype("int32"))
-    register_function("toInt32", (dtype("str"),), dtype("int32"))
-    register_function("foobar1", (), dtype("int32"))
-    register_function("toFloat64", (dtype("str"),), dtype("float64"))
-    register_function("toFloat64", (dtype("bool"),), dtype("float64"))
-    register_function("dbeta", (dtype("float64"),dtype("float64"),dtype("float64"),), dtype("float64"))
-    register_function("Locus", (dtype("str"),), dtype("?T:locus"))
-    register_function("Locus", (dtype("str"), dtype("int32"),), dtype("?T:locus"))
-    register_function("LocusAlleles", (dtype("str"),), dtype("struct{locus: ?T, alleles: array<str>}"))
-    register_function("LocusInterval", (dtype("str"),dtype("bool"),), dtype("interval<?T:locus>"))
-    register_function("LocusInterval", (dtype("str"),dtype("int32"),dtype("int32"),dtype("bool"),dtype("bool"),dtype("bool"),), dtype("interval<?T:locus>"))
-    register_function("globalPosToLocus", (dtype("int64"),), dtype("?T:locus"))
-    register_function("locusToGlobalPos", (dtype("?T:locus"),), dtype("int64"))
-    register_function("liftoverLocus", (dtype(f"?T:locus"), dtype('float64'),), dtype(f"struct{{result:?U:locus,is_negative_strand:bool}}"))
-    register_function("liftoverLocusInterval", (dtype(f"interval<?T:locus>"), dtype('float64'),), dtype(f"struct{{result:interval<?U:locus>,is_negative_strand:bool}}"))
-    register_function("min_rep", (dtype("?T:locus"),dtype("array<str>"),), dtype("struct{locus: ?T, alleles: array<str>}"))
-    register_function("locus_windows_per_contig", (dtype("array<array<float64>>"),dtype("float64"),), dtype("tuple(array<int32>, array<int32>)"))
-    register_function("toBoolean", (dtype("str"),), dtype("bool"))
-    register_seeded_function("rand_bool", (dtype("float64"),), dtype("bool"))
-    register_function("pchisqtail", (dtype("float64"),dtype("float64"),), dtype("float64"))
-    register_seeded_function("rand_cat", (dtype("array<float64>"),), dtype("int32"))
-    register_function("inYNonPar", (dtype("?T:locus"),), dtype("bool"))
-    register_function("+", (dtype("str"),dtype("str"),), dtype("str"))
-    register_function("**", (dtype("float32"),dtype("float32"),), dtype("float64"))
-    register_function("**", (dtype("int32"),dtype("int32"),), dtype("float64"))
-    register_function("**", (dtype("int64"),dtype("int64"),), dtype("float64"))
-    register_function("**", (dtype("float64"),dtype("float64"),), dtype("float64"))
-    register_function("length", (dtype("str"),), dtype("int32"))
-    register_function("slice", (dtype("str"),dtype("int32"),dtype("int32"),), dtype("str"))
-    register_function("split", (dtype("str"),dtype("str"),dtype("int32"),), dtype("array<str>"))
-    register_function("split", (dtype("str"),dtype("str"),), dtype("array<str>"))
-    register_seeded_function("rand_gamma", (dtype("float64"),dtype("float64"),), dtype("float64"))
-    register_function("UnphasedDiploidGtIndexCall", (dtype("int32"),), dtype("call"))
-    register_function("[]", (dtype("call"),dtype("int32"),), dtype("int32"))
-    register_function("sign", (dtype("int64"),), dtype("int64"))
-    register_function("sign", (dtype("float64"),), dtype("float64"))
-    register_function("sign", (dtype("float32"),), dtype("float32"))
-    register_function("sign", (dtype("int32"),), dtype("int32"))
-    register_function("unphasedDiploidGtIndex", (dtype("call"),), dtype("int32"))
-    register_function("gamma", (dtype("float64"),), dtype("float64"))
-    register_function("%", (dtype("float64"),dtype("float64"),), dtype("float64"))
-    register_function("%", (dtype("int64"),dtype("int64"),), dtype("int64"))
-    register_function("%", (dtype("float32"),dtype("float32"),), dtype("float32"))
-    register_function("%", (dtype("int32"),dtype("int32"),), dtype("int32"))
-    register_function("fisher_exact_test", (dtype("int32"),dtype("int32"),dtype("int32"),dtype("int32"),), dtype("struct{p_value: float64, odds_ratio: float64, ci_95_lower: float64, ci_95_upper: float64}"))
-    register_function("floor", (dtype("float64"),), dtype("float64"))
-    register_function("floor", (dtype("float32"),), dtype("float32"))
-    register_function("isNonRef", (dtype("call"),), dtype("bool"))
-    register_function("includesStart", (dtype("interval<?T>"),), dtype("bool"))
-    register_function("isHetNonRef", (dtype("call"),), dtype("bool"))
-    register_function("hardy_weinberg_test", (dtype("int32"),dtype("int32"),dtype("int32"),), dtype("struct{het_freq_hwe: float64, p_value: float64}"))
-    register_function("haplotype_freq_em", (dtype("array<int32>"),), dtype("array<float64>"))
-    register_function("nNonRefAlleles", (dtype("call"),), dtype("int32"))
-    register_function("abs", (dtype("float64"),), dtype("float64"))
-    register_function("abs", (dtype("float32"),), dtype("float32"))
-    register_function("abs", (dtype("int64"),), dtype("int64"))
-    register_function("abs", (dtype("int32"),), dtype("int32"))
-    register_function("endswith", (dtype("str"),dtype("str"),), dtype("bool"))
-    register_function("sqrt", (dtype("float64"),), dtype("float64"))
-    register_function("isnan", (dtype("float32"),), dtype("bool"))
-    register_function("isnan", (dtype("float64"),), dtype("bool"))
-    register_function("lower", (dtype("str"),), dtype("str"))
-    register_seeded_function("rand_beta", (dtype("float64"),dtype("float64"),), dtype("float64"))
-    register_seeded_function("rand_beta", (dtype("float64"),dtype("float64"),dtype("float64"),dtype("float64"),), dtype("float64"))
-    register_function("toInt64", (dtype("bool"),), dtype("int64"))
-    register_function("toInt64", (dtype("str"),), dtype("int64"))
-    register_function("testCodeUnification2", (dtype("?x"),), dtype("?x"))
-    register_function("contains", (dtype("str"),dtype("str"),), dtype("bool"))
-    register_function("contains", (dtype("interval<?T>"),dtype("?T"),), dtype("bool"))
-    register_function("entropy", (dtype("str"),), dtype("float64"))
-    register_function("filtering_allele_frequency", (dtype("int32"),dtype("int32"),dtype("float64"),), dtype("float64"))
-    register_function("gqFromPL", (dtype("array<?N:int32>"),), dtype("int32"))
-    register_function("startswith", (dtype("str"),dtype("str"),), dtype("bool"))
-    register_function("ceil", (dtype("float32"),), dtype("float32"))
-    register_function("ceil", (dtype("float64"),), dtype("float64"))
-    register_function("json", (dtype("?T"),), dtype("str"))
-    register_function("strip", (dtype("str"),), dtype("str"))
-    register_function("firstMatchIn", (dtype("str"),dtype("str"),), dtype("array<str>"))
-    register_function("isEmpty", (dtype("interval<?T>"),), dtype("bool"))
-    register_function("~", (dtype("str"),dtype("str"),), dtype("bool"))
-    register_function("mkString", (dtype("set<str>"),dtype("str"),), dtype("str"))
-    register_function("mkString", (dtype("array<str>"),dtype("str"),), dtype("str"))
-    register_function("dosage", (dtype("array<?N:float64>"),), dtype("float64"))
-    register_function("upper", (dtype("str"),), dtype("str"))
-    register_function("overlaps", (dtype("interval<?T>"),dtype("interval<?T>"),), dtype("bool"))
-    register_function("downcode", (dtype("call"),dtype("int32"),), dtype("call"))
-    register_function("inXPar", (dtype("?T:locus"),), dtype("bool"))
-    register_function("format", (dtype("str"),dtype("?T:tuple"),), dtype("str"))
-    register_function("pnorm", (dtype("float64"),), dtype("float64"))
-    register_function("is_infinite", (dtype("float32"),), dtype("bool"))
-    register_function("is_infinite", (dtype("float64"),), dtype("bool"))
-    register_function("isHetRef", (dtype("call"),), dtype("bool"))
-    register_function("isMitochondrial", (dtype("?T:locus"),), dtype("bool"))
-    register_function("hamming", (dtype("str"),dtype("str"),), dtype("int32"))
-    register_function("end", (dtype("interval<?T>"),), dtype("?T"))
-    register_function("start", (dtype("interval<?T>"),), dtype("?T"))
-    register_function("inXNonPar", (dtype("?T:locus"),), dtype("bool"))
-    register_function("escapeString", (dtype("str"),), dtype("str"))
-    register_function("isHomRef", (dtype("call"),), dtype("bool"))
-    register_seeded_function("rand_norm", (dtype("float64"),dtype("float64"),), dtype("float64"))
-    register_function("chi_squared_test", (dtype("int32"),dtype("int32"),dtype("int32"),dtype("int32"),), dtype("struct{p_value: float64, odds_ratio: float64}"))
+    register_function("values", ("dict<?key, ?value>",), "array<?value>")
+    register_function("[*:]", ("array<?T>","int32",), "array<?T>")
+    register_function("[*:]", ("str","int32",), "str")
+    register_function("get", ("dict<?key, ?value>","?key",), "?value")
+    register_function("get", ("dict<?key, ?value>","?key","?value",), "?value")
+    register_function("max", ("array<?T:numeric>",), "?T")
+    register_function("nanmax", ("array<?T:numeric>",), "?T")
+    register_function("max", ("?T","?T",), "?T")
+    register_function("nanmax", ("?T","?T",), "?T")
+    register_function("max_ignore_missing", ("?T","?T",), "?T")
+    register_function("nanmax_ignore_missing", ("?T","?T",), "?T")
+    register_function("product", ("array<?T:numeric>",), "?T")
+    register_function("toInt32", ("?T:numeric",), "int32")
+    register_function("extend", ("array<?T>","array<?T>",), "array<?T>")
+    register_function("argmin", ("array<?T>",), "int32")
+    register_function("toFloat64", ("?T:numeric",), "float64")
+    register_function("sort", ("array<?T>",), "array<?T>")
+    register_function("sort", ("array<?T>","bool",), "array<?T>")
+    register_function("isSubset", ("set<?T>","set<?T>",), "bool")
+    register_function("[*:*]", ("str","int32","int32",), "str")
+    register_function("[*:*]", ("array<?T>","int32","int32",), "array<?T>")
+    register_function("+", ("array<?T:numeric>","array<?T>",), "array<?T>")
+    register_function("+", ("array<?T:numeric>","?T",), "array<?T>")
+    register_function("+", ("?T:numeric","array<?T>",), "array<?T>")
+    register_function("+", ("ndarray<?T:numeric, ?nat>","ndarray<?T, ?nat>",), "ndarray<?T, ?nat>")
+    register_function("+", ("ndarray<?T:numeric, ?nat>", "?T",), "ndarray<?T, ?nat>")
+    register_function("+", ("?T:numeric","ndarray<?T, ?nat>",), "ndarray<?T, ?nat>")
+    register_function("**", ("array<?T:numeric>","array<?T>",), "array<float64>")
+    register_function("**", ("array<?T:numeric>","?T",), "array<float64>")
+    register_function("**", ("?T:numeric","array<?T>",), "array<float64>")
+    register_function("**", ("ndarray<?T:numeric, ?nat>","ndarray<?T, ?nat>",), "ndarray<?T, ?nat>")
+    register_function("**", ("ndarray<?T:numeric, ?nat>","?T",), "ndarray<?T, ?nat>")
+    register_function("**", ("?T:numeric","ndarray<?T, ?nat>",), "ndarray<?T, ?nat>")
+    register_function("append", ("array<?T>","?T",), "array<?T>")
+    register_function("[:*]", ("str","int32",), "str")
+    register_function("[:*]", ("array<?T>","int32",), "array<?T>")
+    register_function("remove", ("set<?T>","?T",), "set<?T>")
+    register_function("[]", ("str","int32",), "str")
+    register_function("indexArray", ("array<?T>","int32",), "?T")
+    register_function("[]", ("dict<?key, ?value>","?key",), "?value")
+    register_function("dictToArray", ("dict<?key, ?value>",), "array<tuple(?key, ?value)>")
+    register_function("%", ("array<?T:numeric>","array<?T>",), "array<?T>")
+    register_function("%", ("array<?T:numeric>","?T",), "array<?T>")
+    register_function("%", ("?T:numeric","array<?T>",), "array<?T>")
+    register_function("%", ("ndarray<?T:numeric, ?nat>","ndarray<?T, ?nat>",), "ndarray<?T, ?nat>")
+    register_function("%", ("ndarray<?T:numeric, ?nat>","?T",), "ndarray<?T, ?nat>")
+    register_function("%", ("?T:numeric","ndarray<?T, ?nat>",), "ndarray<?T, ?nat>")
+    register_function("dict", ("array<tuple(?key, ?value)>",), "dict<?key, ?value>")
+    register_function("dict", ("set<tuple(?key, ?value)>",), "dict<?key, ?value>")
+    register_function("keys", ("dict<?key, ?value>",), "array<?key>")
+    register_function("min", ("array<?T:numeric>",), "?T")
+    register_function("nanmin", ("array<?T:numeric>",), "?T")
+    register_function("min", ("?T","?T",), "?T")
+    register_function("nanmin", ("?T","?T",), "?T")
+    register_function("min_ignore_missing", ("?T","?T",), "?T")
+    register_function("nanmin_ignore_missing", ("?T","?T",), "?T")
+    register_function("sum", ("array<?T:numeric>",), "?T")
+    register_function("toInt64", ("?T:numeric",), "int64")
+    register_function("contains", ("dict<?key, ?value>","?key",), "bool")
+    register_function("contains", ("array<?T>","?T",), "bool")
+    register_function("contains", ("set<?T>","?T",), "bool")
+    register_function("-", ("array<?T:numeric>","?T",), "array<?T>")
+    register_function("-", ("array<?T:numeric>","array<?T>",), "array<?T>")
+    register_function("-", ("?T:numeric","array<?T>",), "array<?T>")
+    register_function("-", ("ndarray<?T:numeric, ?nat>","ndarray<?T, ?nat>",), "ndarray<?T, ?nat>")
+    register_function("-", ("ndarray<?T:numeric, ?nat>","?T",), "ndarray<?T, ?nat>")
+    register_function("-", ("?T:numeric","ndarray<?T, ?nat>",), "ndarray<?T, ?nat>")
+    register_function("addone", ("int32",), "int32")
+    register_function("isEmpty", ("dict<?key, ?value>",), "bool")
+    register_function("isEmpty", ("array<?T>",), "bool")
+    register_function("isEmpty", ("set<?T>",), "bool")
+    register_function("[:]", ("array<?T>",), "array<?T>")
+    register_function("[:]", ("str",), "str")
+    register_function("union", ("set<?T>","set<?T>",), "set<?T>")
+    register_function("*", ("array<?T:numeric>","array<?T>",), "array<?T>")
+    register_function("*", ("array<?T:numeric>","?T",), "array<?T>")
+    register_function("*", ("?T:numeric","array<?T>",), "array<?T>")
+    register_function("*", ("ndarray<?T:numeric, ?nat>","ndarray<?T, ?nat>",), "ndarray<?T, ?nat>")
+    register_function("*", ("ndarray<?T:numeric, ?nat>","?T",), "ndarray<?T, ?nat>")
+    register_function("*", ("?T:numeric","ndarray<?T, ?nat>",), "ndarray<?T, ?nat>")
+    register_function("intersection", ("set<?T>","set<?T>",), "set<?T>")
+    register_function("add", ("set<?T>","?T",), "set<?T>")
+    register_function("argmax", ("array<?T>",), "int32")
+    register_function("//", ("array<?T:numeric>","array<?T>",), "array<?T>")
+    register_function("//", ("array<?T:numeric>","?T",), "array<?T>")
+    register_function("//", ("?T:numeric","array<?T>",), "array<?T>")
+    register_function("//", ("ndarray<?T:numeric, ?nat>","ndarray<?T, ?nat>",), "ndarray<?T, ?nat>")
+    register_function("//", ("ndarray<?T:numeric, ?nat>","?T",), "ndarray<?T, ?nat>")
+    register_function("//", ("?T:numeric","ndarray<?T, ?nat>",), "ndarray<?T, ?nat>")
+    register_function("keySet", ("dict<?key, ?value>",), "set<?key>")
+    register_function("qnorm", ("float64",), "float64")
+    register_function("oneHotAlleles", ("call","int32",), "array<int32>")
+    register_function("dpois", ("float64","float64","bool",), "float64")
+    register_function("dpois", ("float64","float64",), "float64")
+    register_function("ploidy", ("call",), "int32")
+    register_function("||", ("bool","bool",), "bool")
+    register_function("ppois", ("float64","float64","bool","bool",), "float64")
+    register_function("ppois", ("float64","float64",), "float64")
+    register_function("log10", ("float64",), "float64")
+    register_function("isHet", ("call",), "bool")
+    register_function("isAutosomalOrPseudoAutosomal", ("?T:locus",), "bool")
+    register_function("testCodeUnification", ("?x:numeric","?x:int32",), "?x")
+    register_seeded_function("rand_pois", ("float64",), "float64")
+    register_seeded_function("rand_pois", ("int32","float64",), "array<float64>")
+    register_function("toFloat32", ("str",), "float32")
+    register_function("toFloat32", ("bool",), "float32")
+    register_function("isAutosomal", ("?T:locus",), "bool")
+    register_function("isPhased", ("call",), "bool")
+    register_function("isHomVar", ("call",), "bool")
+    register_function("corr", ("array<float64>","array<float64>",), "float64")
+    register_function("log", ("float64","float64",), "float64")
+    register_function("log", ("float64",), "float64")
+    register_function("foobar2", (), "int32")
+    register_function("approxEqual", ("float64","float64","float64","bool","bool",), "bool")
+    register_function("plDosage", ("array<?N:int32>",), "float64")
+    register_function("includesEnd", ("interval<?T>",), "bool")
+    register_function("position", ("?T:locus",), "int32")
+    register_seeded_function("rand_unif", ("float64","float64",), "float64")
+    register_function("str", ("?T",), "str")
+    register_function("valuesSimilar", ("?T","?T",'float64','bool',), "bool")
+    register_function("replace", ("str","str","str",), "str")
+    register_function("exp", ("float64",), "float64")
+    register_function("&&", ("bool","bool",), "bool")
+    register_function("compare", ("int32","int32",), "int32")
+    register_function("triangle", ("int32",), "int32")
+    register_function("Interval", ("?T","?T","bool","bool",), "interval<?T>")
+    register_function("contig", ("?T:locus",), "str")
+    register_function("Call", ("bool",), "call")
+    register_function("Call", ("str",), "call")
+    register_function("Call", ("int32","bool",), "call")
+    register_function("Call", ("int32","int32","bool",), "call")
+    register_function("Call", ("array<int32>","bool",), "call")
+    register_function("qchisqtail", ("float64","float64",), "float64")
+    register_function("binomTest", ("int32","int32","float64","int32",), "float64")
+    register_function("qpois", ("float64","float64",), "int32")
+    register_function("qpois", ("float64","float64","bool","bool",), "int32")
+    register_function("is_finite", ("float32",), "bool")
+    register_function("is_finite", ("float64",), "bool")
+    register_function("inYPar", ("?T:locus",), "bool")
+    register_function("contingency_table_test", ("int32","int32","int32","int32","int32",), "struct{p_value: float64, odds_ratio: float64}")
+    register_function("toInt32", ("bool",), "int32")
+    register_function("toInt32", ("str",), "int32")
+    register_function("foobar1", (), "int32")
+    register_function("toFloat64", ("str",), "float64")
+    register_function("toFloat64", ("bool",), "float64")
+    register_function("dbeta", ("float64","float64","float64",), "float64")
+    register_function("Locus", ("str",), "?T:locus")
+    register_function("Locus", ("str", "int32",), "?T:locus")
+    register_function("LocusAlleles", ("str",), "struct{locus: ?T, alleles: array<str>}")
+    register_function("LocusInterval", ("str","bool",), "interval<?T:locus>")
+    register_function("LocusInterval", ("str","int32","int32","bool","bool","bool",), "interval<?T:locus>")
+    register_function("globalPosToLocus", ("int64",), "?T:locus")
+    register_function("locusToGlobalPos", ("?T:locus",), "int64")
+    register_function("liftoverLocus", ("?T:locus", 'float64',), "struct{result:?U:locus,is_negative_strand:bool}")
+    register_function("liftoverLocusInterval", ("interval<?T:locus>", 'float64',), "struct{result:interval<?U:locus>,is_negative_strand:bool}")
+    register_function("min_rep", ("?T:locus","array<str>",), "struct{locus: ?T, alleles: array<str>}")
+    register_function("locus_windows_per_contig", ("array<array<float64>>","float64",), "tuple(array<int32>, array<int32>)")
+    register_function("toBoolean", ("str",), "bool")
+    register_seeded_function("rand_bool", ("float64",), "bool")
+    register_function("pchisqtail", ("float64","float64",), "float64")
+    register_seeded_function("rand_cat", ("array<float64>",), "int32")
+    register_function("inYNonPar", ("?T:locus",), "bool")
+    register_function("+", ("str","str",), "str")
+    register_function("**", ("float32","float32",), "float64")
+    register_function("**", ("int32","int32",), "float64")
+    register_function("**", ("int64","int64",), "float64")
+    register_function("**", ("float64","float64",), "float64")
+    register_function("length", ("str",), "int32")
+    register_function("slice", ("str","int32","int32",), "str")
+    register_function("split", ("str","str","int32",), "array<str>")
+    register_function("split", ("str","str",), "array<str>")
+    register_seeded_function("rand_gamma", ("float64","float64",), "float64")
+    register_function("UnphasedDiploidGtIndexCall", ("int32",), "call")
+    register_function("[]", ("call","int32",), "int32")
+    register_function("sign", ("int64",), "int64")
+    register_function("sign", ("float64",), "float64")
+    register_function("sign", ("float32",), "float32")
+    register_function("sign", ("int32",), "int32")
+    register_function("unphasedDiploidGtIndex", ("call",), "int32")
+    register_function("gamma", ("float64",), "float64")
+    register_function("%", ("float64","float64",), "float64")
+    register_function("%", ("int64","int64",), "int64")
+    register_function("%", ("float32","float32",), "float32")
+    register_function("%", ("int32","int32",), "int32")
+    register_function("fisher_exact_test", ("int32","int32","int32","int32",), "struct{p_value: float64, odds_ratio: float64, ci_95_lower: float64, ci_95_upper: float64}")
+    register_function("floor", ("float64",), "float64")
+    register_function("floor", ("float32",), "float32")
+    register_function("isNonRef", ("call",), "bool")
+    register_function("includesStart", ("interval<?T>",), "bool")
+    register_function("isHetNonRef", ("call",), "bool")
+    register_function("hardy_weinberg_test", ("int32","int32","int32",), "struct{het_freq_hwe: float64, p_value: float64}")
+    register_function("haplotype_freq_em", ("array<int32>",), "array<float64>")
+    register_function("nNonRefAlleles", ("call",), "int32")
+    register_function("abs", ("float64",), "float64")
+    register_function("abs", ("float32",), "float32")
+    register_function("abs", ("int64",), "int64")
+    register_function("abs", ("int32",), "int32")
+    register_function("endswith", ("str","str",), "bool")
+    register_function("sqrt", ("float64",), "float64")
+    register_function("isnan", ("float32",), "bool")
+    register_function("isnan", ("float64",), "bool")
+    register_function("lower", ("str",), "str")
+    register_seeded_function("rand_beta", ("float64","float64",), "float64")
+    register_seeded_function("rand_beta", ("float64","float64","float64","float64",), "float64")
+    register_function("toInt64", ("bool",), "int64")
+    register_function("toInt64", ("str",), "int64")
+    register_function("testCodeUnification2", ("?x",), "?x")
+    register_function("contains", ("str","str",), "bool")
+    register_function("contains", ("interval<?T>","?T",), "bool")
+    register_function("entropy", ("str",), "float64")
+    register_function("filtering_allele_frequency", ("int32","int32","float64",), "float64")
+    register_function("gqFromPL", ("array<?N:int32>",), "int32")
+    register_function("startswith", ("str","str",), "bool")
+    register_function("ceil", ("float32",), "float32")
+    register_function("ceil", ("float64",), "float64")
+    register_function("json", ("?T",), "str")
+    register_function("strip", ("str",), "str")
+    register_function("firstMatchIn", ("str","str",), "array<str>")
+    register_function("isEmpty", ("interval<?T>",), "bool")
+    register_function("~", ("str","str",), "bool")
+    register_function("mkString", ("set<str>","str",), "str")
+    register_function("mkString", ("array<str>","str",), "str")
+    register_function("dosage", ("array<?N:float64>",), "float64")
+    register_function("upper", ("str",), "str")
+    register_function("overlaps", ("interval<?T>","interval<?T>",), "bool")
+    register_function("downcode", ("call","int32",), "call")
+    register_function("inXPar", ("?T:locus",), "bool")
+    register_function("format", ("str","?T:tuple",), "str")
+    register_function("pnorm", ("float64",), "float64")
+    register_function("is_infinite", ("float32",), "bool")
+    register_function("is_infinite", ("float64",), "bool")
+    register_function("isHetRef", ("call",), "bool")
+    register_function("isMitochondrial", ("?T:locus",), "bool")
+    register_function("hamming", ("str","str",), "int32")
+    register_function("end", ("interval<?T>",), "?T")
+    register_function("start", ("interval<?T>",), "?T")
+    register_function("inXNonPar", ("?T:locus",), "bool")
+    register_function("escapeString", ("str",), "str")
+    register_function("isHomRef", ("call",), "bool")
+    register_seeded_function("rand_norm", ("float64","float64",), "float64")
+    register_function("chi_squared_test", ("int32","int32","int32","int32",), "struct{p_value: float64, odds_ratio: float64}")
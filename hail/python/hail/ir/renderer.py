@@ -1,5 +1,6 @@
 from hail import ir
 import abc
+import itertools
 from typing import Sequence, MutableSequence, List, Set, Dict, Optional
 from collections import namedtuple
 
@@ -152,16 +153,41 @@ BindingSite = namedtuple(
     'depth lifted_lets agg_lifted_lets scan_lifted_lets')
 
 
+# Java IR ids are unique across renderers, so rendered text cached on a node
+# (which may refer to them) can be spliced into any later rendering.
+_jir_ids = itertools.count()
+
+
+def _flatten(parts) -> str:
+    # rendered text is built as nested sequences of strings, so that cached
+    # subtrees can be shared by their ancestors without copying
+    out = []
+    stack = [iter(parts)]
+    while stack:
+        for part in stack[-1]:
+            if isinstance(part, str):
+                out.append(part)
+            else:
+                stack.append(iter(part))
+                break
+        else:
+            stack.pop()
+    return ''.join(out)
+
+
 class CSERenderer(Renderer):
-    def __init__(self, stop_at_jir=False):
+    def __init__(self, stop_at_jir=False, large_literals=False):
         self.stop_at_jir = stop_at_jir
-        self.jir_count = 0
+        # If True, large literals are rendered as references to their encoded
+        # ids, and collected in 'literals' for the backend to send separately.
+        self.large_literals = large_literals
         self.jirs = {}
+        self.literals: Dict[str, 'ir.Literal'] = {}
         self.memo: Dict[int, Sequence[str]] = {}
+        self._cache_key = (stop_at_jir, large_literals)
 
     def add_jir(self, jir):
-        jir_id = f'm{self.jir_count}'
-        self.jir_count += 1
+        jir_id = f'm{next(_jir_ids)}'
         self.jirs[jir_id] = jir
         return jir_id
 
@@ -179,9 +205,84 @@ class CSERenderer(Renderer):
 
         self.memo[id(node)] = jref
 
+    def _add_literal(self, node: 'ir.Literal'):
+        literal_id = node._encoded_id()
+        self.literals[literal_id] = node
+        self.memo[id(node)] = f'(JavaIR {literal_id})'
+
+    def _use_cached(self, node: 'ir.BaseIR') -> bool:
+        # If 'node' was rendered before (by any renderer with the same
+        # options), add its text to 'memo' and return True.
+        if node._rendered is None or self._cache_key not in node._rendered:
+            return False
+        parts, jirs, literals = node._rendered[self._cache_key]
+        self.memo[id(node)] = parts
+        self.jirs.update(jirs)
+        self.literals.update(literals)
+        return True
+
+    def _render_and_cache(self, node: 'ir.BaseIR'):
+        outer_jirs = self.jirs
+        outer_literals = self.literals
+        self.jirs = {}
+        self.literals = {}
+        binding_sites = CSEAnalysisPass(self)(node)
+        parts = tuple(CSEPrintPass(self)(node, binding_sites))
+        jirs = self.jirs
+        literals = self.literals
+        self.jirs = outer_jirs
+        self.jirs.update(jirs)
+        self.literals = outer_literals
+        self.literals.update(literals)
+        if node._rendered is None:
+            node._rendered = {}
+        node._rendered[self._cache_key] = (parts, jirs, literals)
+        self.memo[id(node)] = parts
+
+    def _uncached_relational_nodes(self, root: 'ir.BaseIR') -> List['ir.BaseIR']:
+        # post-order, so each relational node is rendered after all relational
+        # nodes below it
+        result = []
+        seen = set()
+        stack = [(root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if children_done:
+                if not isinstance(node, ir.IR):
+                    result.append(node)
+                continue
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            if node is not root:
+                if self.stop_at_jir and hasattr(node, '_jir'):
+                    continue
+                if node._rendered is not None and self._cache_key in node._rendered:
+                    continue
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(node.children)
+                         if isinstance(child, ir.BaseIR))
+        return result
+
+    # Relational nodes (tables, matrix tables, block matrices) start a new
+    # block in every child, so no let is ever lifted across them, and each is
+    # rendered independently and its text cached on the node. A query built
+    # on a previously rendered relational subtree only renders the new top.
+    # The root is cached too, so rendering the same IR again is free.
     def __call__(self, root: 'ir.BaseIR') -> str:
-        binding_sites = CSEAnalysisPass(self)(root)
-        return CSEPrintPass(self)(root, binding_sites)
+        # readers may render IR nested in their configuration while an outer
+        # render is in progress, so the outer 'memo' is restored afterwards
+        outer_memo = self.memo
+        self.memo = {}
+        try:
+            if not self._use_cached(root):
+                for node in self._uncached_relational_nodes(root):
+                    self._render_and_cache(node)
+                if id(root) not in self.memo:
+                    self._render_and_cache(root)
+            return _flatten(self.memo[id(root)])
+        finally:
+            self.memo = outer_memo
 
 
 class CSEAnalysisPass:
@@ -247,6 +348,13 @@ class CSEAnalysisPass:
                 self.renderer._add_jir(child)
                 continue
 
+            if not isinstance(child, ir.IR) and self.renderer._use_cached(child):
+                continue
+
+            if self.renderer.large_literals and isinstance(child, ir.Literal) and child._is_large():
+                self.renderer._add_literal(child)
+                continue
+
             child_frame = frame.make_child_frame(len(stack))
 
             if isinstance(child, ir.IR):
@@ -391,7 +499,7 @@ class CSEPrintPass:
         memo = self.renderer.memo
 
         if id(root) in memo:
-            return ''.join(memo[id(root)])
+            return [memo[id(root)]]
         root_ctx = ({var: 0 for var in root.free_vars}, {}, {})
         stack = [self.StackFrame.make(root, self.renderer, binding_sites,
                                       bindings_stack, 0, 0, False, root_ctx, 0)]
@@ -427,7 +535,7 @@ class CSEPrintPass:
                         frame.add_lets(bindings_stack[frame.depth].let_bodies, out_builder)
                         del bindings_stack[frame.depth]
                     if not stack:
-                        return ''.join(root_builder)
+                        return root_builder
                     continue
 
             if child_idx > 0:
@@ -93,7 +93,6 @@ class TableIntervalJoin(TableIR):
 class TableUnion(TableIR):
     def __init__(self, children):
         super().__init__(*children)
-        self.children = children
 
     def _compute_type(self):
         for c in self.children:
@@ -480,7 +479,6 @@ class TableRename(TableIR):
 class TableMultiWayZipJoin(TableIR):
     def __init__(self, children, data_name, global_name):
         super().__init__(*children)
-        self.children = children
         self.data_name = data_name
         self.global_name = global_name
 
@@ -17,6 +17,11 @@ class TableReader(object):
     def __eq__(self, other):
         pass
 
+    def _input_paths(self):
+        """Paths of the files this reader reads, or ``None`` if they are not
+        known."""
+        return None
+
 
 class TableNativeReader(TableReader):
     @typecheck_method(path=str,
@@ -43,6 +48,9 @@ class TableNativeReader(TableReader):
         else:
             self.intervals = intervals
 
+    def _input_paths(self):
+        return [self.path]
+
     def render(self):
         reader = {'name': 'TableNativeReader',
                   'path': self.path}
@@ -83,6 +91,9 @@ class TextTableReader(TableReader):
             'forceGZ': force_gz
         }
 
+    def _input_paths(self):
+        return self.config['files']
+
     def render(self):
         reader = {'name': 'TextTableReader',
                   'options': self.config}
@@ -99,6 +110,9 @@ class TableFromBlockMatrixNativeReader(TableReader):
         self.path = path
         self.n_partitions = n_partitions
 
+    def _input_paths(self):
+        return [self.path]
+
     def render(self):
         reader = {'name': 'TableFromBlockMatrixNativeReader',
                   'path': self.path,
@@ -1,9 +1,11 @@
+import collections
+import concurrent.futures
+import mmap
 import os
 
 import itertools
 import numpy as np
 import re
-import scipy.linalg as spla
 
 import hail as hl
 import hail.expr.aggregators as agg
@@ -18,7 +20,7 @@ from hail.ir.blockmatrix_reader import BlockMatrixNativeReader, BlockMatrixBinar
 from hail.ir.blockmatrix_writer import BlockMatrixBinaryWriter, BlockMatrixNativeWriter, BlockMatrixRectanglesWriter
 from hail.table import Table
 from hail.typecheck import *
-from hail.utils import new_temp_file, new_local_temp_file, local_path_uri, storage_level
+from hail.utils import new_temp_file, new_local_temp_dir, new_local_temp_file, local_path_uri, uri_path, storage_level
 from hail.utils.java import Env, jarray, joption
 
 block_matrix_type = lazy()
@@ -325,6 +327,12 @@ class BlockMatrix(object):
 
         The number of entries must be less than :math:`2^{31}`.
 
+        If `ndarray` is a :class:`numpy.memmap` of float64 values in row-major
+        order starting at the beginning of a local file, the block matrix is
+        read from that file directly, without copying the ndarray. Later writes
+        to the memory map are then visible to the block matrix until it is
+        written or persisted.
+
         Parameters
         ----------
         ndarray: :class:`numpy.ndarray`
@@ -343,13 +351,16 @@ class BlockMatrix(object):
             raise ValueError(f'from_numpy: ndarray dimensions must be non-zero, found shape {ndarray.shape}')
 
         nd = _ndarray_as_2d(ndarray)
-        nd = _ndarray_as_float64(nd)
         n_rows, n_cols = nd.shape
 
-        path = new_local_temp_file()
-        uri = local_path_uri(path)
-        nd.tofile(path)
-        return cls.fromfile(uri, n_rows, n_cols, block_size)
+        path = _memmap_path(ndarray)
+        if path is None:
+            nd = _ndarray_as_float64(nd)
+            path = new_local_temp_file()
+            nd.tofile(path)
+        elif ndarray.mode != 'r':
+            ndarray.flush()
+        return cls.fromfile(local_path_uri(path), n_rows, n_cols, block_size)
 
     @classmethod
     @typecheck_method(entry_expr=expr_float64,
@@ -1153,20 +1164,27 @@ class BlockMatrix(object):
         -----
         The resulting ndarray will have the same shape as the block matrix.
 
+        The ndarray is backed by a memory-mapped local temporary file into
+        which the entries are written, so it is not read into memory until
+        used.
+
         Returns
         -------
         :class:`numpy.ndarray`
         """
+        shape = (self.n_rows, self.n_cols)
 
         if self.n_rows * self.n_cols > 1 << 31 or _force_blocking:
             path = new_temp_file()
             self.export_blocks(path, binary=True)
-            return BlockMatrix.rectangles_to_numpy(path, binary=True)
+            rect_files, rects = _list_rectangles(path)
+            nd = np.memmap(new_local_temp_file(), dtype=np.float64, mode='w+', shape=shape)
+            _read_rectangles(rect_files, rects, True, nd)
+            return nd.view(np.ndarray)
 
         path = new_local_temp_file()
-        uri = local_path_uri(path)
-        self.tofile(uri)
-        return np.fromfile(path).reshape((self.n_rows, self.n_cols))
+        self.tofile(local_path_uri(path))
+        return np.memmap(path, dtype=np.float64, mode='r+', shape=shape).view(np.ndarray)
 
     @property
     def is_sparse(self):
@@ -2111,10 +2129,14 @@ class BlockMatrix(object):
         If exporting to binary files, note that they are not platform independent. No byte-order
         or data-type information is saved.
 
+        Rectangles are fetched concurrently. Local binary rectangles are read
+        in place; others are first copied to a local temporary file.
+
         See Also
         --------
         :meth:`.export_rectangles`
         :meth:`.export_blocks`
+        :meth:`.iter_rectangles`
 
         Parameters
         ----------
@@ -2127,31 +2149,63 @@ class BlockMatrix(object):
         -------
         :class:`numpy.ndarray`
         """
-        def parse_rects(fname):
-            rect_idx_and_bounds = [int(i) for i in re.findall(r'\d+', fname)]
-            if len(rect_idx_and_bounds) != 5:
-                raise ValueError(f'Invalid rectangle file name: {fname}')
-            return rect_idx_and_bounds
-
-        rect_files = [file['path'] for file in hl.utils.hadoop_ls(path) if not re.match(r'.*\.crc', file['path'])]
-        rects = [parse_rects(os.path.basename(file_path)) for file_path in rect_files]
+        rect_files, rects = _list_rectangles(path)
 
         n_rows = max(rects, key=lambda r: r[2])[2]
         n_cols = max(rects, key=lambda r: r[4])[4]
 
         nd = np.zeros(shape=(n_rows, n_cols))
-        f = new_local_temp_file()
-        uri = local_path_uri(f)
-        for rect, file_path in zip(rects, rect_files):
-            hl.utils.hadoop_copy(file_path, uri)
-            if binary:
-                rect_data = np.reshape(np.fromfile(f), (rect[2]-rect[1], rect[4]-rect[3]))
-            else:
-                rect_data = np.loadtxt(f, ndmin=2)
-            nd[rect[1]:rect[2], rect[3]:rect[4]] = rect_data
-
+        _read_rectangles(rect_files, rects, binary, nd)
         return nd
 
+    @staticmethod
+    @typecheck(path=str, binary=bool)
+    def iter_rectangles(path, binary=False):
+        """Iterates over files of rectangles written out using
+        :meth:`.export_rectangles` or :meth:`.export_blocks`, without
+        assembling them into one ndarray.
+
+        Examples
+        --------
+        Sum the exported entries, holding only a few rectangles in memory at
+        a time:
+
+        >>> import numpy as np
+        >>> nd = np.array([[ 1.0, 2.0, 3.0],
+        ...                [ 4.0, 5.0, 6.0],
+        ...                [ 7.0, 8.0, 9.0]])
+
+        >>> BlockMatrix.from_numpy(nd).export_rectangles('output/example', [[0, 3, 0, 1], [1, 2, 0, 2]])
+        >>> for bounds, rect in BlockMatrix.iter_rectangles('output/example'):
+        ...     print(bounds, rect.sum())
+        (0, 3, 0, 1) 12.0
+        (1, 2, 0, 2) 9.0
+
+        Notes
+        -----
+        Rectangles are yielded in the order they were exported, as pairs of
+        their bounds ``(start_row, end_row, start_col, end_col)`` and their
+        entries. Rectangles are fetched concurrently, a bounded number ahead
+        of the one being consumed.
+
+        See Also
+        --------
+        :meth:`.rectangles_to_numpy`
+
+        Parameters
+        ----------
+        path: :obj:`str`
+            Path to directory where rectangles were written.
+        binary: :obj:`bool`
+            If true, reads the files as binary, otherwise as text delimited.
+
+        Returns
+        -------
+        iterator of (:obj:`tuple` of :obj:`int`, :class:`numpy.ndarray`)
+        """
+        rect_files, rects = _list_rectangles(path)
+        return _iter_rectangles(rect_files, rects, binary)
+
     @typecheck_method(compute_uv=bool,
                       complexity_bound=int)
     def svd(self, compute_uv=True, complexity_bound=8192):
@@ -2383,6 +2437,82 @@ def _broadcast_index_expr(bmir_shape, is_row_vector):
         raise ValueError(f'Cannot broadcast shape: ${bmir_shape}')
 
 
+def _memmap_path(nd):
+    """Path of the file backing `nd` if `nd` is a shared memory map of
+    float64 values in row-major order from the start of that file, otherwise
+    ``None``."""
+    # slices and views of a memory map share its filename and offset but
+    # not its start, so only the memory map itself qualifies
+    if (isinstance(nd, np.memmap) and isinstance(nd.base, mmap.mmap)
+            and nd.filename is not None and nd.offset == 0 and nd.mode != 'c'
+            and nd.dtype == np.float64 and nd.flags.c_contiguous):
+        return nd.filename
+    return None
+
+
+def _list_rectangles(path):
+    def parse_rects(fname):
+        rect_idx_and_bounds = [int(i) for i in re.findall(r'\d+', fname)]
+        if len(rect_idx_and_bounds) != 5:
+            raise ValueError(f'Invalid rectangle file name: {fname}')
+        return rect_idx_and_bounds
+
+    rect_files = [file['path'] for file in hl.utils.hadoop_ls(path) if not re.match(r'.*\.crc', file['path'])]
+    rects = [parse_rects(os.path.basename(file_path)) for file_path in rect_files]
+    # in the order they were exported
+    order = sorted(range(len(rects)), key=lambda i: rects[i][0])
+    return [rect_files[i] for i in order], [rects[i] for i in order]
+
+
+# rectangles are fetched this many at a time
+_rectangle_read_threads = 16
+
+
+def _read_rectangle(rect, file_path, binary, tmp_dir):
+    if file_path.startswith('file:'):
+        f = uri_path(file_path)
+        staged = False
+    else:
+        f = os.path.join(tmp_dir, str(rect[0]))
+        hl.utils.hadoop_copy(file_path, local_path_uri(f))
+        staged = True
+    try:
+        if binary:
+            return np.fromfile(f).reshape((rect[2] - rect[1], rect[4] - rect[3]))
+        else:
+            return np.loadtxt(f, ndmin=2)
+    finally:
+        if staged:
+            os.remove(f)
+
+
+def _iter_rectangles(rect_files, rects, binary):
+    """Yield ``(bounds, ndarray)`` for each rectangle, in order, fetching
+    at most twice `_rectangle_read_threads` rectangles ahead."""
+    tmp_dir = new_local_temp_dir()
+    pending = collections.deque()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=_rectangle_read_threads) as pool:
+        try:
+            for rect, file_path in zip(rects, rect_files):
+                pending.append((rect, pool.submit(_read_rectangle, rect, file_path, binary, tmp_dir)))
+                if len(pending) >= 2 * _rectangle_read_threads:
+                    rect, future = pending.popleft()
+                    yield tuple(rect[1:]), future.result()
+            while pending:
+                rect, future = pending.popleft()
+                yield tuple(rect[1:]), future.result()
+        finally:
+            # the consumer stopped early or a read failed
+            for _, future in pending:
+                future.cancel()
+
+
+def _read_rectangles(rect_files, rects, binary, out):
+    """Copy rectangle files into `out`."""
+    for (start_row, end_row, start_col, end_col), rect_data in _iter_rectangles(rect_files, rects, binary):
+        out[start_row:end_row, start_col:end_col] = rect_data
+
+
 def _ndarray_as_2d(nd):
     if nd.ndim == 1:
         nd = nd.reshape(1, nd.shape[0])
@@ -2451,6 +2581,7 @@ def _svd(a, full_matrices=True, compute_uv=True, overwrite_a=False, check_finite
     GR: https://software.intel.com/en-us/mkl-developer-reference-fortran-gesvd
     DC (gesdd) is faster but uses O(elements) memory; lwork may overflow int32
     """
+    import scipy.linalg as spla
     try:
         return spla.svd(a, full_matrices=full_matrices, compute_uv=compute_uv, overwrite_a=overwrite_a,
                         check_finite=check_finite, lapack_driver='gesdd')
@@ -2470,4 +2601,7 @@ def _eigh(a):
     SciPy uses RRR: https://software.intel.com/en-us/mkl-developer-reference-fortran-syevr
     DC (syevd) is faster but uses O(elements) memory; lwork overflows int32 for dim_a > 32766
     """
-    return np.linalg.eigh(a) if a.shape[0] <= 32766 else spla.eigh(a)
+    if a.shape[0] <= 32766:
+        return np.linalg.eigh(a)
+    import scipy.linalg as spla
+    return spla.eigh(a)
@@ -3,7 +3,7 @@ import numpy as np
 import hail as hl
 from hail.typecheck import *
 from hail.expr.expressions import expr_locus, expr_float64, check_row_indexed
-from hail.utils.java import Env
+from hail.utils.java import Env, FatalError
 
 
 @typecheck(a=np.ndarray,
@@ -62,19 +62,12 @@ def array_windows(a, radius):
     if a[-1] + radius < a[-1]:
         raise ValueError('array_windows: overflow for a[-1] + radius')
 
-    starts, stops = np.zeros(size, dtype=np.int64),  np.zeros(size, dtype=np.int64)
-    j, k = 0, 0
-    for i in range(size):
-        min_val = a[i] - radius
-        while j < size and a[j] < min_val:
-            j += 1
-        starts[i] = j
+    return _sorted_array_windows(a, radius)
 
-        max_val = a[i] + radius
-        while k < size and a[k] <= max_val:
-            k += 1
-        stops[i] = k
 
+def _sorted_array_windows(a, radius):
+    starts = np.searchsorted(a, a - radius, side='left').astype(np.int64, copy=False)
+    stops = np.searchsorted(a, a + radius, side='right').astype(np.int64, copy=False)
     return starts, stops
 
 
@@ -171,25 +164,34 @@ def locus_windows(locus_expr, radius, coord_expr=None, _localize=True):
         check_row_indexed('locus_windows', coord_expr)
 
     src = locus_expr._indices.source
-    if locus_expr not in src._fields_inverse:
+    annotate_fields = {}
+    if locus_expr in src._fields_inverse:
+        locus = src._fields_inverse[locus_expr]
+    else:
         locus = Env.get_uid()
-        annotate_fields = {locus: locus_expr}
-
-        if coord_expr is not None:
-            if coord_expr not in src._fields_inverse:
-                coords = Env.get_uid()
-                annotate_fields[coords] = coord_expr
-            else:
-                coords = src._fields_inverse[coord_expr]
+        annotate_fields[locus] = locus_expr
 
-        if isinstance(src, hl.MatrixTable):
-            new_src = src.annotate_rows(**annotate_fields)
+    if coord_expr is not None:
+        if coord_expr in src._fields_inverse:
+            coords = src._fields_inverse[coord_expr]
         else:
-            new_src = src.annotate(**annotate_fields)
+            coords = Env.get_uid()
+            annotate_fields[coords] = coord_expr
 
-        locus_expr = new_src[locus]
-        if coord_expr is not None:
-            coord_expr = new_src[coords]
+    # order is checked against the previous row, rather than by collecting
+    # every global position
+    prev_global_pos = Env.get_uid()
+    annotate_fields[prev_global_pos] = hl.scan._prev_nonnull(locus_expr.global_position())
+
+    if isinstance(src, hl.MatrixTable):
+        new_src = src.annotate_rows(**annotate_fields)
+    else:
+        new_src = src.annotate(**annotate_fields)
+
+    locus_expr = new_src[locus]
+    if coord_expr is not None:
+        coord_expr = new_src[coords]
+    prev_global_pos = new_src[prev_global_pos]
 
     if coord_expr is None:
         coord_expr = locus_expr.position
@@ -197,28 +199,41 @@ def locus_windows(locus_expr, radius, coord_expr=None, _localize=True):
     rg = locus_expr.dtype.reference_genome
     contig_group_expr = hl.agg.group_by(hl.locus(locus_expr.contig, 1, reference_genome=rg), hl.agg.collect(coord_expr))
 
-    # check loci are in sorted order
-    last_pos = hl.fold(lambda a, elt: (hl.case()
-                                         .when(a <= elt, elt)
-                                         .or_error("locus_windows: 'locus_expr' global position must be in ascending order.")),
-                       -1,
-                       hl.agg.collect(hl.case()
-                                        .when(hl.is_defined(locus_expr), locus_expr.global_position())
-                                        .or_error("locus_windows: missing value for 'locus_expr'.")))
     checked_contig_groups = (hl.case()
-                               .when(last_pos >= 0, contig_group_expr)
+                               .when(hl.agg.all(hl.is_missing(prev_global_pos)
+                                                | (prev_global_pos <= locus_expr.global_position())),
+                                     contig_group_expr)
+                               .or_error("locus_windows: 'locus_expr' global position must be in ascending order."))
+    checked_contig_groups = (hl.case()
+                               .when(hl.agg.all(hl.is_defined(coord_expr)), checked_contig_groups)
+                               .or_error("locus_windows: missing value for 'coord_expr'."))
+    checked_contig_groups = (hl.case()
+                               .when(hl.agg.all(hl.is_defined(locus_expr)), checked_contig_groups)
+                               .or_error("locus_windows: missing value for 'locus_expr'."))
+    checked_contig_groups = (hl.case()
+                               .when(hl.agg.count() > 0, checked_contig_groups)
                                .or_error("locus_windows: 'locus_expr' has length 0"))
 
     contig_groups = locus_expr._aggregation_method()(checked_contig_groups, _localize=False)
 
     coords = hl.sorted(hl.array(contig_groups)).map(lambda t: t[1])
-    starts_and_stops = hl._locus_windows_per_contig(coords, radius)
 
     if not _localize:
-        return starts_and_stops
-
-    starts, stops = hl.eval(starts_and_stops)
-    return np.array(starts), np.array(stops)
+        return hl._locus_windows_per_contig(coords, radius)
+
+    # windows never cross contigs, so compute them for each contig at once
+    # and offset them by the number of rows on earlier contigs
+    starts, stops = [], []
+    offset = 0
+    for contig_coords in hl.eval(coords):
+        a = np.array(contig_coords, dtype=np.float64)
+        if not np.all(a[:-1] <= a[1:]):
+            raise FatalError("locus_windows: 'coord_expr' must be in ascending order within each contig.")
+        contig_starts, contig_stops = _sorted_array_windows(a, radius)
+        starts.append(contig_starts + offset)
+        stops.append(contig_stops + offset)
+        offset += a.size
+    return np.concatenate(starts), np.concatenate(stops)
 
 
 def _check_dims(a, name, ndim, min_size=1):
@@ -566,7 +566,7 @@ class MatrixTable(ExprContainer):
         self._rvrow = construct_reference('va',
                                           self._type.row_type,
                                           indices=self._row_indices)
-        self._row = hail.struct(**{k: self._rvrow[k] for k in self._row_type.keys()})
+        self._row = self._rvrow
         self._col = construct_reference('sa', self._col_type,
                                         indices=self._col_indices)
         self._entry = construct_reference('g', self._entry_type,
@@ -585,11 +585,7 @@ class MatrixTable(ExprContainer):
 
         self._num_samples = None
 
-        for k, v in itertools.chain(self._globals.items(),
-                                    self._row.items(),
-                                    self._col.items(),
-                                    self._entry.items()):
-            self._set_field(k, v)
+        self._set_fields(self._globals, self._row, self._col, self._entry)
 
     @property
     def _schema(self) -> tmatrix:
@@ -1301,12 +1297,11 @@ class MatrixTable(ExprContainer):
                 raise ValueError("MatrixTable.drop: cannot drop key field '{}'".format(name))
             return name
 
-        all_field_exprs = {e: k for k, e in self._fields.items()}
         fields_to_drop = set()
         for e in exprs:
             if isinstance(e, Expression):
-                if e in all_field_exprs:
-                    fields_to_drop.add(all_field_exprs[e])
+                if e in self._fields_inverse:
+                    fields_to_drop.add(self._fields_inverse[e])
                 else:
                     raise ExpressionException("method 'drop' expects string field names or top-level field expressions"
                                               " (e.g. 'foo', matrix.foo, or matrix['foo'])")
@@ -1,5 +1,6 @@
+import concurrent.futures
+
 import numpy as np
-import pandas as pd
 
 import hail as hl
 from hail.linalg import BlockMatrix
@@ -620,15 +621,39 @@ class LinearMixedModel(object):
         log_lkhd = np.zeros(101, dtype=np.float64)
         log_lkhd[0], log_lkhd[100] = np.nan, np.nan
 
-        for h2 in range(1, 100):
-            gamma = h2 / (100.0 - h2)
-            log_lkhd[h2] = -self.compute_neg_log_reml(np.log(gamma))
+        h2 = np.arange(1, 100)
+        log_lkhd[1:100] = -self._neg_log_reml_grid(np.log(h2 / (100.0 - h2)))
 
         log_lkhd -= np.max(log_lkhd[1:-1])
         lkhd = np.exp(log_lkhd)
         lkhd /= np.sum(lkhd[1:-1])
         return lkhd
 
+    def _neg_log_reml_grid(self, log_gamma):
+        # compute_neg_log_reml for each value of the 1-dimensional log_gamma
+        gamma = np.exp(log_gamma)
+        d = 1 / (self.s + 1 / gamma[:, np.newaxis])
+        logdet_d = np.sum(np.log(d), axis=1) + (self.n - self.r) * log_gamma
+
+        if self.low_rank:
+            d -= gamma[:, np.newaxis]
+        dpy = d * self.py
+        ydy = dpy @ self.py
+        xdy = dpy @ self.px
+        xdx = (self.px.T * d[:, np.newaxis, :]) @ self.px
+        if self.low_rank:
+            ydy += gamma * self._yty
+            xdy += gamma[:, np.newaxis] * self._xty
+            xdx += gamma[:, np.newaxis, np.newaxis] * self._xtx
+
+        try:
+            beta = np.linalg.solve(xdx, xdy[:, :, np.newaxis])[:, :, 0]
+        except np.linalg.LinAlgError as e:
+            raise Exception('linear algebra error while solving for REML estimate') from e
+        residual_sq = ydy - np.einsum('ij,ij->i', xdy, beta)
+        sigma_sq = residual_sq / self._dof
+        return (np.linalg.slogdet(xdx)[1] - logdet_d + self._dof * np.log(sigma_sq)) / 2
+
     @typecheck_method(pa_t_path=str,
                       a_t_path=nullable(str),
                       partition_size=nullable(int))
@@ -743,16 +768,19 @@ class LinearMixedModel(object):
 
         return Table._from_java(self._scala_model.fit(jpa_t, maybe_ja_t))
 
-    @typecheck_method(pa=np.ndarray, a=nullable(np.ndarray), return_pandas=bool)
-    def fit_alternatives_numpy(self, pa, a=None, return_pandas=False):
+    @typecheck_method(pa=np.ndarray, a=nullable(np.ndarray), return_pandas=bool, block_size=int, n_threads=int)
+    def fit_alternatives_numpy(self, pa, a=None, return_pandas=False, block_size=1024, n_threads=1):
         r"""Fit and test alternative model for each augmented design matrix.
 
         Notes
         -----
-        This Python-only implementation runs serially on master. See
+        This Python-only implementation runs on master. See
         the scalable implementation :meth:`fit_alternatives` for documentation
         of the returned table.
 
+        Augmentations are fit together in blocks of `block_size` columns,
+        which are distributed over `n_threads` threads.
+
         Parameters
         ----------
         pa: :class:`ndarray`
@@ -764,6 +792,10 @@ class LinearMixedModel(object):
             Required for low-rank inference.
         return_pandas: :obj:`bool`
             If true, return pandas dataframe. If false, return Hail table.
+        block_size: :obj:`int`
+            Number of augmentations to fit at once.
+        n_threads: :obj:`int`
+            Number of threads on which to fit blocks.
 
         Returns
         -------
@@ -774,23 +806,83 @@ class LinearMixedModel(object):
 
         if not self._fitted:
             raise Exception("null model is not fit. Run 'fit' first.")
+        if block_size <= 0:
+            raise ValueError(f'block_size must be positive, found {block_size}')
+        if n_threads <= 0:
+            raise ValueError(f'n_threads must be positive, found {n_threads}')
 
         n_cols = pa.shape[1]
         assert pa.shape[0] == self.r
 
         if self.low_rank:
             assert a.shape[0] == self.n and a.shape[1] == n_cols
-            data = [(i,) + self._fit_alternative_numpy(pa[:, i], a[:, i]) for i in range(n_cols)]
+
+        def fit_block(start):
+            stop = min(start + block_size, n_cols)
+            return self._fit_alternatives_block(pa[:, start:stop], a[:, start:stop] if self.low_rank else None)
+
+        starts = range(0, n_cols, block_size)
+        if n_threads == 1:
+            blocks = [fit_block(start) for start in starts]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=n_threads) as pool:
+                blocks = list(pool.map(fit_block, starts))
+
+        if blocks:
+            beta, sigma_sq, chi_sq, p_value = (np.concatenate(x) for x in zip(*blocks))
         else:
-            data = [(i,) + self._fit_alternative_numpy(pa[:, i], None) for i in range(n_cols)]
+            beta = sigma_sq = chi_sq = p_value = np.zeros(0)
 
-        df = pd.DataFrame.from_records(data, columns=['idx', 'beta', 'sigma_sq', 'chi_sq', 'p_value'])
+        import pandas as pd
+        df = pd.DataFrame({'idx': np.arange(n_cols, dtype=np.int64), 'beta': beta, 'sigma_sq': sigma_sq,
+                           'chi_sq': chi_sq, 'p_value': p_value},
+                          columns=['idx', 'beta', 'sigma_sq', 'chi_sq', 'p_value'])
 
         if return_pandas:
             return df
         else:
             return Table.from_pandas(df, key='idx')
 
+    def _fit_alternatives_block(self, pa, a):
+        # _fit_alternative_numpy for each column of pa (and a), with the
+        # products for all columns computed together
+        from scipy.stats.distributions import chi2
+
+        gamma = self.gamma
+        dpa = self._d_alt[:, np.newaxis] * pa
+        m = pa.shape[1]
+
+        xdy = np.empty((m, self.f + 1))
+        xdy[:, 0] = self.py @ dpa
+        xdy[:, 1:] = self._xdy_alt[1:]
+        xdx = np.empty((m, self.f + 1, self.f + 1))
+        xdx[:, 0, 0] = np.einsum('ij,ij->j', pa, dpa)
+        xdx[:, 0, 1:] = dpa.T @ self.px
+        if self.low_rank:
+            xdy[:, 0] += gamma * (self.y @ a)
+            xdx[:, 0, 0] += gamma * np.einsum('ij,ij->j', a, a)
+            xdx[:, 0, 1:] += gamma * (a.T @ self.x)
+        xdx[:, 1:, 0] = xdx[:, 0, 1:]
+        xdx[:, 1:, 1:] = self._xdx_alt[1:, 1:]
+
+        try:
+            # fails unless every matrix is positive definite, like the
+            # Cholesky-based solve for a single column
+            chol = np.linalg.cholesky(xdx)
+        except np.linalg.LinAlgError:
+            pa_cols = pa.T
+            a_cols = a.T if self.low_rank else [None] * m
+            return tuple(np.array(x) for x in zip(*map(self._fit_alternative_numpy, pa_cols, a_cols)))
+
+        z = np.linalg.solve(chol, xdy[:, :, np.newaxis])
+        beta = np.linalg.solve(np.swapaxes(chol, 1, 2), z)[:, :, 0]
+        residual_sq = self._ydy_alt - np.einsum('ij,ij->i', xdy, beta)
+        sigma_sq = residual_sq / self._dof_alt
+        chi_sq = self.n * np.log(self._residual_sq / residual_sq)  # division => precision
+        p_value = chi2.sf(chi_sq, 1)
+
+        return beta[:, 0], sigma_sq, chi_sq, p_value
+
     def _fit_alternative_numpy(self, pa, a):
         from scipy.linalg import solve, LinAlgError
         from scipy.stats.distributions import chi2
@@ -798,10 +890,10 @@ class LinearMixedModel(object):
         gamma = self.gamma
         dpa = self._d_alt * pa
 
-        # single thread => no need to copy
+        # blocks may be fit on several threads => copy
         ydy = self._ydy_alt
-        xdy = self._xdy_alt
-        xdx = self._xdx_alt
+        xdy = self._xdy_alt.copy()
+        xdx = self._xdx_alt.copy()
 
         if self.low_rank:
             xdy[0] = self.py @ dpa + gamma * (self.y @ a)
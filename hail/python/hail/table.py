@@ -1,5 +1,4 @@
 import itertools
-import pandas
 import pyspark
 from typing import *
 
@@ -72,20 +71,19 @@ class ExprContainer(object):
         self._dir = set(dir(self))
         super(ExprContainer, self).__init__()
 
-    def _set_field(self, key, value):
-        assert key not in self._fields_inverse, key
-        self._fields[key] = value
-        self._fields_inverse[value] = key
+    def _set_fields(self, *structs):
+        # field expressions are constructed on first access, see `LazyFields`
+        self._fields = ChainedFields(*(s._fields for s in structs))
+        self._fields_inverse = self._fields.inverse
 
         # key is in __dir for methods
         # key is in __dict__ for private class fields
-        if key in self._dir or key in self.__dict__:
-            if key not in ExprContainer._warned_about:
-                ExprContainer._warned_about.add(key)
-                warn(f"Name collision: field {repr(key)} already in object dict. "
-                     f"\n  This field must be referenced with __getitem__ syntax: obj[{repr(key)}]")
-        else:
-            self.__dict__[key] = value
+        # such keys resolve to those attributes rather than to the field
+        collisions = self._dir.union(self.__dict__).intersection(self._fields)
+        for key in sorted(collisions - ExprContainer._warned_about):
+            ExprContainer._warned_about.add(key)
+            warn(f"Name collision: field {repr(key)} already in object dict. "
+                 f"\n  This field must be referenced with __getitem__ syntax: obj[{repr(key)}]")
 
     def _get_field(self, item) -> Expression:
         if item in self._fields:
@@ -108,8 +106,13 @@ class ExprContainer(object):
     def __getattr__(self, item):
         if item in self.__dict__:
             return self.__dict__[item]
-        else:
-            raise AttributeError(get_nice_attr_error(self, item))
+        fields = self.__dict__.get('_fields')
+        if fields is not None and item in fields:
+            return fields[item]
+        raise AttributeError(get_nice_attr_error(self, item))
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()).union(self.__dict__.get('_fields', ())))
 
     def _copy_fields_from(self, other: 'ExprContainer'):
         self._fields = other._fields
@@ -350,9 +353,7 @@ class Table(ExprContainer):
         self._key = hail.struct(
             **{k: self._row[k] for k in self._type.row_key})
 
-        for k, v in itertools.chain(self._globals.items(),
-                                    self._row.items()):
-            self._set_field(k, v)
+        self._set_fields(self._globals, self._row)
 
     @property
     def _schema(self) -> ttable:
@@ -933,12 +934,11 @@ class Table(ExprContainer):
         :class:`.Table`
             Table without specified fields.
         """
-        all_field_exprs = {e: k for k, e in self._fields.items()}
         fields_to_drop = set()
         for e in exprs:
             if isinstance(e, Expression):
-                if e in all_field_exprs:
-                    fields_to_drop.add(all_field_exprs[e])
+                if e in self._fields_inverse:
+                    fields_to_drop.add(self._fields_inverse[e])
                 else:
                     raise ExpressionException("method 'drop' expects string field names or top-level field expressions"
                                               " (e.g. table['foo'])")
@@ -1146,6 +1146,40 @@ class Table(ExprContainer):
         else:
             return construct_expr(agg_ir, expr.dtype)
 
+    @typecheck_method(expr=expr_any)
+    def aggregate_async(self, expr):
+        """Start aggregating over rows, returning a future of the local value.
+
+        Examples
+        --------
+        Run two aggregations at once:
+
+        >>> n_male = table1.aggregate_async(hl.agg.count_where(table1.SEX == 'M'))
+        >>> mean_x = table1.aggregate_async(hl.agg.mean(table1.X))
+        >>> n_male.result(), mean_x.result()
+        (2, 6.5)
+
+        Notes
+        -----
+        Aggregations started with this method run concurrently, up to the
+        backend's ``max_concurrent_queries``. See :meth:`.aggregate`.
+
+        Parameters
+        ----------
+        expr : :class:`.Expression`
+            Aggregation expression.
+
+        Returns
+        -------
+        :class:`concurrent.futures.Future`
+            Future of the aggregated value dependent on `expr`.
+        """
+        expr = to_expr(expr)
+        base, _ = self._process_joins(expr)
+        analyze('Table.aggregate_async', expr, self._global_indices, {self._row_axis})
+
+        return Env.backend().execute_async(TableAggregate(base._tir, expr._ir))
+
     @typecheck_method(output=str,
                       overwrite=bool,
                       stage_locally=bool,
@@ -1856,17 +1890,54 @@ class Table(ExprContainer):
         :obj:`list` of :class:`.Struct`
             List of rows.
         """
-        if len(self.key) > 0:
-            t = self.order_by(*self.key)
-        else:
-            t = self
-        ir = GetField(TableCollect(t._tir), 'rows')
-        e = construct_expr(ir, hl.tarray(t.row.dtype))
+        # the rows of a keyed table are always sorted by key, so they are
+        # collected in key order without an explicit sort
+        ir = GetField(TableCollect(self._tir), 'rows')
+        e = construct_expr(ir, hl.tarray(self.row.dtype))
         if _localize:
             return Env.backend().execute(e._ir)
         else:
             return e
 
+    @typecheck_method(partitions_per_query=int)
+    def iter_rows(self, partitions_per_query=1):
+        """Iterate over the rows of the table, collecting a few partitions at a time.
+
+        Examples
+        --------
+
+        >>> for row in table1.iter_rows():  # doctest: +SKIP
+        ...     print(row.ID)
+
+        Notes
+        -----
+        Rows are produced in the same order as :meth:`.collect`, but only
+        `partitions_per_query` partitions are held in memory at once. Each
+        group of partitions is computed by a separate query, so tables whose
+        computation includes a shuffle (for instance :meth:`.key_by` on new
+        fields, or :meth:`.order_by`) should be persisted or checkpointed
+        first.
+
+        Parameters
+        ----------
+        partitions_per_query : :obj:`int`
+            Number of partitions collected by each query.
+
+        Returns
+        -------
+        iterator of :class:`.Struct`
+        """
+        if partitions_per_query < 1:
+            raise ValueError(f"'iter_rows': 'partitions_per_query' must be positive, found {partitions_per_query}")
+
+        def rows():
+            n_partitions = self.n_partitions()
+            for start in range(0, n_partitions, partitions_per_query):
+                parts = list(range(start, min(start + partitions_per_query, n_partitions)))
+                yield from self._filter_partitions(parts).collect()
+
+        return rows()
+
     def describe(self, handler=print, *, widget=False):
         """Print information about the fields in the table.
 
@@ -3212,7 +3283,7 @@ class Table(ExprContainer):
         return Env.spark_backend('to_pandas').to_pandas(self, flatten)
 
     @staticmethod
-    @typecheck(df=pandas.DataFrame,
+    @typecheck(df=imported_type('pandas', 'DataFrame'),
                key=oneof(str, sequenceof(str)))
     def from_pandas(df, key=[]) -> 'Table':
         """Create table from Pandas DataFrame
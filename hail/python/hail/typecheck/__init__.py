@@ -17,10 +17,12 @@ __all__ = ['TypeChecker',
            'numeric',
            'char',
            'lazy',
+           'imported_type',
            'enumeration',
            'identity',
            'transformed',
            'func_spec',
            'table_key_type',
            'TypecheckFailure',
+           'set_trusted_internal_calls',
            ]
@@ -1,5 +1,7 @@
 import re
+import sys
 import inspect
+import importlib
 import abc
 import collections
 from decorator import decorator
@@ -265,6 +267,31 @@ class LazyChecker(TypeChecker):
         return extract(self.t)
 
 
+class ImportedTypeChecker(TypeChecker):
+    """Like :class:`LiteralChecker`, for a class whose module is only imported
+    when the check first runs."""
+
+    def __init__(self, module, name):
+        self.module = module
+        self.name = name
+        self.t = None
+        super(ImportedTypeChecker, self).__init__()
+
+    def _type(self):
+        if self.t is None:
+            self.t = getattr(importlib.import_module(self.module), self.name)
+        return self.t
+
+    def check(self, x, caller, param):
+        if isinstance(x, self._type()):
+            return x
+        else:
+            raise TypecheckFailure
+
+    def expects(self):
+        return extract(self._type())
+
+
 class ExactlyTypeChecker(TypeChecker):
     def __init__(self, v, reference_equality=False):
         self.v = v
@@ -429,6 +456,10 @@ def lazy():
     return LazyChecker()
 
 
+def imported_type(module, name):
+    return ImportedTypeChecker(module, name)
+
+
 anytype = AnyChecker()
 
 numeric = oneof(int, float)
@@ -477,95 +508,141 @@ def check_meta(f, checks, is_method):
         f.__checked = True
 
 
-def check_all(f, args, kwargs, checks, is_method):
-    spec = get_signature(f)
-    check_meta(f, checks, is_method)
-    name = f.__name__
-    arg_list = list(args)
-
-    args_ = []
-    kwargs_ = {}
-
-    has_varargs = any(param.kind == param.VAR_POSITIONAL for param in spec.parameters.values())
-    n_pos_args = len(
-        list(filter(
-            lambda p: p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD),
-            spec.parameters.values())))
-    if not has_varargs and len(args) > n_pos_args:
-        raise TypeError(f"'{name}' takes {n_pos_args} positional arguments, found {len(args)}")
-
-    for i, (arg_name, param) in enumerate(spec.parameters.items()):
-        if i == 0 and is_method:
-            if not isinstance(arg_list[0], object):
-                raise RuntimeError("no class found as first argument. Did you mean to use 'typecheck' "
-                                   "instead of 'typecheck_method'?")
-            args_.append(args[i])
-            continue
-        checker = checks[arg_name]
-        assert isinstance(param, inspect.Parameter)
-        if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY):
+def _is_identity_checker(checker):
+    """Whether `checker` returns its argument unchanged whenever it accepts it."""
+    if isinstance(checker, MultipleTypeChecker):
+        return all(_is_identity_checker(c) for c in checker.checkers)
+    return isinstance(checker, (LiteralChecker, LazyChecker, ImportedTypeChecker,
+                                ExactlyTypeChecker, AnyChecker, AnyFuncChecker, CharChecker))
+
+
+class _CompiledChecks(object):
+    """Argument checker specialised to one decorated function.
+
+    Everything that depends only on the signature (parameter kinds, defaults,
+    the checker for each parameter) is computed once, so a call only has to
+    walk the arguments it was given.
+    """
+
+    __slots__ = ('name', 'is_method', 'positional', 'n_pos_args', 'varargs',
+                 'keyword_only', 'varkw', 'identity')
+
+    def __init__(self, f, checks, is_method):
+        spec = get_signature(f)
+        check_meta(f, checks, is_method)
+        self.name = f.__name__
+        self.is_method = is_method
+
+        params = list(spec.parameters.values())
+        if is_method:
+            params = params[1:]
+        self.positional = []
+        self.varargs = None
+        self.keyword_only = []
+        self.varkw = None
+        for param in params:
+            checker = checks[param.name]
+            if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+                self.positional.append((param.name, checker, param.default))
+            elif param.kind == param.VAR_POSITIONAL:
+                self.varargs = (param.name, checker)
+            elif param.kind == param.KEYWORD_ONLY:
+                self.keyword_only.append((param.name, checker, param.default))
+            else:
+                assert param.kind == param.VAR_KEYWORD
+                self.varkw = (param.name, checker)
+        self.n_pos_args = len(self.positional) + int(is_method)
+        self.identity = all(_is_identity_checker(c) for c in checks.values())
+
+    def _fail(self, arg_name, checker, arg, e):
+        raise TypeError(f"{self.name}: parameter '{arg_name}': "
+                        f"expected {checker.expects()}, found {checker.format(arg)}") from e
+
+    def __call__(self, args, kwargs):
+        name = self.name
+        n_args = len(args)
+        n_pos_args = self.n_pos_args
+        if self.varargs is None and n_args > n_pos_args:
+            raise TypeError(f"'{name}' takes {n_pos_args} positional arguments, found {n_args}")
+
+        if self.is_method:
+            args_ = [args[0]]
+            i = 1
+        else:
+            args_ = []
+            i = 0
+        for arg_name, checker, default in self.positional:
+            if i < n_args:
+                arg = args[i]
+            elif arg_name in kwargs:
+                arg = kwargs.pop(arg_name)
+            elif default is inspect.Parameter.empty:
+                raise TypeError(f'Expected {n_pos_args} positional arguments, '
+                                f'found {n_args}')
+            else:
+                arg = default
             try:
-                if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
-                    # must be positional
-                    if i < len(args):
-                        arg = args[i]
-                        args_.append(checker.check(arg, name, arg_name))
-                    # passed as keyword
-                    else:
-                        if arg_name in kwargs:
-                            arg = kwargs.pop(arg_name)
-                        else:
-                            if param.default is inspect._empty:
-                                raise TypeError(f'Expected {n_pos_args} positional arguments, '
-                                                f'found {len(args)}')
-                            arg = param.default
-                        args_.append(checker.check(arg, name, arg_name))
-                else:
-                    if arg_name in kwargs:
-                        arg = kwargs.pop(arg_name)
-                    else:
-                        if param.default is inspect._empty:
-                            raise TypeError(f"{name}() missing required keyword-only argument '{arg_name}'")
-                        arg = param.default
-                    kwargs_[arg_name] = checker.check(arg, name, arg_name)
+                args_.append(checker.check(arg, name, arg_name))
             except TypecheckFailure as e:
-                raise TypeError("{fname}: parameter '{argname}': "
-                                "expected {expected}, found {found}".format(
-                    fname=name,
-                    argname=arg_name,
-                    expected=checker.expects(),
-                    found=checker.format(arg)
-                )) from e
-        elif param.kind == param.VAR_POSITIONAL:
-            # consume the rest of the positional arguments
+                self._fail(arg_name, checker, arg, e)
+            i += 1
+
+        if self.varargs is not None:
+            arg_name, checker = self.varargs
             varargs = args[i:]
             for j, arg in enumerate(varargs):
                 try:
                     args_.append(checker.check(arg, name, arg_name))
                 except TypecheckFailure as e:
-                    raise TypeError("{fname}: parameter '*{argname}' (arg {idx} of {tot}): "
-                                    "expected {expected}, found {found}".format(
-                        fname=name,
-                        argname=arg_name,
-                        idx=j,
-                        tot=len(varargs),
-                        expected=checker.expects(),
-                        found=checker.format(arg)
-                    )) from e
-        else:
-            assert param.kind == param.VAR_KEYWORD
+                    raise TypeError(f"{name}: parameter '*{arg_name}' (arg {j} of {len(varargs)}): "
+                                    f"expected {checker.expects()}, found {checker.format(arg)}") from e
+
+        kwargs_ = {}
+        for arg_name, checker, default in self.keyword_only:
+            if arg_name in kwargs:
+                arg = kwargs.pop(arg_name)
+            elif default is inspect.Parameter.empty:
+                raise TypeError(f"{name}() missing required keyword-only argument '{arg_name}'")
+            else:
+                arg = default
+            try:
+                kwargs_[arg_name] = checker.check(arg, name, arg_name)
+            except TypecheckFailure as e:
+                self._fail(arg_name, checker, arg, e)
+
+        if self.varkw is not None:
+            arg_name, checker = self.varkw
             # kwargs now holds all variable kwargs
             for kwarg_name, arg in kwargs.items():
                 try:
                     kwargs_[kwarg_name] = checker.check(arg, name, arg_name)
                 except TypecheckFailure as e:
-                    raise TypeError("{fname}: keyword argument '{argname}': "
-                                    "expected {expected}, found {found}".format(
-                        fname=name,
-                        argname=kwarg_name,
-                        expected=checker.expects(),
-                        found=checker.format(arg))) from e
-    return args_, kwargs_
+                    raise TypeError(f"{name}: keyword argument '{kwarg_name}': "
+                                    f"expected {checker.expects()}, found {checker.format(arg)}") from e
+        return args_, kwargs_
+
+
+def check_all(f, args, kwargs, checks, is_method):
+    return _CompiledChecks(f, checks, is_method)(args, kwargs)
+
+
+_trusted_internal_calls = False
+
+
+def set_trusted_internal_calls(enabled):
+    """Skip argument checking on calls made from within the ``hail`` package.
+
+    Only functions whose checkers never transform their arguments are
+    affected; calls from user code are always checked, so the errors raised
+    by the public API are unchanged.
+    """
+    global _trusted_internal_calls
+    _trusted_internal_calls = bool(enabled)
+
+
+def _called_from_hail(depth):
+    module = sys._getframe(depth + 1).f_globals.get('__name__', '')
+    return module == 'hail' or module.startswith('hail.')
 
 
 def typecheck_method(**checkers):
@@ -579,9 +656,21 @@ def typecheck(**checkers):
 def _make_dec(checkers, is_method):
     checkers = {k: only(v) for k, v in checkers.items()}
 
-    @decorator
-    def wrapper(__original_func, *args, **kwargs):
-        args_, kwargs_ = check_all(__original_func, args, kwargs, checkers, is_method=is_method)
-        return __original_func(*args_, **kwargs_)
+    def dec(f):
+        # compiled on first call, so that an invalid signature is reported
+        # when the function is used rather than when it is defined
+        compiled = None
+
+        def wrapper(__original_func, *args, **kwargs):
+            nonlocal compiled
+            if compiled is None:
+                compiled = _CompiledChecks(__original_func, checkers, is_method)
+            # frames: this wrapper, the signature-preserving shim from `decorator`, the caller
+            if _trusted_internal_calls and compiled.identity and _called_from_hail(2):
+                return __original_func(*args, **kwargs)
+            args_, kwargs_ = compiled(args, kwargs)
+            return __original_func(*args_, **kwargs_)
+
+        return decorator(wrapper, f)
 
-    return wrapper
+    return dec
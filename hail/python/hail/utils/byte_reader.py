@@ -0,0 +1,63 @@
+import struct
+
+_int32 = struct.Struct('<i')
+_int64 = struct.Struct('<q')
+_float32 = struct.Struct('<f')
+_float64 = struct.Struct('<d')
+
+
+class ByteReader(object):
+    """Sequential reader over a buffer written by the JVM `StreamOutputBuffer`.
+
+    All multi-byte values are little-endian, matching the native byte order
+    used by the encoder.
+    """
+
+    __slots__ = ('_buf', '_offset')
+
+    def __init__(self, byte_memview, offset=0):
+        self._buf = byte_memview
+        self._offset = offset
+
+    def read_int32(self):
+        v = _int32.unpack_from(self._buf, self._offset)[0]
+        self._offset += 4
+        return v
+
+    def read_int64(self):
+        v = _int64.unpack_from(self._buf, self._offset)[0]
+        self._offset += 8
+        return v
+
+    def read_float32(self):
+        v = _float32.unpack_from(self._buf, self._offset)[0]
+        self._offset += 4
+        return v
+
+    def read_float64(self):
+        v = _float64.unpack_from(self._buf, self._offset)[0]
+        self._offset += 8
+        return v
+
+    def read_bool(self):
+        v = self._buf[self._offset] != 0
+        self._offset += 1
+        return v
+
+    def read_bytes_view(self, n):
+        v = self._buf[self._offset:self._offset + n]
+        self._offset += n
+        return v
+
+    def read_bytes(self, n):
+        return self.read_bytes_view(n).tobytes()
+
+    def read_missing_bits(self, n):
+        """Read the packed missing bits for `n` optional values.
+
+        Returns a list of booleans, ``True`` where the value is missing.
+        """
+        n_bytes = (n + 7) >> 3
+        bits = self._buf[self._offset:self._offset + n_bytes]
+        self._offset += n_bytes
+        return [(bits[i >> 3] >> (i & 7)) & 1 == 1 for i in range(n)]
@@ -0,0 +1,49 @@
+import struct
+
+_int32 = struct.Struct('<i')
+_int64 = struct.Struct('<q')
+_float32 = struct.Struct('<f')
+_float64 = struct.Struct('<d')
+
+
+class ByteWriter(object):
+    """Sequential writer producing a buffer readable by the JVM `StreamInputBuffer`.
+
+    The inverse of :class:`.ByteReader`; all multi-byte values are
+    little-endian.
+    """
+
+    __slots__ = ('_buf',)
+
+    def __init__(self):
+        self._buf = bytearray()
+
+    def write_int32(self, v):
+        self._buf += _int32.pack(v)
+
+    def write_int64(self, v):
+        self._buf += _int64.pack(v)
+
+    def write_float32(self, v):
+        self._buf += _float32.pack(v)
+
+    def write_float64(self, v):
+        self._buf += _float64.pack(v)
+
+    def write_bool(self, v):
+        self._buf.append(1 if v else 0)
+
+    def write_bytes(self, b):
+        self._buf += b
+
+    def write_missing_bits(self, missing):
+        """Write the packed missing bits for a sequence of booleans, ``True``
+        where the value is missing."""
+        bits = bytearray((len(missing) + 7) >> 3)
+        for i, m in enumerate(missing):
+            if m:
+                bits[i >> 3] |= 1 << (i & 7)
+        self._buf += bits
+
+    def to_bytes(self):
+        return bytes(self._buf)
@@ -35,6 +35,8 @@ class Interval(object):
      - :func:`.parse_locus_interval`
     """
 
+    __slots__ = ['_point_type', '_start', '_end', '_includes_start', '_includes_end']
+
     @typecheck_method(start=anytype,
                       end=anytype,
                       includes_start=bool,
@@ -55,6 +57,17 @@ class Interval(object):
         self._includes_start = includes_start
         self._includes_end = includes_end
 
+    @classmethod
+    def _from_fields(cls, start, end, includes_start, includes_end, point_type):
+        # fast path for decoding, skips type imputation
+        i = Interval.__new__(cls)
+        i._point_type = point_type
+        i._start = start
+        i._end = end
+        i._includes_start = includes_start
+        i._includes_end = includes_end
+        return i
+
     def __str__(self):
         if isinstance(self._start, hl.genetics.Locus) and self._start.contig == self._end.contig:
             bounds = f'{self._start}-{self._end.position}'
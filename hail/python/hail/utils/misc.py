@@ -1,9 +1,13 @@
 import atexit
 import datetime
 import difflib
+import importlib.util
+import itertools
 import shutil
+import sys
 import tempfile
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, ChainMap
+from collections.abc import Mapping
 from random import Random
 import json
 import re
@@ -18,6 +22,20 @@ from hail.typecheck import enumeration, typecheck, nullable
 from hail.utils.java import Env, joption, error
 
 
+def lazy_import(name):
+    """Return module `name`, deferring its execution until an attribute is
+    first accessed."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
 @typecheck(n_rows=int, n_cols=int, n_partitions=nullable(int))
 def range_matrix_table(n_rows, n_cols, n_partitions=None) -> 'hail.MatrixTable':
     """Construct a matrix table with row and column indices and no entry fields.
@@ -307,6 +325,69 @@ def get_nice_field_error(obj, item):
         s.append("\n    Hint: use 'describe()' to show the names of all data fields.")
     return ''.join(s)
 
+
+class LazyFields(Mapping):
+    """Mapping from field name to field expression, constructing each
+    expression on first access.
+
+    `names` supports membership tests, iteration and :func:`len`;
+    ``make(name)`` constructs the expression for `name`. Constructed
+    expressions are recorded in `inverse`, mapping them back to their names.
+    """
+
+    __slots__ = ('_names', '_make', '_values', 'inverse')
+
+    def __init__(self, names, make):
+        self._names = names
+        self._make = make
+        self._values = {}
+        self.inverse = {}
+
+    def __getitem__(self, name):
+        value = self._values.get(name)
+        if value is None:
+            if name not in self._names:
+                raise KeyError(name)
+            value = self._make(name)
+            self._values[name] = value
+            self.inverse[value] = name
+        return value
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+
+class ChainedFields(Mapping):
+    """Fields of several :class:`.LazyFields` with disjoint names, in order."""
+
+    __slots__ = ('_maps', 'inverse')
+
+    def __init__(self, *maps):
+        self._maps = maps
+        self.inverse = ChainMap(*(m.inverse for m in maps))
+
+    def __getitem__(self, name):
+        for m in self._maps:
+            if name in m:
+                return m[name]
+        raise KeyError(name)
+
+    def __contains__(self, name):
+        return any(name in m for m in self._maps)
+
+    def __iter__(self):
+        return itertools.chain(*self._maps)
+
+    def __len__(self):
+        return sum(len(m) for m in self._maps)
+
+
 def check_collisions(caller, names, indices, override_protected_indices=None):
     from hail.expr.expressions import ExpressionException
     fields = indices.source._fields
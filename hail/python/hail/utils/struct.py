@@ -3,6 +3,7 @@ from collections.abc import Mapping
 
 from hail.utils.misc import get_nice_attr_error, get_nice_field_error
 from hail.typecheck import *
+from hail.typecheck.check import extract
 
 
 class Struct(Mapping):
@@ -42,33 +43,65 @@ class Struct(Mapping):
     constructed using the :func:`.struct` function.
     """
 
+    # Field values are stored in a tuple, positioned by `_field_index`. Structs
+    # decoded from query results share the index of their type, so each row
+    # costs one small object plus one tuple.
+    __slots__ = ['_field_index', '_values']
+
     def __init__(self, **kwargs):
-        self._fields = kwargs
-        for k, v in kwargs.items():
-            if not k in self.__dict__:
-                self.__dict__[k] = v
+        self._field_index = {k: i for i, k in enumerate(kwargs)}
+        self._values = tuple(kwargs.values())
+
+    @classmethod
+    def _from_values(cls, field_index, values):
+        # fast path for decoding, `field_index` must not be mutated afterwards
+        s = Struct.__new__(cls)
+        s._field_index = field_index
+        s._values = values
+        return s
+
+    @property
+    def _fields(self):
+        return dict(zip(self._field_index, self._values))
 
     def __contains__(self, item):
-        return item in self._fields
+        return item in self._field_index
 
     def _get_field(self, item):
-        if item in self._fields:
-            return self._fields[item]
+        if item in self._field_index:
+            return self._values[self._field_index[item]]
         else:
             raise KeyError(get_nice_field_error(self, item))
 
-    @typecheck_method(item=str)
     def __getitem__(self, item):
-        return self._get_field(item)
+        try:
+            return self._values[self._field_index[item]]
+        except (KeyError, TypeError):
+            if not isinstance(item, str):
+                raise TypeError(f"__getitem__: parameter 'item': "
+                                f"expected str, found {extract(type(item))}: {item}") from None
+            raise KeyError(get_nice_field_error(self, item)) from None
+
+    def __getattribute__(self, item):
+        # fields take priority over methods, such as `values` or `keys`
+        if not item.startswith('_'):
+            i = object.__getattribute__(self, '_field_index').get(item)
+            if i is not None:
+                return object.__getattribute__(self, '_values')[i]
+        return object.__getattribute__(self, item)
 
     def __getattr__(self, item):
-        if item in self.__dict__:
-            return self.__dict__[item]
-        else:
-            raise AttributeError(get_nice_attr_error(self, item))
+        if item not in ('_field_index', '_values'):
+            i = self._field_index.get(item)
+            if i is not None:
+                return self._values[i]
+        raise AttributeError(get_nice_attr_error(self, item))
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()).union(self._field_index))
 
     def __len__(self):
-        return len(self._fields)
+        return len(self._values)
 
     def __repr__(self):
         return str(self)
@@ -77,13 +110,17 @@ class Struct(Mapping):
         return 'Struct({})'.format(', '.join('{}={}'.format(k, repr(v)) for k, v in self._fields.items()))
 
     def __eq__(self, other):
-        return isinstance(other, Struct) and self._fields == other._fields
+        if not isinstance(other, Struct):
+            return False
+        if self._field_index is other._field_index:
+            return self._values == other._values
+        return self._fields == other._fields
 
     def __hash__(self):
         return 37 + hash(tuple(sorted(self._fields.items())))
 
     def __iter__(self):
-        return iter(self._fields)
+        return iter(self._field_index)
 
     def annotate(self, **kwargs):
         """Add new fields or recompute existing fields.
@@ -104,7 +141,7 @@ class Struct(Mapping):
         :class:`.Struct`
             Struct with new or updated fields.
         """
-        d = OrderedDict(self.items())
+        d = OrderedDict(self._fields)
         for k, v in kwargs.items():
             d[k] = v
         return Struct(**d)
@@ -156,13 +193,13 @@ class Struct(Mapping):
         :class:`.Struct`
             Struct without certain fields.
         """
-        d = OrderedDict((k, v) for k, v in self.items() if not k in args)
+        d = OrderedDict((k, v) for k, v in self._fields.items() if not k in args)
         return Struct(**d)
 
 
 @typecheck(struct=Struct)
 def to_dict(struct):
-    return dict(struct.items())
+    return struct._fields
 
 
 import pprint
@@ -15,6 +15,9 @@ from .globals import tasks, complete_states
 
 log = logging.getLogger('batch_client.aioclient')
 
+# records per page of batches or jobs, the most the server returns
+PAGE_SIZE = 1000
+
 
 def filter_params(complete, success, attributes):
     params = None
@@ -325,21 +328,47 @@ class Batch:
     async def cancel(self):
         await self._client._patch(f'/api/v1alpha/batches/{self.id}/cancel')
 
+    async def jobs(self, state=None):
+        """Iterate over the statuses of the batch's jobs, in job ID order,
+        fetching them a page at a time.
+
+        `state` is a list of job states to keep, for instance
+        ``['Failed', 'Error']``.
+        """
+        # the limit asks for pages rather than every job
+        params = {'limit': PAGE_SIZE}
+        if state is not None:
+            params['state'] = ','.join(state)
+        while True:
+            resp = await self._client._get(f'/api/v1alpha/batches/{self.id}/jobs', params=params)
+            body = await resp.json()
+            for job in body['jobs']:
+                yield job
+            last_job_id = body.get('last_job_id')
+            if last_job_id is None:
+                break
+            params['last_job_id'] = last_job_id
+
     async def status(self, include_jobs=True):
         resp = await self._client._get(f'/api/v1alpha/batches/{self.id}')
         batch = await resp.json()
         if include_jobs:
-            resp = await self._client._get(f'/api/v1alpha/batches/{self.id}/jobs')
-            jobs = await resp.json()
-            batch['jobs'] = jobs
+            batch['jobs'] = [job async for job in self.jobs()]
         return batch
 
-    async def wait(self):
+    async def wait(self, include_jobs=False):
+        """Wait for the batch to complete and return its status.
+
+        The status only has the ``jobs`` of the batch if `include_jobs` is
+        true; by default, it does not, and :meth:`jobs` iterates over them.
+        """
         i = 0
         while True:
             status = await self.status(include_jobs=False)
             if status['complete']:
-                return await self.status()
+                if include_jobs:
+                    status['jobs'] = [job async for job in self.jobs()]
+                return status
             j = random.randrange(math.floor(1.1 ** i))
             await asyncio.sleep(0.100 * j)
             # max 44.5s
@@ -548,13 +577,20 @@ class BatchClient:
             self.url + path, headers=self._headers)
 
     async def list_batches(self, complete=None, success=None, attributes=None):
-        params = filter_params(complete, success, attributes)
-        batches_resp = await self._get('/api/v1alpha/batches', params=params)
-        batches = await batches_resp.json()
-        return [Batch(self,
-                      b['id'],
-                      attributes=b.get('attributes'))
-                for b in batches]
+        params = filter_params(complete, success, attributes) or {}
+        params['limit'] = PAGE_SIZE
+        batches = []
+        while True:
+            batches_resp = await self._get('/api/v1alpha/batches', params=params)
+            body = await batches_resp.json()
+            batches.extend(Batch(self,
+                                 b['id'],
+                                 attributes=b.get('attributes'))
+                           for b in body['batches'])
+            last_batch_id = body.get('last_batch_id')
+            if last_batch_id is None:
+                return batches
+            params['last_batch_id'] = last_batch_id
 
     async def get_job(self, batch_id, job_id):
         b = await self.get_batch(batch_id)
@@ -7,6 +7,24 @@ def async_to_blocking(coro):
     return asyncio.get_event_loop().run_until_complete(coro)
 
 
+def async_iter_to_blocking(it):
+    """Iterate over the asynchronous iterator `it`, blocking for each
+    element."""
+    it = it.__aiter__()
+
+    async def anext():
+        try:
+            return False, await it.__anext__()
+        except StopAsyncIteration:
+            return True, None
+
+    while True:
+        done, x = async_to_blocking(anext())
+        if done:
+            return
+        yield x
+
+
 class Job:
     @staticmethod
     def _get_error(job_status, task):
@@ -103,11 +121,14 @@ class Batch:
     def cancel(self):
         async_to_blocking(self._async_batch.cancel())
 
+    def jobs(self, state=None):
+        return async_iter_to_blocking(self._async_batch.jobs(state=state))
+
     def status(self, include_jobs=True):
         return async_to_blocking(self._async_batch.status(include_jobs=include_jobs))
 
-    def wait(self):
-        return async_to_blocking(self._async_batch.wait())
+    def wait(self, include_jobs=False):
+        return async_to_blocking(self._async_batch.wait(include_jobs=include_jobs))
 
     def delete(self):
         async_to_blocking(self._async_batch.delete())
@@ -12,4 +12,4 @@ def main(args, pass_through_args, client):  # pylint: disable=unused-argument
         exit(1)
 
     batch = maybe_batch
-    print(batch.wait())
+    print(batch.wait(include_jobs=True))
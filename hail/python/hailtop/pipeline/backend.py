@@ -340,7 +340,7 @@ class BatchBackend(Backend):
             print('Pipeline completed successfully!')
             return
 
-        failed_jobs = [(j, Job.exit_code(j)) for j in status['jobs']]
+        failed_jobs = [(j, Job.exit_code(j)) for j in batch.jobs()]
         failed_jobs = [((j['batch_id'], j['job_id']), Job._get_exit_codes(j)) for j, ec in failed_jobs if ec != 0]
 
         fail_msg = ''
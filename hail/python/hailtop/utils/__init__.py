@@ -1,5 +1,5 @@
 from .utils import unzip, async_to_blocking, blocking_to_async, AsyncWorkerPool, \
-    bounded_gather, grouped, sleep_and_backoff, is_transient_error, \
+    bounded_gather, grouped, sleep_and_backoff, sync_sleep_and_backoff, is_transient_error, \
     request_retry_transient_errors, request_raise_transient_errors
 from .process import CalledProcessError, check_shell, check_shell_output
 
@@ -15,6 +15,7 @@ __all__ = [
     'grouped',
     'is_transient_error',
     'sleep_and_backoff',
+    'sync_sleep_and_backoff',
     'request_retry_transient_errors',
     'request_raise_transient_errors'
 ]
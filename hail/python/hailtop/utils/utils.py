@@ -2,8 +2,10 @@ import errno
 import random
 import logging
 import asyncio
+import time
 import aiohttp
 from aiohttp import web
+import requests
 
 log = logging.getLogger('hailtop.utils')
 
@@ -162,6 +164,16 @@ def is_transient_error(e):
         return True
     elif isinstance(e, asyncio.TimeoutError):
         return True
+    elif isinstance(e, requests.exceptions.HTTPError):
+        # requests raises these from Response.raise_for_status
+        if e.response is not None and e.response.status_code in (408, 502, 503, 504):
+            return True
+    elif isinstance(e, requests.exceptions.SSLError):
+        return False
+    elif isinstance(e, requests.exceptions.ConnectionError):
+        # refused, reset or timed out connections, and servers that
+        # disconnected without a response
+        return True
     elif isinstance(e, OSError):
         if (e.errno == errno.ETIMEDOUT or
                 e.errno == errno.ECONNREFUSED or
@@ -177,6 +189,13 @@ async def sleep_and_backoff(delay):
     return min(delay * 2, 60.0)
 
 
+def sync_sleep_and_backoff(delay):
+    # exponentially back off, up to (expected) max of 30s
+    t = delay * random.random()
+    time.sleep(t)
+    return min(delay * 2, 60.0)
+
+
 async def request_retry_transient_errors(session, method, url, **kwargs):
     delay = 0.1
     while True:
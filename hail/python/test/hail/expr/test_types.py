@@ -139,3 +139,72 @@ class Tests(unittest.TestCase):
         for types, rgs in types_and_rgs:
             for t in types:
                 self.assertEqual(t.get_context().references, rgs)
+
+    def test_from_encoding(self):
+        import struct
+
+        def s(x):
+            b = x.encode('utf-8')
+            return struct.pack('<i', len(b)) + b
+
+        # each result is a one-field tuple: a missing byte, then the value
+        cases = [
+            (tint32, b'\x00' + struct.pack('<i', -5), -5),
+            (tint64, b'\x00' + struct.pack('<q', 1 << 40), 1 << 40),
+            (tfloat64, b'\x00' + struct.pack('<d', 0.5), 0.5),
+            (tbool, b'\x00\x01', True),
+            (tstr, b'\x00' + s('foo'), 'foo'),
+            (tint32, b'\x01', None),
+            (tarray(tint32), b'\x00' + struct.pack('<iB', 3, 0b010) + struct.pack('<ii', 1, 3), [1, None, 3]),
+            (tarray(tstr), b'\x00' + struct.pack('<iB', 2, 0) + s('a') + s('bc'), ['a', 'bc']),
+            (tset(tfloat64), b'\x00' + struct.pack('<iB', 1, 0) + struct.pack('<d', 1.5), {1.5}),
+            (tdict(tstr, tint32), b'\x00' + struct.pack('<i', 2) + b'\x00' + s('a') + struct.pack('<i', 1)
+             + b'\x02' + s('b'), {'a': 1, 'b': None}),
+            (tstruct(a=tint32, b=tstr), b'\x00\x01' + s('x'), hl.Struct(a=None, b='x')),
+            (ttuple(tbool, tint64), b'\x00\x00' + b'\x00' + struct.pack('<q', 7), (False, 7)),
+            (tinterval(tint32), b'\x00\x00' + struct.pack('<ii', 1, 5) + b'\x01\x00', hl.Interval(1, 5, True, False)),
+        ]
+        for t, encoding, expected in cases:
+            self.assertEqual(t._from_encoding(encoding), expected)
+            self.assertEqual(t._to_encoding(expected), encoding)
+
+    def test_encoding_roundtrip(self):
+        cases = [
+            (tarray(tfloat32), [0.5, None, -2.0]),
+            (tarray(tint64), list(range(1000))),
+            (tset(tstr), {'a', None, 'b'}),
+            (tdict(tint32, tarray(tcall)), {1: [hl.Call([0, 1], phased=True), None], None: []}),
+            (tstruct(x=tlocus('GRCh37'), y=tinterval(tlocus('GRCh37'))),
+             hl.Struct(x=hl.Locus('1', 100), y=hl.Interval(hl.Locus('1', 1), hl.Locus('1', 5), includes_end=True))),
+            (ttuple(tstr, tbool), None),
+        ]
+        for t, value in cases:
+            self.assertEqual(t._from_encoding(t._to_encoding(value)), value)
+
+    def test_encoded_results_match_json(self):
+        values = [
+            hl.literal([1, None, 3], hl.tarray(hl.tint32)),
+            hl.literal({'a': [1.5, None], 'b': None}, hl.tdict(hl.tstr, hl.tarray(hl.tfloat64))),
+            hl.struct(x=hl.locus('1', 100), y=hl.call(0, 1, phased=True), z=hl.null(hl.tstr)),
+            hl.interval(hl.locus('1', 100), hl.locus('1', 200)),
+            hl.set({hl.tuple([1, 'a']), hl.tuple([2, hl.null(hl.tstr)])}),
+            hl.range(0, 1000).map(lambda i: hl.struct(i=i, f=hl.float32(i / 3), s=hl.str(i)))
+        ]
+        backend = hl.current_backend()
+        for v in values:
+            ir = v._ir
+            self.assertEqual(backend._execute_encoded(ir)[0], backend._execute_json(ir)[0])
+
+    def test_dtype_interning(self):
+        for t in self.types_to_test():
+            s = str(t)
+            self.assertIs(dtype(s), dtype(s))
+        self.assertIs(dtype('array<int32>'), dtype('array<int>'))
+        self.assertIs(dtype('struct{a: int32}'), dtype('tstruct{ a : tint }'))
+
+    def test_cached_strings(self):
+        t = tstruct(a=tarray(tint32), b=tdict(tstr, tlocus('GRCh37')))
+        self.assertEqual(str(t), 'struct{a: array<int32>, b: dict<str, locus<GRCh37>>}')
+        self.assertIs(str(t), str(t))
+        self.assertEqual(t._parsable_string(), 'Struct{a:Array[Int32],b:Dict[String,Locus(GRCh37)]}')
+        self.assertEqual(hash(t), hash(tstruct(a=tarray(tint32), b=tdict(tstr, tlocus('GRCh37')))))
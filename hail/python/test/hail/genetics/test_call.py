@@ -94,3 +94,33 @@ class Tests(unittest.TestCase):
                                "Calls with greater than 2 alleles are not supported.",
                                Call,
                                [1, 1, 1, 1])
+
+    def test_unphased_diploid_is_unordered(self):
+        c = Call([1, 0])
+        self.assertEqual(c.alleles, [0, 1])
+        self.assertEqual(c, Call([0, 1]))
+        self.assertEqual(hash(c), hash(Call([0, 1])))
+        self.assertNotEqual(Call([1, 0], phased=True), Call([0, 1], phased=True))
+
+    def test_str_parse_roundtrip(self):
+        calls = [Call([]), Call([], phased=True), Call([3]), Call([3], phased=True),
+                 Call([0, 1]), Call([2, 1], phased=True), Call([5, 5])]
+        for c in calls:
+            self.assertEqual(Call._parse(str(c)), c)
+        self.assertEqual([str(c) for c in calls], ['-', '|-', '3', '|3', '0/1', '2|1', '5/5'])
+
+    def test_jvm_encoding(self):
+        calls = [Call([]), Call([], phased=True), Call([3]), Call([3], phased=True),
+                 Call([0, 1]), Call([2, 1], phased=True), Call([1, 2], phased=True), Call([5, 5]),
+                 Call([1000, 30000])]
+        for c in calls:
+            self.assertEqual(Call._from_java(c._to_java()), c)
+            self.assertEqual(hl.eval(hl.literal(c)), c)
+
+        # Scala Call2(0, 1, phased=false): ploidy 2, allele repr 1
+        self.assertEqual(Call([0, 1])._to_java(), (1 << 3) | (2 << 1))
+        self.assertEqual(Call._from_java((1 << 3) | (2 << 1) | 1), Call([0, 1], phased=True))
+
+    def test_invalid_alleles(self):
+        self.assertRaises(hl.utils.FatalError, lambda: Call([-1, 0]))
+        self.assertRaises(hl.utils.FatalError, lambda: Call([1 << 29]))
@@ -162,6 +162,21 @@ class Tests(unittest.TestCase):
 
         self._assert_eq(bm.to_numpy(_force_blocking=True), a)
 
+    def test_from_numpy_memmap(self):
+        a = np.random.rand(10, 11)
+        path = new_local_temp_dir() + '/a'
+        m = np.memmap(path, dtype=np.float64, mode='w+', shape=a.shape)
+        m[:] = a
+
+        self._assert_eq(BlockMatrix.from_numpy(m, block_size=4), a)
+        self._assert_eq(BlockMatrix.from_numpy(m[2:, 3:]), a[2:, 3:])
+        self._assert_eq(BlockMatrix.from_numpy(m.T), a.T)
+
+        a1 = BlockMatrix.from_numpy(m).to_numpy()
+        assert type(a1) is np.ndarray
+        a1[0, 0] = -1.0
+        self._assert_eq(m, a)
+
     def test_to_table(self):
         schema = hl.tstruct(row_idx=hl.tint64, entries=hl.tarray(hl.tfloat64))
         rows = [{'row_idx': 0, 'entries': [0.0, 1.0]},
@@ -763,6 +778,18 @@ class Tests(unittest.TestCase):
         self._assert_eq(expected, BlockMatrix.rectangles_to_numpy(rect_path))
         self._assert_eq(expected, BlockMatrix.rectangles_to_numpy(rect_bytes_path, binary=True))
 
+    def test_iter_rectangles(self):
+        nd = np.arange(12.0).reshape(3, 4)
+        rects = [[0, 3, 0, 1], [1, 2, 0, 2], [0, 3, 3, 4]]
+
+        for binary in [False, True]:
+            rect_path = new_local_temp_dir()
+            BlockMatrix.from_numpy(nd).export_rectangles(local_path_uri(rect_path), rects, binary=binary)
+            actual = list(BlockMatrix.iter_rectangles(rect_path, binary=binary))
+            assert [bounds for bounds, _ in actual] == [tuple(r) for r in rects]
+            for (r0, r1, c0, c1), rect in actual:
+                self._assert_eq(rect, nd[r0:r1, c0:c1])
+
     def test_block_matrix_entries(self):
         n_rows, n_cols = 5, 3
         rows = [{'i': i, 'j': j, 'entry': float(i + j)} for i in range(n_rows) for j in range(n_cols)]
@@ -817,6 +844,40 @@ class Tests(unittest.TestCase):
         self.assertRaises(ValueError, lambda: hl.linalg.utils.array_windows(np.array([]), -1))
         self.assertRaises(ValueError, lambda: hl.linalg.utils.array_windows(np.array(['str']), 1))
 
+    def test_array_windows_matches_loop(self):
+        def loop_windows(a, radius):
+            # the two-pointer loop array_windows used before searchsorted
+            size = a.size
+            starts, stops = np.zeros(size, dtype=np.int64), np.zeros(size, dtype=np.int64)
+            j, k = 0, 0
+            for i in range(size):
+                min_val = a[i] - radius
+                while j < size and a[j] < min_val:
+                    j += 1
+                starts[i] = j
+
+                max_val = a[i] + radius
+                while k < size and a[k] <= max_val:
+                    k += 1
+                stops[i] = k
+            return starts, stops
+
+        rng = np.random.RandomState(0)
+        arrays = [np.array([], dtype=np.int64),
+                  np.array([5]),
+                  np.array([3, 3, 3, 3]),
+                  np.sort(rng.randint(0, 20, size=100)),
+                  np.sort(rng.uniform(-10, 10, size=100)),
+                  np.sort(rng.choice([0.0, 0.5, 1.0, 2.5], size=50))]
+        for a in arrays:
+            for radius in [0, 0.5, 1, 3, 100]:
+                starts, stops = hl.linalg.utils.array_windows(a, radius)
+                expected_starts, expected_stops = loop_windows(a, radius)
+                self.assertTrue(np.array_equal(starts, expected_starts))
+                self.assertTrue(np.array_equal(stops, expected_stops))
+                self.assertEqual(starts.dtype, np.int64)
+                self.assertEqual(stops.dtype, np.int64)
+
     def test_locus_windows(self):
         def assert_eq(a, b):
             self.assertTrue(np.array_equal(a, np.array(b)))
@@ -896,6 +957,41 @@ class Tests(unittest.TestCase):
             hl.linalg.utils.locus_windows(ht.locus, 1.0, coord_expr=ht.cm)
         self.assertTrue("missing value for 'coord_expr'" in str(cm.exception))
 
+        rows = [{'locus': hl.Locus('1', 1), 'cm': 1.0},
+                {'locus': hl.Locus('1', 1), 'cm': 1.0},
+                {'locus': hl.Locus('1', 2), 'cm': 2.0},
+                {'locus': hl.Locus('2', 1), 'cm': 1.0},
+                {'locus': hl.Locus('2', 3), 'cm': 1.5},
+                {'locus': hl.Locus('X', 1), 'cm': 0.5}]
+        ht = hl.Table.parallelize(rows,
+                                  hl.tstruct(locus=hl.tlocus('GRCh37'), cm=hl.tfloat64),
+                                  key=['locus'])
+
+        starts, stops = hl.linalg.utils.locus_windows(ht.locus, 0)
+        assert_eq(starts, [0, 0, 2, 3, 4, 5])
+        assert_eq(stops, [2, 2, 3, 4, 5, 6])
+
+        starts, stops = hl.linalg.utils.locus_windows(ht.locus, 0.0, coord_expr=ht.cm)
+        assert_eq(starts, [0, 0, 2, 3, 4, 5])
+        assert_eq(stops, [2, 2, 3, 4, 5, 6])
+
+        starts, stops = hl.linalg.utils.locus_windows(ht.locus, 1.0, coord_expr=ht.cm)
+        assert_eq(starts, [0, 0, 0, 3, 3, 5])
+        assert_eq(stops, [3, 3, 3, 5, 5, 6])
+
+        # the localized and unlocalized windows agree
+        starts, stops = hl.eval(hl.linalg.utils.locus_windows(ht.locus, 1.0, coord_expr=ht.cm, _localize=False))
+        assert_eq(starts, [0, 0, 0, 3, 3, 5])
+        assert_eq(stops, [3, 3, 3, 5, 5, 6])
+
+        with self.assertRaises(FatalError) as cm:
+            hl.linalg.utils.locus_windows(ht.locus, 1.0, coord_expr=-ht.cm)
+        self.assertTrue("'coord_expr' must be in ascending order within each contig" in str(cm.exception))
+
+        with self.assertRaises(FatalError) as cm:
+            hl.linalg.utils.locus_windows(ht.filter(False).locus, 1.0)
+        self.assertTrue("has length 0" in str(cm.exception))
+
     def test_write_overwrite(self):
         path = new_temp_file()
 
@@ -265,6 +265,59 @@ class Tests(unittest.TestCase):
         self.assertAlmostEqual(stats.beta, beta1[0])
         self.assertAlmostEqual(stats.chi_sq, chi_sq)
 
+    def test_fit_alternatives_numpy_blocks(self):
+        np.random.seed(0)
+        n, f, m = 50, 2, 25
+        x = np.hstack([np.ones((n, 1)), np.random.randn(n, f - 1)])
+        y = np.random.randn(n)
+        z = np.random.randn(n, n)
+        s, u = np.linalg.eigh(z @ z.T / n)
+        for r in [n, 30]:
+            p = u[:, -r:].T
+            if r == n:
+                model = LinearMixedModel(p @ y, p @ x, s[-r:])
+            else:
+                model = LinearMixedModel(p @ y, p @ x, s[-r:], y, x)
+            model.fit(log_gamma=0.0)
+
+            for singular in [False, True]:
+                a = np.random.randn(n, m)
+                if singular:
+                    a[:, 7] = 0.0
+                a_arg = a if model.low_rank else None
+                pa = p @ a
+
+                expected = np.array([model._fit_alternative_numpy(pa[:, i], None if a_arg is None else a[:, i])
+                                     for i in range(m)])
+
+                # count the columns fit one at a time, after a block fails
+                n_single_fits = [0]
+
+                def fit_alternative_numpy(pa_col, a_col):
+                    n_single_fits[0] += 1
+                    return LinearMixedModel._fit_alternative_numpy(model, pa_col, a_col)
+                model._fit_alternative_numpy = fit_alternative_numpy
+
+                for block_size, n_threads in [(1, 1), (4, 1), (10, 3), (100, 2)]:
+                    n_single_fits[0] = 0
+                    res = model.fit_alternatives_numpy(pa, a_arg, return_pandas=True,
+                                                       block_size=block_size, n_threads=n_threads)
+                    assert list(res['idx']) == list(range(m))
+                    assert np.allclose(res[['beta', 'sigma_sq', 'chi_sq', 'p_value']].values, expected,
+                                       rtol=1e-10, equal_nan=True)
+                    if singular:
+                        assert np.isnan(res['beta'][7])
+                        assert n_single_fits[0] == min(block_size, m)
+                    else:
+                        assert not np.isnan(res['beta']).any()
+                        assert n_single_fits[0] == 0
+
+                del model._fit_alternative_numpy
+
+            h2 = np.arange(1, 100)
+            expected = [model.compute_neg_log_reml(lg) for lg in np.log(h2 / (100.0 - h2))]
+            assert np.allclose(model._neg_log_reml_grid(np.log(h2 / (100.0 - h2))), expected)
+
     @skip_unless_spark_backend()
     def test_linear_mixed_model_function(self):
         n, f, m = 4, 2, 3
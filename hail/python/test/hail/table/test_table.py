@@ -1030,6 +1030,41 @@ class Tests(unittest.TestCase):
         assert ht['sample'].dtype == hl.tint32
         assert ht['_row'].dtype == hl.tint32
 
+    def test_collect_keyed_without_sort(self):
+        ht = hl.utils.range_table(10, 3)
+        ht = ht.annotate(x=ht.idx * 2)
+        assert 'TableOrderBy' not in str(ht.collect(_localize=False)._ir)
+        ht2 = ht.key_by(k=9 - ht.idx)
+        assert [r.k for r in ht2.collect()] == list(range(10))
+
+    def test_iter_rows(self):
+        ht = hl.utils.range_table(10, 4)
+        ht = ht.annotate(x=hl.str(ht.idx))
+        expected = ht.collect()
+        assert list(ht.iter_rows()) == expected
+        assert list(ht.iter_rows(partitions_per_query=3)) == expected
+        with self.assertRaises(ValueError):
+            ht.iter_rows(partitions_per_query=0)
+
+    def test_aggregate_async(self):
+        ht = hl.utils.range_table(10)
+        futures = [ht.aggregate_async(hl.agg.count_where(ht.idx < i)) for i in range(5)]
+        assert [f.result() for f in futures] == [0, 1, 2, 3, 4]
+        assert hl.eval_many(hl.sum(hl.range(10)), 'a', ht.aggregate(hl.agg.count(), _localize=False)) == [45, 'a', 10]
+        assert hl.eval_async(hl.len('Hail')).result() == 4
+
+    def test_lazy_field_expressions(self):
+        ht = hl.utils.range_table(10)
+        ht = ht.annotate_globals(g=1)
+        ht = ht.annotate(x=ht.idx * 2, y=hl.str(ht.idx))
+        assert list(ht._fields) == ['g', 'idx', 'x', 'y']
+        assert {'g', 'idx', 'x', 'y'} <= set(dir(ht))
+        assert ht.x is ht['x'] is ht.row.x
+        assert ht._fields_inverse[ht.row.y] == 'y'
+        assert ht.drop(ht.row.y, ht.g)._fields.keys() == {'idx', 'x'}
+        with self.assertRaises(AttributeError):
+            ht.z
+
     def test_refs_with_process_joins(self):
         ht = hl.utils.range_table(10).annotate(foo=5)
         ht.annotate(a_join=ht[ht.key],
@@ -1,6 +1,10 @@
+import os
+import threading
 import unittest
+from unittest import mock
 import hail as hl
 import hail.ir as ir
+from hail.ir import base_ir
 from hail.ir.renderer import CSERenderer
 from hail.expr import construct_expr
 from hail.expr.types import tint32
@@ -361,6 +365,93 @@ class ValueTests(unittest.TestCase):
             self.assertEqual(new_globals, hl.Struct(foo=v))
 
 
+class IRHashTests(unittest.TestCase):
+    def test_structural_hash_and_eq(self):
+        def build(i):
+            return ir.ApplyBinaryPrimOp('+', ir.Ref('x'), ir.MakeArray([ir.I32(i), ir.I32(2)], None))
+
+        self.assertEqual(hash(build(1)), hash(build(1)))
+        self.assertEqual(build(1), build(1))
+        self.assertNotEqual(build(1), build(2))
+        self.assertEqual(len({build(1), build(1), build(2)}), 2)
+
+    def test_deep_ir_hash(self):
+        x = ir.I32(0)
+        for i in range(20000):
+            x = ir.ApplyBinaryPrimOp('+', x, ir.I32(i))
+        self.assertIsInstance(hash(x), int)
+
+    @mock.patch.object(ir.BaseIR, '__setattr__', base_ir._check_mutation_setattr)
+    def test_mutation_after_hash_raises(self):
+        x = ir.ApplyBinaryPrimOp('+', ir.I32(1), ir.I32(2))
+        x.op = '-'
+        hash(x)
+        with self.assertRaises(AttributeError):
+            x.op = '*'
+        with self.assertRaises(AttributeError):
+            x.children[0].x = 5
+        # caches may still be set
+        x._type = hl.tint32
+
+
+class FunctionRegistryTests(unittest.TestCase):
+    def test_signatures_parsed_on_lookup(self):
+        registry = ir.ir._Registry()
+        registry.register('f', (('int32', 'array<?T>'), 'array<?T>'))
+        registry.register('f', ((hl.tstr,), 'str'))
+        self.assertIn('f', registry)
+        self.assertIn('f', registry._unparsed)
+        self.assertEqual(registry['f'][1], ((hl.tstr,), hl.tstr))
+        self.assertNotIn('f', registry._unparsed)
+
+        registry.remove('f', (('str',), 'str'))
+        self.assertEqual(len(registry['f']), 1)
+        self.assertEqual(registry['g'], [])
+
+    def test_remove_function(self):
+        ir.register_function('registry_test_f', ('str',), 'bool')
+        self.assertEqual(ir.ir._function_registry['registry_test_f'], [((hl.tstr,), hl.tbool)])
+        ir.remove_function('registry_test_f', ('str',), 'bool')
+        self.assertNotIn('registry_test_f', ir.ir._function_registry)
+
+    def test_resolution_cache_invalidated(self):
+        registry = ir.ir._Registry()
+        registry.register('f', 'int32')
+        calls = []
+
+        def resolve(overloads):
+            calls.append(1)
+            return list(overloads)
+
+        self.assertEqual(registry.resolve('f', (hl.tint32,), resolve), [hl.tint32])
+        self.assertEqual(registry.resolve('f', (hl.tint32,), resolve), [hl.tint32])
+        self.assertEqual(len(calls), 1)
+
+        registry.register('f', 'str')
+        self.assertEqual(registry.resolve('f', (hl.tint32,), resolve), [hl.tint32, hl.tstr])
+        registry.remove('f', 'int32')
+        self.assertEqual(registry.resolve('f', (hl.tint32,), resolve), [hl.tstr])
+        self.assertEqual(len(calls), 3)
+
+    def test_resolution_cache_bounded(self):
+        registry = ir.ir._Registry(max_resolved=2)
+        registry.register('f', 'int32')
+        for t in [hl.tint32, hl.tint64, hl.tint32, hl.tstr]:
+            registry.resolve('f', (t,), list)
+        # tint64 was least recently used
+        self.assertEqual(list(registry._resolved), [('f', (hl.tint32,)), ('f', (hl.tstr,))])
+        self.assertEqual(registry._resolved_arg_types['f'], {(hl.tint32,), (hl.tstr,)})
+
+    def test_lookup_aggregator_return_type(self):
+        for _ in range(2):
+            self.assertEqual(ir.ir.lookup_aggregator_return_type('Collect', [], None, [hl.tarray(hl.tint32)]),
+                             hl.tarray(hl.tarray(hl.tint32)))
+            self.assertEqual(ir.ir.lookup_aggregator_return_type('Collect', [], None, [hl.tstr]),
+                             hl.tarray(hl.tstr))
+            with self.assertRaises(KeyError):
+                ir.ir.lookup_aggregator_return_type('Sum', [], None, [hl.tstr])
+
+
 class CSETests(unittest.TestCase):
     def test_cse(self):
         x = ir.I32(5)
@@ -464,3 +555,264 @@ class CSETests(unittest.TestCase):
             ' (ApplyBinaryPrimOp `+` (Ref __cse_1) (Ref __cse_1))))'
         )
         assert expected == CSERenderer()(agglet)
+
+    def test_relational_render_cached(self):
+        x = ir.GetField(ir.Ref('row'), 'idx')
+        pred = ir.ApplyComparisonOp('EQ', ir.ApplyBinaryPrimOp('+', x, x), ir.I32(2))
+        t = ir.TableFilter(ir.TableRange(10, 1), pred)
+        t_expected = (
+            '(TableFilter (TableRange 10 1)'
+                ' (Let __cse_1 (GetField idx (Ref row))'
+                ' (ApplyComparisonOp EQ'
+                    ' (ApplyBinaryPrimOp `+` (Ref __cse_1) (Ref __cse_1))'
+                    ' (I32 2))))')
+        assert t_expected == CSERenderer()(t)
+        cached = t._rendered[(False, False)]
+
+        s = ir.ApplyBinaryPrimOp('+', ir.I32(1), ir.I32(1))
+        top = ir.TableAggregate(t, ir.MakeTuple([s, s]))
+        expected = (
+            f'(TableAggregate {t_expected}'
+                ' (Let __cse_1 (ApplyBinaryPrimOp `+` (I32 1) (I32 1))'
+                ' (MakeTuple (0 1) (Ref __cse_1) (Ref __cse_1))))')
+        assert expected == CSERenderer()(top)
+        assert t._rendered[(False, False)] is cached
+        assert expected == CSERenderer()(top)
+
+    def test_cached_render_with_jirs(self):
+        tr = ir.TableRange(10, 1)
+        tr._jir = 'jir'
+        t = ir.TableFilter(tr, ir.TrueIR())
+        r = CSERenderer(stop_at_jir=True)
+        code = r(t)
+        [(jir_id, jir)] = r.jirs.items()
+        assert code == f'(TableFilter (JavaTable {jir_id}) (True))'
+        assert jir == 'jir'
+
+        r = CSERenderer(stop_at_jir=True)
+        assert r(ir.TableCount(t)) == f'(TableCount {code})'
+        assert r.jirs == {jir_id: 'jir'}
+
+        assert CSERenderer()(t) == '(TableFilter (TableRange 10 1) (True))'
+
+    def test_large_literals(self):
+        value = list(range(2000))
+        lit = ir.Literal(hl.tarray(hl.tint32), value)
+        same = ir.Literal(hl.tarray(hl.tint32), list(value))
+        small = ir.Literal(hl.tarray(hl.tint32), [1, 2])
+        x = ir.MakeTuple([lit, same, small])
+
+        r = CSERenderer(large_literals=True)
+        literal_id = lit._encoded_id()
+        assert literal_id == same._encoded_id()
+        assert literal_id != ir.Literal(hl.tarray(hl.tfloat32), value)._encoded_id()
+        assert r(x) == (f'(MakeTuple (0 1 2) (JavaIR {literal_id}) (JavaIR {literal_id})'
+                        ' (Literal Array[Int32] "[1, 2]"))')
+        assert list(r.literals) == [literal_id]
+        assert hl.tarray(hl.tint32)._from_encoding(r.literals[literal_id]._encoding()) == value
+
+        assert 'JavaIR' not in CSERenderer()(x)
+
+
+class ResultCacheTests(unittest.TestCase):
+    class FakeFS:
+        def __init__(self):
+            self.files = {}
+
+        def stat(self, path):
+            size, mtime = self.files[path]
+            return {'path': path, 'is_dir': False, 'size_bytes': size, 'modification_time': mtime}
+
+    def setUp(self):
+        self.executed = []
+
+    def execute(self, x):
+        self.executed.append(x)
+        return [len(self.executed)], {'timing': 1}
+
+    def test_hit_and_miss(self):
+        from hail.backend.result_cache import ResultCache
+        cache = ResultCache(self.FakeFS(), 1 << 20)
+        x = ir.TableCount(ir.TableRange(10, 1))
+        assert cache.execute(x, self.execute) == ([1], {'timing': 1})
+        value, timings = cache.execute(ir.TableCount(ir.TableRange(10, 1)), self.execute)
+        assert value == [1] and timings == {}
+        value.append(2)
+        assert cache.execute(x, self.execute) == ([1], {})
+        assert cache.execute(ir.TableCount(ir.TableRange(11, 1)), self.execute)[0] == [2]
+        report = cache.report()
+        assert (report['hits'], report['misses'], report['entries']) == (2, 2, 2)
+
+    def test_bypass(self):
+        from hail.backend.result_cache import ResultCache
+        cache = ResultCache(self.FakeFS(), 1 << 20)
+        seeded = ir.ApplySeeded('rand_bool', 0, hl.tbool, ir.F64(0.5))
+        write = ir.TableWrite(ir.TableRange(10, 1), ir.TableNativeWriter('/tmp/t.ht', False, False, None))
+        persisted = ir.TableCount(ir.JavaTable('jir'))
+        for x in [seeded, write, persisted, ir.TableCount(ir.TableRead(ir.TableNativeReader('/missing.ht', None, False)))]:
+            cache.execute(x, self.execute)
+            cache.execute(x, self.execute)
+        assert len(self.executed) == 8
+        assert cache.report()['bypassed'] == 8
+
+    def test_input_changed(self):
+        from hail.backend.result_cache import ResultCache
+        fs = self.FakeFS()
+        fs.files['/t.ht'] = (100, 1)
+        cache = ResultCache(fs, 1 << 20)
+        x = ir.TableCount(ir.TableRead(ir.TableNativeReader('/t.ht', None, False)))
+        cache.execute(x, self.execute)
+        cache.execute(x, self.execute)
+        assert len(self.executed) == 1
+        fs.files['/t.ht'] = (100, 2)
+        cache.execute(x, self.execute)
+        assert len(self.executed) == 2
+
+    def test_spill(self):
+        import tempfile
+        from hail.backend.result_cache import ResultCache
+        with tempfile.TemporaryDirectory() as spill_dir:
+            cache = ResultCache(self.FakeFS(), 100, spill_dir)
+            xs = [ir.TableCount(ir.TableRange(n, 1)) for n in range(10)]
+            for x in xs:
+                cache.execute(x, self.execute)
+            report = cache.report()
+            assert report['size'] <= 100 and report['spilled_entries'] > 0
+            assert cache.execute(xs[0], self.execute) == ([1], {})
+            assert cache.report()['spill_hits'] == 1
+            cache.clear()
+            assert os.listdir(spill_dir) == []
+
+    def test_reference_genome_by_name(self):
+        import pickle
+        from hail.backend.result_cache import ResultCache
+        cache = ResultCache(self.FakeFS(), 1 << 20)
+        locus = hl.Locus('1', 100, 'GRCh37')
+        x = ir.TableCount(ir.TableRange(10, 1))
+        cache.execute(x, lambda x: (locus, {}))
+        value, _ = cache.execute(x, self.execute)
+        assert value == locus and value.reference_genome is hl.get_reference('GRCh37')
+        # other pickling is unchanged
+        assert pickle.loads(pickle.dumps(locus)).reference_genome is not hl.get_reference('GRCh37')
+
+
+class ServiceBackendTests(unittest.TestCase):
+    def test_leaf_types_cached(self):
+        from collections import OrderedDict
+        from hail.backend import ServiceBackend
+
+        class FakeResponse:
+            def json(self):
+                return {}
+
+        posted = []
+
+        def post_ir(path, x, idempotent=False):
+            posted.append(path)
+            return FakeResponse()
+
+        # avoid the deploy config and credentials needed by __init__
+        backend = ServiceBackend.__new__(ServiceBackend)
+        backend._types = OrderedDict()
+        backend._lock = threading.Lock()
+        backend._fs = ResultCacheTests.FakeFS()
+        backend._post_ir = post_ir
+
+        def table_type(path):
+            x = ir.TableRead(ir.TableNativeReader(path, None, False))
+            return backend._request_type(x, 'table', lambda j: path)
+
+        backend._fs.files['/t.ht'] = (100, 1)
+        assert table_type('/t.ht') == '/t.ht'
+        assert table_type('/t.ht') == '/t.ht'
+        assert len(posted) == 1
+        backend._fs.files['/t.ht'] = (100, 2)
+        table_type('/t.ht')
+        assert len(posted) == 2
+        table_type('/missing.ht')
+        table_type('/missing.ht')
+        assert len(posted) == 4
+
+    def test_request_retries_and_compression(self):
+        import gzip
+        import json
+        import requests
+        import urllib3
+        from hail.backend import ServiceBackend
+
+        sent = []
+        responses = []
+
+        class FakeSession:
+            def request(self, method, url, data, headers):
+                sent.append((data, headers))
+                resp = responses.pop(0)
+                if isinstance(resp, Exception):
+                    raise resp
+                return resp
+
+        def response(status_code):
+            resp = requests.Response()
+            resp.status_code = status_code
+            return resp
+
+        refused = requests.exceptions.ConnectionError(
+            urllib3.exceptions.MaxRetryError(
+                None, '/execute', urllib3.exceptions.NewConnectionError(None, 'refused')))
+        reset = requests.exceptions.ConnectionError('reset')
+
+        backend = ServiceBackend.__new__(ServiceBackend)
+        backend.url = 'http://apiserver'
+        backend._session = FakeSession()
+        backend._max_retries = 2
+        body = {'code': 'x' * 10000}
+        responses[:] = [reset, response(503), response(200)]
+        assert backend._request('post', 'type/table', body=body, idempotent=True).status_code == 200
+        assert len(sent) == 3
+        data, headers = sent[0]
+        assert headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(data)) == body
+
+        sent.clear()
+        backend._max_retries = 1
+        responses[:] = [response(503), response(503)]
+        with self.assertRaises(requests.exceptions.HTTPError):
+            backend._request('get', 'references/get', body={'name': 'x'})
+        assert 'Content-Encoding' not in sent[1][1]
+
+        # requests that may have reached the apiserver are not sent again
+        # unless they are idempotent
+        sent.clear()
+        responses[:] = [reset]
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            backend._request('post', 'execute', body={'code': 'x'})
+        responses[:] = [response(503)]
+        with self.assertRaises(requests.exceptions.HTTPError):
+            backend._request('post', 'execute', body={'code': 'x'})
+        assert len(sent) == 2
+
+        sent.clear()
+        responses[:] = [refused, requests.exceptions.ConnectTimeout(), response(200)]
+        backend._max_retries = 2
+        assert backend._request('post', 'execute', body={'code': 'x'}).status_code == 200
+        assert len(sent) == 3
+
+    def test_execute_async(self):
+        from hail.backend import ServiceBackend
+
+        # every query waits for the others, so they must run concurrently
+        barrier = threading.Barrier(3, timeout=10)
+
+        def execute(x):
+            barrier.wait()
+            return x.x, {}
+
+        backend = ServiceBackend.__new__(ServiceBackend)
+        backend._execute = execute
+        try:
+            futures = [backend.execute_async(ir.I32(i)) for i in range(3)]
+            assert [f.result() for f in futures] == [0, 1, 2]
+            backend._execute = lambda x: (x.x, {})
+            assert backend.execute_async(ir.I32(3), timed=True).result() == (3, {})
+        finally:
+            backend.stop()
@@ -277,3 +277,40 @@ class Tests(unittest.TestCase):
         f(1)
         with self.assertRaises(TypeError):
             f(1, 2)
+
+    def test_error_message(self):
+        @typecheck(x=int, y=nullable(str), z=int)
+        def f(x, y=None, *, z=1):
+            pass
+
+        with self.assertRaisesRegex(TypeError, "f: parameter 'y': expected \\(None or str\\), found int: 5"):
+            f(1, 5)
+        with self.assertRaisesRegex(TypeError, "f: parameter 'z': expected int, found str: 1"):
+            f(1, z='1')
+
+    def test_trusted_internal_calls(self):
+        @typecheck(x=int)
+        def f(x):
+            return x
+
+        @typecheck(x=sequenceof(int))
+        def g(x):
+            return x
+
+        set_trusted_internal_calls(True)
+        try:
+            # calls from outside the hail package are still checked
+            self.assertRaises(TypeError, lambda: f('1'))
+            # coercing checkers always run
+            self.assertEqual(g((1, 2)), [1, 2])
+
+            # calls from inside the hail package are not checked
+            internal = {'__name__': 'hail.methods.internal', 'f': f, 'g': g}
+            exec('def call_f(x):\n'
+                 '    return f(x)\n'
+                 'def call_g(x):\n'
+                 '    return g(x)\n', internal)
+            self.assertEqual(internal['call_f']('1'), '1')
+            self.assertEqual(internal['call_g']((1, 2)), [1, 2])
+        finally:
+            set_trusted_internal_calls(False)
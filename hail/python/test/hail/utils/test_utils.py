@@ -168,6 +168,39 @@ class Tests(unittest.TestCase):
         self.assertEqual(s.annotate(**{'a': 5, 'x': 10, 'y': 15}),
                          Struct(a=5, b=2, c=3, x=10, y=15))
 
+    def test_struct_field_access(self):
+        s = Struct(a=1, **{'b c': 2, '_d': 3})
+        self.assertEqual(s.a, 1)
+        self.assertEqual(s['b c'], 2)
+        self.assertEqual(s._d, 3)
+        self.assertEqual(list(s), ['a', 'b c', '_d'])
+        self.assertIn('a', dir(s))
+        self.assertRaises(KeyError, lambda: s['x'])
+        self.assertRaises(AttributeError, lambda: s.x)
+        self.assertRaisesRegex(TypeError, "expected str, found int", lambda: s[0])
+
+    def test_struct_fields_named_like_methods(self):
+        s = Struct(values=2, keys=3, items=4, get=5)
+        self.assertEqual(s.values, 2)
+        self.assertEqual(s.keys, 3)
+        self.assertEqual(s.items, 4)
+        self.assertEqual(s.get, 5)
+        self.assertEqual(s['values'], 2)
+        self.assertEqual(str(s), 'Struct(values=2, keys=3, items=4, get=5)')
+        self.assertEqual(hash(s), hash(Struct(get=5, items=4, keys=3, values=2)))
+        self.assertEqual(s.drop('get').annotate(a=1), Struct(values=2, keys=3, items=4, a=1))
+        self.assertEqual(list(Struct(a=1).values()), [1])
+
+    def test_struct_decoded_from_type(self):
+        t = hl.tstruct(a=hl.tint32, b=hl.tstr)
+        s1 = t._from_json('{"a": 1, "b": "x"}')
+        s2 = t._from_json('{"a": 1, "b": "x"}')
+        self.assertIs(s1._field_index, s2._field_index)
+        self.assertEqual(s1, s2)
+        self.assertEqual(s1, Struct(b='x', a=1))
+        self.assertEqual(hash(s1), hash(Struct(a=1, b='x')))
+        self.assertEqual(s1.annotate(c=2), Struct(a=1, b='x', c=2))
+
     def test_expr_exception_results_in_fatal_error(self):
         df = range_table(10)
         df = df.annotate(x=[1, 2])
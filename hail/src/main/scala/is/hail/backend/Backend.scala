@@ -3,14 +3,17 @@ package is.hail.backend
 import java.io.PrintWriter
 
 import is.hail.HailContext
-import is.hail.annotations.{Region, SafeRow}
+import is.hail.annotations.{Region, RegionValueBuilder, SafeRow}
 import is.hail.backend.spark.SparkBackend
 import is.hail.expr.JSONAnnotationImpex
 import is.hail.expr.ir.lowering.{LowererUnsupportedOperation, LoweringPipeline}
-import is.hail.expr.ir.{Compilable, Compile, CompileAndEvaluate, ExecuteContext, IR, MakeTuple, Pretty, TypeCheck}
-import is.hail.expr.types.physical.PTuple
-import is.hail.expr.types.virtual.TVoid
+import is.hail.expr.ir.{Compilable, Compile, CompileAndEvaluate, ExecuteContext, IR, IRParser, Literal, MakeTuple, Pretty, TypeCheck}
+import is.hail.expr.types.encoded.EType
+import is.hail.expr.types.physical.{PTuple, PType}
+import is.hail.expr.types.virtual.{TTuple, TVoid}
+import is.hail.io.{BufferSpec, TypedCodecSpec}
 import is.hail.utils._
+import org.apache.spark.sql.Row
 import org.json4s.DefaultFormats
 import org.json4s.jackson.{JsonMethods, Serialization}
 
@@ -67,5 +70,44 @@ abstract class Backend {
     Serialization.write(Map("value" -> jsonValue, "timings" -> timings.asMap()))(new DefaultFormats {})
   }
 
+  // Encodes the result as a deep-optional, single-field tuple, so clients can
+  // decode it knowing only the virtual type of `ir`.
+  def executeEncode(ir: IR, bufferSpecString: String): (Array[Byte], String) = {
+    val t = TTuple(ir.typ).deepOptional()
+    val (value, timings) = execute(ir, optimize = true)
+    val bytes = timings.time("Encode") {
+      Region.scoped { region =>
+        val pt = PType.canonical(t)
+        val rvb = new RegionValueBuilder(region)
+        rvb.start(pt)
+        rvb.addAnnotation(t, Row(value))
+        val off = rvb.end()
+        val codec = TypedCodecSpec(EType.defaultFromPType(pt), t,
+          BufferSpec.parseOrDefault(bufferSpecString, BufferSpec.unblockedUncompressed))
+        codec.encode(pt, region, off)
+      }
+    }
+    timings.finish()
+    timings.logInfo()
+
+    (bytes, Serialization.write(timings.asMap())(new DefaultFormats {}))
+  }
+
+  // Inverse of `executeEncode`: decodes a value encoded by Python's
+  // `HailType._to_encoding` as a deep-optional, single-field tuple, so large
+  // literals need not be rendered into IR text and parsed back.
+  def decodeLiteral(typeString: String, bytes: Array[Byte], bufferSpecString: String): IR = {
+    val typ = IRParser.parseType(typeString)
+    val t = TTuple(typ).deepOptional()
+    val value = Region.scoped { region =>
+      val pt = PType.canonical(t)
+      val codec = TypedCodecSpec(EType.defaultFromPType(pt), t,
+        BufferSpec.parseOrDefault(bufferSpecString, BufferSpec.unblockedUncompressed))
+      val (decodedPType, off) = codec.decode(t, bytes, region)
+      SafeRow(decodedPType.asInstanceOf[PTuple], region, off).get(0)
+    }
+    Literal.coerce(typ, value)
+  }
+
   def asSpark(): SparkBackend = fatal("SparkBackend needed for this operation.")
 }
@@ -10,6 +10,9 @@ import scala.reflect.ClassTag
 
 object SparkBackend {
   def executeJSON(ir: IR): String = HailContext.backend.executeJSON(ir)
+
+  def executeEncode(ir: IR, bufferSpecString: String): (Array[Byte], String) =
+    HailContext.backend.executeEncode(ir, bufferSpecString)
 }
 
 class SparkBroadcastValue[T](bc: Broadcast[T]) extends BroadcastValue[T] with Serializable {